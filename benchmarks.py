@@ -0,0 +1,1126 @@
+"""
+Benchmarks for roruta.py. Each benchmark raises an Exception if it does not meet its budget, so the script can be
+used as a check, e.g.,
+
+python benchmarks.py
+
+exits with a non-zero status if some of the benchmarks fails.
+"""
+
+import sys
+from os import chdir
+from os.path import dirname, abspath, getsize
+from subprocess import run
+from tempfile import TemporaryDirectory
+from time import perf_counter, time
+
+
+rorutaFolder = dirname(abspath(__file__))
+
+
+#############################################################################################
+# Import time                                                                               #
+#############################################################################################
+
+importTimeBudget = 0.1  # in seconds
+
+
+def benchmarkImportTime(budget=importTimeBudget, repeats=5):
+    """
+    Measures the time of import roruta in a fresh interpreter (the start of the interpreter itself is not measured).
+    Checks also that importing roruta does not load matplotlib or tkinter.
+
+    :param budget: maximal allowed import time in seconds
+    :param repeats: number of fresh interpreters; the best of the measured times is compared to the budget
+    :return: the best of the measured times
+    """
+    code = ("import sys, time\n"
+            "t0 = time.perf_counter()\n"
+            "import roruta\n"
+            "t1 = time.perf_counter()\n"
+            "print(t1 - t0, int('matplotlib' in sys.modules or 'tkinter' in sys.modules))")
+    times = []
+    for _ in range(repeats):
+        result = run([sys.executable, "-c", code], cwd=rorutaFolder, capture_output=True, text=True, check=True)
+        t, heavyModules = result.stdout.split()
+        if int(heavyModules):
+            raise Exception("import roruta loads matplotlib or tkinter.")
+        times.append(float(t))
+    best = min(times)
+    print("import roruta: {:.4f} s (budget: {:.4f} s)".format(best, budget))
+    if best > budget:
+        raise Exception("import roruta took {:.4f} s, which exceeds the budget of {:.4f} s.".format(best, budget))
+    return best
+
+
+#############################################################################################
+# In-process relations                                                                      #
+#############################################################################################
+
+relationsTimeBudget = 10.0  # in seconds, for all three variants
+carsDirections = [1, 0, 0, 0, 0, 1, 0, 0]
+carsVariants = ["linear", "random12", "full"]
+
+
+def carsDivizRelations(variant, necessaryRels):
+    """
+    Reads the relations of the cars example that were computed by diviz.
+
+    :param variant: 'linear', 'random12' or 'full'
+    :param necessaryRels: bool, if True, the necessary relations are read, otherwise the possible ones
+    :return: the output of readRelations
+    """
+    import roruta
+
+    relXml = "necessary-relations.xml" if necessaryRels else "possible-relations.xml"
+    return roruta.readRelations("{}/{}/RORUTA-NecessaryAndPossiblePreferenceRelations-1/{}".format(
+        roruta.divizWFfolder, variant, relXml), False)
+
+
+def benchmarkRelations(budget=relationsTimeBudget):
+    """
+    Computes the necessary and possible relations of the cars example in-process (computeRelations) and checks
+    that they equal the relations, computed by diviz.
+
+    :param budget: maximal allowed time in seconds
+    :return: the measured time
+    """
+    import roruta
+
+    alt, criteria, perf = roruta.readPerformanceCSV()
+    t0 = perf_counter()
+    for variant in carsVariants:
+        strong = roruta.defineStrongRelations("{}/preferences/{}.pref".format(roruta.inputFolder, variant))
+        statistics = {}
+        necessary, possible = roruta.computeRelations(alt, criteria, perf, carsDirections, [strong, [], []],
+                                                      statistics=statistics)
+        print("{}: {} linear programs solved, {} skipped".format(variant, statistics["pairs"], statistics["skipped"]))
+        if sorted(roruta.relationPairs(necessary)) != sorted(carsDivizRelations(variant, True)):
+            raise Exception("The necessary relations of the variant {} differ from diviz.".format(variant))
+        if sorted(roruta.relationPairs(possible)) != sorted(carsDivizRelations(variant, False)):
+            raise Exception("The possible relations of the variant {} differ from diviz.".format(variant))
+    t = perf_counter() - t0
+    print("relations of the cars example: {:.4f} s (budget: {:.4f} s)".format(t, budget))
+    if t > budget:
+        raise Exception("Computing the relations took {:.4f} s, which exceeds the budget of {:.4f} s.".format(t, budget))
+    return t
+
+
+def benchmarkIncremental(start="random12", end="full"):
+    """
+    Compares the incremental update of the relations (IncrementalRelations) for the transition from the variant start
+    to the variant end of the cars example with the computation from scratch. The speedup is measured against the
+    computation without pruning, which solves the linear programs of all the pairs: with pruning, the relations
+    of the cars example are mostly inferred, so that both the update and the pruned computation solve (almost)
+    no linear programs. The numbers of the solved linear programs are reported, too.
+
+    :param start: variant of the cars example
+    :param end: variant of the cars example
+    :return: {'incremental': time, 'full': time, 'fullWithoutPruning': time} (in seconds)
+    """
+    import roruta
+
+    alt, criteria, perf = roruta.readPerformanceCSV()
+    prefs = {v: [roruta.defineStrongRelations("{}/preferences/{}.pref".format(roruta.inputFolder, v)), [], []]
+             for v in [start, end]}
+    incremental = roruta.IncrementalRelations(alt, criteria, perf, carsDirections, prefs[start])
+    times = {}
+    solved = {name: {} for name in ["incremental", "full", "fullWithoutPruning"]}
+    t0 = perf_counter()
+    relations = incremental.update(prefs[end], statistics=solved["incremental"])
+    times["incremental"] = perf_counter() - t0
+    for name, prune in [("full", True), ("fullWithoutPruning", False)]:
+        t0 = perf_counter()
+        fullRelations = roruta.computeRelations(alt, criteria, perf, carsDirections, prefs[end], prune=prune,
+                                                statistics=solved[name])
+        times[name] = perf_counter() - t0
+        if fullRelations != relations:
+            raise Exception("The incremental relations differ from the relations, computed from scratch.")
+    print("{} -> {} ({} update): incremental {:.4f} s ({} LPs), full {:.4f} s ({} LPs), full without pruning "
+          "{:.4f} s ({} LPs, speedup {:.1f})".format(start, end, solved["incremental"]["mode"], times["incremental"],
+                                                    solved["incremental"]["pairs"], times["full"],
+                                                    solved["full"]["pairs"], times["fullWithoutPruning"],
+                                                    solved["fullWithoutPruning"]["pairs"],
+                                                    times["fullWithoutPruning"] / times["incremental"]))
+    return times
+
+
+def benchmarkParallel(n=40, nCriteria=6, nPreferences=40, workers=4, randomSeed=12345, startUp=1.0):
+    """
+    Computes the relations of a random problem (see syntheticProblem) with pruning, in the current process and
+    with workers worker processes, and checks that the results are the same. With more processors than one,
+    the workers must be faster; otherwise, they may only add the start-up of one pool and a few more linear programs
+    (the pairs that are solved at the same time can not use each other's values).
+
+    :param n: number of alternatives
+    :param nCriteria: number of criteria
+    :param nPreferences: number of preferences
+    :param workers: number of worker processes
+    :param randomSeed: seed of the problem
+    :param startUp: the allowed time (in seconds) for starting the worker processes on a single processor
+    :return: {'serial': time, 'parallel': time} (in seconds)
+    """
+    from os import cpu_count
+    import roruta
+
+    alt, criteria, perf, directions, prefList, _ = syntheticProblem(n, nCriteria, nPreferences,
+                                                                    randomSeed=randomSeed)
+    times = {}
+    results = {}
+    statistics = {}
+    for name, w in [("serial", 1), ("parallel", workers)]:
+        statistics[name] = {}
+        t0 = perf_counter()
+        results[name] = roruta.computeRelations(alt, criteria, perf, directions, prefList, workers=w, prune=True,
+                                                statistics=statistics[name])
+        times[name] = perf_counter() - t0
+    if results["serial"] != results["parallel"]:
+        raise Exception("The relations, computed by the workers, differ.")
+    print("{} alternatives: serial {:.4f} s ({} linear programs), {} workers {:.4f} s ({} linear programs), "
+          "{} processors".format(n, times["serial"], statistics["serial"]["pairs"], workers, times["parallel"],
+                                 statistics["parallel"]["pairs"], cpu_count()))
+    allowed = times["serial"] if (cpu_count() or 1) > 1 else 1.5 * times["serial"] + startUp
+    if times["parallel"] > allowed:
+        raise Exception("The workers took {:.4f} s, more than {:.4f} s.".format(times["parallel"], allowed))
+    return times
+
+
+#############################################################################################
+# Parsers                                                                                   #
+#############################################################################################
+
+parsersMinThroughput = 1.0  # in MB/s, for the streaming parsers
+
+
+def writeRelationsXML(fileName, n, compact=False):
+    """
+    Writes a file in the layout of necessary-relations.xml (as produced by diviz) with all n * n pairs.
+
+    :param fileName: path to the file
+    :param n: number of alternatives
+    :param compact: if True, the file contains no whitespace between the tags
+    :return: None
+    """
+    indent, newLine = ("", "") if compact else ("  ", "\n")
+    with open(fileName, "w") as f:
+        f.write('<xmcda:XMCDA xmlns:xmcda="http://www.decision-deck.org/2012/XMCDA-2.2.0">' + newLine)
+        f.write(indent + "<alternativesComparisons>" + newLine + 2 * indent + "<pairs>" + newLine)
+        for i in range(n):
+            for j in range(n):
+                f.write(newLine.join([3 * indent + "<pair>",
+                                      4 * indent + "<initial>",
+                                      5 * indent + "<alternativeID>a{}</alternativeID>".format(i),
+                                      4 * indent + "</initial>",
+                                      4 * indent + "<terminal>",
+                                      5 * indent + "<alternativeID>a{}</alternativeID>".format(j),
+                                      4 * indent + "</terminal>",
+                                      3 * indent + "</pair>"]) + newLine)
+        f.write(2 * indent + "</pairs>" + newLine + indent + "</alternativesComparisons>" + newLine)
+        f.write("</xmcda:XMCDA>" + newLine)
+
+
+def writeValueFunctionXML(fileName, nCriteria, nPoints, compact=False):
+    """
+    Writes a file in the layout of representative-value-function.xml (as produced by diviz).
+
+    :param fileName: path to the file
+    :param nCriteria: number of criteria
+    :param nPoints: number of points of each marginal value function
+    :param compact: if True, the file contains no whitespace between the tags
+    :return: None
+    """
+    indent, newLine = ("", "") if compact else ("  ", "\n")
+    with open(fileName, "w") as f:
+        f.write('<xmcda:XMCDA xmlns:xmcda="http://www.decision-deck.org/2012/XMCDA-2.2.0">' + newLine)
+        f.write(indent + "<criteria>" + newLine)
+        for c in range(nCriteria):
+            f.write(2 * indent + '<criterion id="cr{}">'.format(c) + newLine + 3 * indent + "<criterionFunction>" +
+                    newLine + 4 * indent + "<points>" + newLine)
+            for k in range(nPoints):
+                f.write(newLine.join([5 * indent + "<point>",
+                                      6 * indent + "<abscissa>",
+                                      7 * indent + "<real>{}.5</real>".format(k),
+                                      6 * indent + "</abscissa>",
+                                      6 * indent + "<ordinate>",
+                                      7 * indent + "<real>{}</real>".format(k / nPoints / nCriteria),
+                                      6 * indent + "</ordinate>",
+                                      5 * indent + "</point>"]) + newLine)
+            f.write(4 * indent + "</points>" + newLine + 3 * indent + "</criterionFunction>" + newLine +
+                    2 * indent + "</criterion>" + newLine)
+        f.write(indent + "</criteria>" + newLine + "</xmcda:XMCDA>" + newLine)
+
+
+def benchmarkParsers(n=300, nCriteria=8, nPoints=20000, minThroughput=parsersMinThroughput):
+    """
+    Compares the throughput (in MB/s) of the line-based parsers (readRelations and getRepresentativeFunction)
+    and the streaming parsers (streamRelations and streamRepresentativeFunction) on generated files.
+    The streaming parsers are also run on the compact versions of the files (which the line-based parsers can not
+    read).
+
+    :param n: number of alternatives in the relations file
+    :param nCriteria: number of criteria in the value function file
+    :param nPoints: number of points of each marginal value function
+    :param minThroughput: minimal allowed throughput of the streaming parsers in MB/s
+    :return: {(parser, file): throughput, ...}
+    """
+    import roruta
+
+    throughputs = {}
+    with TemporaryDirectory() as folder:
+        files = {}
+        for compact in [False, True]:
+            suffix = "Compact" if compact else ""
+            files["relations" + suffix] = "{}/relations{}.xml".format(folder, suffix)
+            writeRelationsXML(files["relations" + suffix], n, compact)
+            files["function" + suffix] = "{}/function{}.xml".format(folder, suffix)
+            writeValueFunctionXML(files["function" + suffix], nCriteria, nPoints, compact)
+        runs = [("readRelations", "relations", lambda f: roruta.Relation.fromPairs(roruta.readRelations(f, False))),
+                ("streamRelations", "relations", lambda f: roruta.streamRelations(f, False)),
+                ("streamRelations", "relationsCompact", lambda f: roruta.streamRelations(f, False)),
+                ("getRepresentativeFunction", "function", roruta.getRepresentativeFunction),
+                ("streamRepresentativeFunction", "function", roruta.streamRepresentativeFunction),
+                ("streamRepresentativeFunction", "functionCompact", roruta.streamRepresentativeFunction)]
+        results = {}
+        for parser, fileKey, parse in runs:
+            t0 = perf_counter()
+            results[parser, fileKey] = parse(files[fileKey])
+            t = perf_counter() - t0
+            throughputs[parser, fileKey] = getsize(files[fileKey]) / 2 ** 20 / t
+            print("{} on {} ({:.1f} MB): {:.2f} MB/s".format(parser, fileKey, getsize(files[fileKey]) / 2 ** 20,
+                                                             throughputs[parser, fileKey]))
+    for kind, lineParser, streamParser in [("relations", "readRelations", "streamRelations"),
+                                           ("function", "getRepresentativeFunction", "streamRepresentativeFunction")]:
+        expected = results[lineParser, kind]
+        if results[streamParser, kind] != expected or results[streamParser, kind + "Compact"] != expected:
+            raise Exception("{} and {} give different results.".format(lineParser, streamParser))
+        for fileKey in [kind, kind + "Compact"]:
+            if throughputs[streamParser, fileKey] < minThroughput:
+                raise Exception("The throughput of {} on {} is {:.2f} MB/s, which is below {:.2f} MB/s.".format(
+                    streamParser, fileKey, throughputs[streamParser, fileKey], minThroughput))
+    return throughputs
+
+
+#############################################################################################
+# Evaluation of the representative function                                                 #
+#############################################################################################
+
+evaluationTimeBudget = 5.0  # in seconds
+
+
+def carsRepresentativeFunction(variant="full"):
+    """
+    Reads the most representative utility function of the cars example that was computed by diviz.
+
+    :param variant: 'linear', 'random12' or 'full'
+    :return: the output of getRepresentativeFunction
+    """
+    import roruta
+
+    return roruta.getRepresentativeFunction("{}/{}/RORUTA-RepresentativeValueFunction-1/"
+                                            "representative-value-function.xml".format(roruta.divizWFfolder, variant))
+
+
+def benchmarkEvaluation(rows=10 ** 6, budget=evaluationTimeBudget, randomSeed=12345):
+    """
+    Evaluates the most representative utility function of the cars example (variant full) with CompiledValueFunction
+    on the cars (where the result must equal the sum of the values in the breakpoints) and on rows random alternatives.
+
+    :param rows: number of random alternatives
+    :param budget: maximal allowed time in seconds for the random alternatives
+    :param randomSeed: seed of the random alternatives
+    :return: the measured time
+    """
+    import numpy as np
+    import roruta
+
+    dictFunction = carsRepresentativeFunction()
+    alt, criteria, perf = roruta.readPerformanceCSV()
+    function = roruta.CompiledValueFunction(dictFunction, len(criteria))
+    utilities = function.score(roruta.performanceMatrix(alt, criteria, perf))
+    for a, u in zip(alt, utilities):
+        exact = sum(dictFunction["cr{}".format(j)][roruta.numberTypes[j](perf[a][cr])] for j, cr in enumerate(criteria))
+        if abs(u - exact) > 1e-9:
+            raise Exception("The utility of {} is {} instead of {}.".format(a, u, exact))
+
+    generator = np.random.default_rng(randomSeed)
+    low = [min(map(float, dictFunction["cr{}".format(j)])) for j in range(len(criteria))]
+    high = [max(map(float, dictFunction["cr{}".format(j)])) for j in range(len(criteria))]
+    matrix = generator.uniform(low, high, size=(rows, len(criteria)))
+    t0 = perf_counter()
+    function.score(matrix)
+    t = perf_counter() - t0
+    print("evaluation of {} alternatives: {:.4f} s, {:.0f} rows/s (budget: {:.4f} s)".format(rows, t, rows / t, budget))
+    if t > budget:
+        raise Exception("The evaluation took {:.4f} s, which exceeds the budget of {:.4f} s.".format(t, budget))
+    return t
+
+
+def benchmarkTopK(rows=10 ** 6, k=10, budget=evaluationTimeBudget, randomSeed=12345):
+    """
+    Finds the k best of rows random alternatives and the ranks of a few of them with topUtilities and utilityRanks
+    on a memory-mapped performance table, and compares the results with the sort of all the utilities.
+
+    :param rows: number of random alternatives
+    :param k: number of the best alternatives
+    :param budget: maximal allowed time in seconds for both queries
+    :param randomSeed: seed of the random alternatives
+    :return: the measured time
+    """
+    import numpy as np
+    import roruta
+
+    dictFunction = carsRepresentativeFunction()
+    nCriteria = len(dictFunction)
+    generator = np.random.default_rng(randomSeed)
+    low = [min(map(float, dictFunction["cr{}".format(j)])) for j in range(nCriteria)]
+    high = [max(map(float, dictFunction["cr{}".format(j)])) for j in range(nCriteria)]
+    matrix = np.round(generator.uniform(low, high, size=(rows, nCriteria)))  # rounded, so that there are ties
+    names = ["a{}".format(i) for i in range(rows)]
+    with TemporaryDirectory() as folder:
+        binaryFile = "{}/table.bin".format(folder)
+        roruta.PerformanceColumns(names, ["cr{}".format(j) for j in range(nCriteria)],
+                                  [matrix[:, j].copy() for j in range(nCriteria)]).save(binaryFile)
+        table = roruta.PerformanceColumns.load(binaryFile)
+        queried = ["a{}".format(i) for i in generator.choice(rows, size=5, replace=False)]
+        t0 = perf_counter()
+        top = roruta.topUtilities(dictFunction, table, k)
+        ranks = roruta.utilityRanks(dictFunction, table, queried)
+        t = perf_counter() - t0
+        del table
+    utilities = roruta.CompiledValueFunction(dictFunction).score(matrix)
+    order = np.lexsort((np.arange(rows), -utilities))[:k]
+    if [name for name, _ in top] != [names[i] for i in order]:
+        raise Exception("The best alternatives differ from the ones, found by sorting.")
+    for name in queried:
+        if ranks[name][0] != 1 + np.count_nonzero(utilities > utilities[int(name[1:])]):
+            raise Exception("The rank of {} is wrong.".format(name))
+    print("top {} and 5 ranks of {} alternatives: {:.4f} s (budget: {:.4f} s)".format(k, rows, t, budget))
+    if t > budget:
+        raise Exception("The queries took {:.4f} s, which exceeds the budget of {:.4f} s.".format(t, budget))
+    return t
+
+
+def benchmarkStreaming(rows=(10 ** 5, 4 * 10 ** 5), chunkRows=10 ** 4, randomSeed=12345):
+    """
+    Streams the utilities of random alternatives from a CSV file to a CSV file with scoreCSV and checks that
+    its peak memory does not grow with the number of rows.
+
+    :param rows: numbers of random alternatives
+    :param chunkRows: number of rows that are scored at once
+    :param randomSeed: seed of the random alternatives
+    :return: {rows: (rows per second, peak memory in bytes)}
+    """
+    import tracemalloc
+    import numpy as np
+    import roruta
+
+    dictFunction = carsRepresentativeFunction()
+    nCriteria = len(dictFunction)
+    generator = np.random.default_rng(randomSeed)
+    low = [min(map(float, dictFunction["cr{}".format(j)])) for j in range(nCriteria)]
+    high = [max(map(float, dictFunction["cr{}".format(j)])) for j in range(nCriteria)]
+    results = {}
+    with TemporaryDirectory() as folder:
+        for n in rows:
+            csvFile = "{}/performances{}.csv".format(folder, n)
+            with open(csvFile, "w") as f:
+                print("alternative," + ",".join("cr{}".format(j) for j in range(nCriteria)), file=f)
+                for i, row in enumerate(generator.uniform(low, high, size=(n, nCriteria)).tolist()):
+                    print("a{},{}".format(i, ",".join(map(str, row))), file=f)
+            statistics = roruta.scoreCSV(dictFunction, csvFile, "{}/utilities.csv".format(folder), chunkRows)
+            tracemalloc.start()  # the second run measures the memory (tracemalloc slows it down)
+            roruta.scoreCSV(dictFunction, csvFile, "{}/utilities.csv".format(folder), chunkRows)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[n] = (statistics["rowsPerSecond"], peak)
+            print("streaming {} rows: {:.0f} rows/s, peak memory {:.1f} MB".format(n, statistics["rowsPerSecond"],
+                                                                                  peak / 2 ** 20))
+    if results[rows[-1]][1] > 1.5 * results[rows[0]][1]:
+        raise Exception("The peak memory grows with the number of rows.")
+    return results
+
+
+def benchmarkRepresentative(budget=relationsTimeBudget):
+    """
+    Computes the representative value functions of the cars example in-process (representativeFunction) and
+    compares them with the functions, computed by diviz: the characteristic points and the order of the cars
+    must be the same (the marginal values may differ, since the optimal function need not be unique).
+
+    :param budget: maximal allowed time in seconds
+    :return: the measured time
+    """
+    import roruta
+
+    alt, criteria, perf = roruta.readPerformanceCSV()
+    matrix = roruta.performanceMatrix(alt, criteria, perf)
+    t0 = perf_counter()
+    for variant in carsVariants:
+        strong = roruta.defineStrongRelations("{}/preferences/{}.pref".format(roruta.inputFolder, variant))
+        function = roruta.representativeFunction(alt, criteria, perf, carsDirections, [strong, [], []])
+        divizFunction = carsRepresentativeFunction(variant)
+        if any(set(function[cr]) != set(divizFunction[cr]) for cr in divizFunction):
+            raise Exception("The characteristic points of the variant {} differ from diviz.".format(variant))
+        utilities = roruta.CompiledValueFunction(function).score(matrix)
+        divizUtilities = roruta.CompiledValueFunction(divizFunction).score(matrix)
+        if sorted(range(len(alt)), key=lambda i: -utilities[i]) != \
+                sorted(range(len(alt)), key=lambda i: -divizUtilities[i]):
+            raise Exception("The order of the cars of the variant {} differs from diviz.".format(variant))
+        print("{}: the largest difference of utilities from diviz: {:.4f}".format(
+            variant, max(abs(utilities - divizUtilities))))
+    t = perf_counter() - t0
+    print("representative functions of the cars example: {:.4f} s (budget: {:.4f} s)".format(t, budget))
+    if t > budget:
+        raise Exception("Computing the functions took {:.4f} s, which exceeds the budget of {:.4f} s.".format(t,
+                                                                                                          budget))
+    return t
+
+
+def benchmarkAcceptability(samples=20000, budget=relationsTimeBudget):
+    """
+    Estimates the winning probabilities and rank acceptability indices of the cars example (variant random12) with
+    acceptabilityIndices and checks them against the necessary and possible relations: a necessarily strictly
+    preferred alternative must (almost) always win, and an alternative that is not possibly preferred must never win.
+
+    :param samples: number of samples
+    :param budget: maximal allowed time in seconds
+    :return: the measured time
+    """
+    import roruta
+
+    alt, criteria, perf = roruta.readPerformanceCSV()
+    strong = roruta.defineStrongRelations("{}/preferences/random12.pref".format(roruta.inputFolder))
+    necessary, possible = roruta.computeRelations(alt, criteria, perf, carsDirections, [strong, [], []])
+    statistics = {}
+    t0 = perf_counter()
+    winning, acceptability = roruta.acceptabilityIndices(alt, criteria, perf, carsDirections, [strong, [], []],
+                                                         samples=samples, statistics=statistics)
+    t = perf_counter() - t0
+    for i in range(len(alt)):
+        for j in range(len(alt)):
+            if i != j and necessary[i][j] and not necessary[j][i] and winning[i][j] < 0.999:
+                raise Exception("a{} is necessarily preferred to a{}, but wins only with the probability {}.".format(
+                    i, j, winning[i][j]))
+            if not possible[i][j] and winning[i][j] > 0:
+                raise Exception("a{} is not possibly preferred to a{}, but wins with the probability {}.".format(
+                    i, j, winning[i][j]))
+    print("acceptability indices from {} samples: {:.4f} s, R-hat {:.4f}, standard error {:.4f} (budget: {:.4f} s)"
+          .format(statistics["samples"], t, statistics["rHat"], statistics["standardError"], budget))
+    if t > budget:
+        raise Exception("The sampling took {:.4f} s, which exceeds the budget of {:.4f} s.".format(t, budget))
+    return t
+
+
+#############################################################################################
+# Rendering of relations                                                                    #
+#############################################################################################
+
+renderTimeBudget = 5.0  # in seconds
+
+
+def benchmarkRender(n=5000, budget=renderTimeBudget, randomSeed=12345):
+    """
+    Renders a random relation (the worst case for the compression) with a random user defined part on n
+    alternatives to a PNG file with relationImage and writePNG. Checks the colours of the cars example first.
+
+    :param n: number of alternatives
+    :param budget: maximal allowed time in seconds
+    :param randomSeed: seed of the random relations
+    :return: the measured time
+    """
+    from random import Random
+    import roruta
+
+    run = "{}/{}".format(roruta.divizWFfolder, "random12")
+    strong, weak, indif = roruta.streamRelations("{}/preferences.xml".format(run), True, 9)
+    dmPref = strong | weak | indif
+    necessary = roruta.streamRelations("{}/{}/necessary-relations.xml".format(run, roruta.relationsWidget), False, 9)
+    image = roruta.relationImage(dmPref, necessary)
+    for i in range(9):
+        for j in range(9):
+            colour = "red" if (i, j) in dmPref else ("green" if (i, j) in necessary else "black")
+            if tuple(image[i, j]) != roruta.relationColours[colour]:
+                raise Exception("The colour of ({}, {}) should be {}.".format(i, j, colour))
+
+    generator = Random(randomSeed)
+    relation = roruta.Relation(n, [generator.getrandbits(n) for _ in range(n)])
+    userDefined = roruta.Relation(n, [generator.getrandbits(n) & generator.getrandbits(n) & generator.getrandbits(n)
+                                      for _ in range(n)])
+    order = list(range(n))
+    generator.shuffle(order)
+    with TemporaryDirectory() as folder:
+        fileName = "{}/relations.png".format(folder)
+        t0 = perf_counter()
+        roruta.writePNG(fileName, roruta.relationImage(userDefined, relation, order))
+        t = perf_counter() - t0
+        size = getsize(fileName)
+    print("rendering of {0} x {0} relations: {1:.4f} s, {2:.1f} MB (budget: {3:.4f} s)".format(n, t, size / 2 ** 20,
+                                                                                            budget))
+    if t > budget:
+        raise Exception("The rendering took {:.4f} s, which exceeds the budget of {:.4f} s.".format(t, budget))
+    return t
+
+
+#############################################################################################
+# Scaling studies                                                                           #
+#############################################################################################
+
+scalingTimeBudget = 120.0  # in seconds, for all the default scales together
+scalingScales = [(10, 4, 5), (20, 4, 10), (20, 8, 10), (30, 6, 20), (40, 6, 40)]  # (n, criteria, preferences)
+scalingResultsFile = "scalingResults.jsonl"
+
+
+def syntheticProblem(n, nCriteria, nPreferences, levels=10, randomSeed=12345):
+    """
+    Generates a random problem: a performance table with integer performances in 1, ..., levels, random directions,
+    and nPreferences strict preferences, sampled from the order of the alternatives by a hidden random additive
+    value function (so that the preferences are consistent).
+
+    :param n: number of alternatives
+    :param nCriteria: number of criteria
+    :param nPreferences: number of user defined preferences (at most n (n - 1) / 2)
+    :param levels: number of different performances on each criterion
+    :param randomSeed: seed of the problem
+    :return: alt, criteria, perf, directions, prefList, hiddenFunction, where alt, criteria and perf are like the
+    output of readPerformanceCSV, and hiddenFunction is the hidden value function, like the output of
+    getRepresentativeFunction
+    """
+    from random import Random
+    import roruta
+
+    generator = Random(randomSeed)
+    alt = ["a{}".format(i) for i in range(n)]
+    criteria = ["cr{}".format(j) for j in range(nCriteria)]
+    directions = [generator.randint(0, 1) for _ in range(nCriteria)]
+    perf = {a: {cr: str(generator.randint(1, levels)) for cr in criteria} for a in alt}
+    hiddenFunction = {}
+    for j, cr in enumerate(criteria):
+        steps = sorted(generator.random() for _ in range(levels - 1))
+        ys = [0.0] + [y / nCriteria for y in steps]
+        if directions[j] == 1:
+            ys.reverse()
+        hiddenFunction[cr] = {x: ys[x - 1] for x in range(1, levels + 1)}
+    utility = {a: sum(hiddenFunction[cr][int(perf[a][cr])] for cr in criteria) for a in alt}
+    linearOrder = sorted(range(n), key=lambda i: -utility[alt[i]])
+    strong = roruta.randomSubsample(linearOrder, nPreferences, randomSeed)
+    strong = [[better, worse] for better, worse in strong if utility[better] > utility[worse]]  # no ties
+    return alt, criteria, perf, directions, [strong, [], []], hiddenFunction
+
+
+def measure(function, memory=True):
+    """
+    Calls the function and measures its wall time and (if memory) the peak of the memory that is allocated during
+    the call (in a second call, traced by tracemalloc, so that tracing does not distort the time). Only the memory
+    that is allocated through Python (including numpy arrays) is traced, not the memory of the LP solver.
+
+    :param function: function without arguments
+    :param memory: if True, the peak memory is measured
+    :return: (output of the function, time in seconds, peak memory in bytes or None)
+    """
+    import tracemalloc
+
+    t0 = perf_counter()
+    result = function()
+    t = perf_counter() - t0
+    peak = None
+    if memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, t, peak
+
+
+def currentVersion():
+    """
+    :return: the hash of the current git commit (with the suffix -dirty if there are uncommitted changes),
+    or None if it is unknown
+    """
+    try:
+        commit = run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=rorutaFolder)
+        status = run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True,
+                     cwd=rorutaFolder)
+    except OSError:
+        return None
+    if commit.returncode != 0:
+        return None
+    return commit.stdout.strip() + ("-dirty" if status.stdout.strip() else "")
+
+
+def processPeakMemory():
+    """
+    :return: the peak resident memory of the process so far (in bytes), or None if it is unknown (e.g., on Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, kilobytes elsewhere
+
+
+def benchmarkScaling(scales=None, resultsFile=scalingResultsFile, evaluationRows=10 ** 5, memory=True,
+                     budget=scalingTimeBudget, randomSeed=12345):
+    """
+    Computes the relations (computeRelations) and evaluates a value function (CompiledValueFunction) on synthetic
+    problems (see syntheticProblem) of the given scales, and appends one JSON line per scale to resultsFile:
+    the scale, the wall times, the peak memories, the numbers of solved and skipped linear programs,
+    the densities of the relations, and the version of the code (see currentVersion), so that the results of
+    different versions can be compared.
+
+    :param scales: list of (n, number of criteria, number of preferences); if None, scalingScales is used
+    :param resultsFile: the file with the results (JSON lines); if None, the results are only printed
+    :param evaluationRows: number of random alternatives that are evaluated
+    :param memory: if True, the peak memory of each step is measured
+    :param budget: maximal allowed time in seconds for all the scales together
+    :param randomSeed: seed of the problems
+    :return: list of the results (dictionaries)
+    """
+    import json
+    import platform
+    import numpy as np
+    import roruta
+
+    from scipy.optimize import linprog  # imported in advance, so that the import is not measured
+
+    scales = scalingScales if scales is None else scales
+    version = currentVersion()
+    results = []
+    total = 0.0
+    for n, nCriteria, nPreferences in scales:
+        alt, criteria, perf, directions, prefList, hiddenFunction = syntheticProblem(n, nCriteria, nPreferences,
+                                                                                     randomSeed=randomSeed)
+        statistics = {}
+
+        def relations():
+            statistics.clear()
+            return roruta.computeRelations(alt, criteria, perf, directions, prefList, statistics=statistics)
+
+        (necessary, possible), relationsTime, relationsMemory = measure(relations, memory)
+        for i in range(n):
+            for j in range(n):
+                if necessary[i][j] and not possible[i][j]:
+                    raise Exception("a{} >=N a{}, but not a{} >=P a{} (n = {}).".format(i, j, i, j, n))
+
+        function = roruta.CompiledValueFunction(hiddenFunction, nCriteria)
+        matrix = np.random.default_rng(randomSeed).uniform(1, 10, size=(evaluationRows, nCriteria))
+        _, evaluationTime, evaluationMemory = measure(lambda: function.score(matrix), memory)
+
+        pairs = n * (n - 1)
+        result = {"n": n, "criteria": nCriteria, "preferences": len(prefList[0]),
+                  "relationsTime": relationsTime, "relationsMemory": relationsMemory,
+                  "linearPrograms": statistics["pairs"], "skipped": statistics["skipped"],
+                  "necessaryDensity": (sum(map(sum, necessary)) - n) / pairs,
+                  "possibleDensity": (sum(map(sum, possible)) - n) / pairs,
+                  "evaluationRows": evaluationRows, "evaluationTime": evaluationTime,
+                  "evaluationMemory": evaluationMemory,
+                  "processPeakMemory": processPeakMemory(), "version": version,
+                  "python": platform.python_version(), "time": time()}
+        results.append(result)
+        total += relationsTime + evaluationTime
+        print("n = {}, criteria = {}, preferences = {}: relations {:.4f} s ({} LPs, {} skipped, densities {:.3f} / "
+              "{:.3f}), evaluation {:.4f} s".format(n, nCriteria, result["preferences"], relationsTime,
+                                                   result["linearPrograms"], result["skipped"],
+                                                   result["necessaryDensity"], result["possibleDensity"],
+                                                   evaluationTime))
+    if resultsFile is not None:
+        with open(resultsFile, "a") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print("results appended to {}".format(resultsFile))
+    print("scaling study: {:.4f} s (budget: {:.4f} s)".format(total, budget))
+    if total > budget:
+        raise Exception("The scaling study took {:.4f} s, which exceeds the budget of {:.4f} s.".format(total, budget))
+    return results
+
+
+#############################################################################################
+# Intensities of preferences                                                                #
+#############################################################################################
+
+
+def benchmarkIntensities(n=12, nCriteria=4, nIntensities=2000, randomSeed=12345):
+    """
+    Generates many intensities of preferences from the differences of the utilities of a synthetic problem
+    (see syntheticProblem), as they would come from pairwise-difference data (with many duplicates),
+    and compares the relations, the model sizes and the times of computeRelations with and without the reduction
+    of the statements (see StatementMatrix.reduced).
+
+    :param n: number of alternatives
+    :param nCriteria: number of criteria
+    :param nIntensities: number of generated intensities
+    :param randomSeed: seed of the problem
+    :return: {'reduced': time, 'full': time} (in seconds)
+    """
+    from random import Random
+    from scipy.optimize import linprog  # imported in advance, so that the import is not measured
+    import roruta
+
+    alt, criteria, perf, directions, prefList, hiddenFunction = syntheticProblem(n, nCriteria, n, levels=4,
+                                                                                 randomSeed=randomSeed)
+    utility = {a: sum(hiddenFunction[cr][int(perf[a][cr])] for cr in criteria) for a in alt}
+    generator = Random(randomSeed)
+    pairsOfPairs = [[], [], []]
+    for _ in range(nIntensities):
+        a, b, c, d = [generator.choice(alt) for _ in range(4)]
+        difference = utility[a] - utility[b] - utility[c] + utility[d]
+        if abs(difference) < 1e-12:
+            pairsOfPairs[2].append([[a, b], [c, d]])
+        elif difference > 0:
+            pairsOfPairs[generator.randint(0, 1)].append([[a, b], [c, d]])
+        else:
+            pairsOfPairs[generator.randint(0, 1)].append([[c, d], [a, b]])
+
+    times = {}
+    results = {}
+    statistics = {}
+    for name, reduce in [("full", False), ("reduced", True)]:
+        t0 = perf_counter()
+        results[name] = roruta.computeRelations(alt, criteria, perf, directions, prefList, pairsOfPairs,
+                                                reduce=reduce, statistics=statistics)
+        times[name] = perf_counter() - t0
+    if results["full"] != results["reduced"]:
+        raise Exception("The relations with and without the reduction differ.")
+    report = statistics["reduction"]
+    print("{} statements: {} remaining ({} trivial, {} duplicates, {} implied, {} merged, {} dominated)".format(
+        report["statements"], report["remaining"], report["trivial"], report["duplicates"], report["implied"],
+        report["merged"], report["dominated"]))
+    print("model: {} -> {} rows, {} -> {} nonzeros".format(
+        report["fullModelSize"]["rows"], report["modelSize"]["rows"], report["fullModelSize"]["nonzeros"],
+        report["modelSize"]["nonzeros"]))
+    print("relations: {:.4f} s without the reduction, {:.4f} s with it (speedup {:.1f})".format(
+        times["full"], times["reduced"], times["full"] / times["reduced"]))
+    return times
+
+
+def benchmarkConflict(n=100, nPreferences=1000, budget=relationsTimeBudget, randomSeed=12345):
+    """
+    Adds the reverse of a preference to the middle of the preferences of a random problem (see syntheticProblem),
+    finds a minimal conflict with minimalConflict and checks that it is minimal. Deletion filtering alone would solve
+    a linear program for each of the preferences.
+
+    :param n: number of alternatives
+    :param nPreferences: number of preferences
+    :param budget: maximal allowed time in seconds
+    :param randomSeed: seed of the problem
+    :return: the measured time
+    """
+    import roruta
+
+    alt, criteria, perf, directions, prefList, _ = syntheticProblem(n, 5, nPreferences, randomSeed=randomSeed)
+    strong = prefList[0]
+    middle = len(strong) // 2
+    strong.insert(middle, strong[middle // 2][::-1])
+    statistics = {}
+    t0 = perf_counter()
+    conflict, _, lines = roruta.minimalConflict(alt, criteria, perf, directions, prefList, statistics=statistics)
+    t = perf_counter() - t0
+    if roruta.RorutaModel(alt, criteria, perf, directions, conflict).isConsistent():
+        raise Exception("The conflict {} is consistent.".format(lines))
+    for k in range(len(conflict[0])):
+        smaller = [conflict[0][:k] + conflict[0][k + 1:], [], []]
+        if not roruta.RorutaModel(alt, criteria, perf, directions, smaller).isConsistent():
+            raise Exception("The conflict {} is not minimal.".format(lines))
+    print("minimal conflict {} among {} preferences: {:.4f} s, {} linear programs (deletion filtering alone: {}) "
+          "(budget: {:.4f} s)".format(lines, len(strong), t, statistics["linearPrograms"], len(strong), budget))
+    if t > budget:
+        raise Exception("Finding the conflict took {:.4f} s, which exceeds the budget of {:.4f} s.".format(t, budget))
+    return t
+
+
+#############################################################################################
+# Regression checks                                                                         #
+#############################################################################################
+
+def checkCatalogue():
+    """
+    Checks that the catalogue of runs (runCatalogue) notices the outputs that diviz writes into a run after it has
+    created the run folder (first into a new widget folder, and then into an existing one), that a refresh checks
+    only the runs in progress, and that runCatalogue without maxAge does not touch the disk.
+
+    :return: None
+    """
+    from os import makedirs, utime
+    import roruta
+
+    def touchFolders(folder, seconds):
+        # the folders get an old modification time, so that the later changes are seen even on coarse file systems
+        for path in [folder, run, "{}/{}".format(run, roruta.relationsWidget)]:
+            try:
+                utime(path, (seconds, seconds))
+            except FileNotFoundError:
+                pass
+
+    relations = "{}/necessary-relations.xml".format(roruta.relationsWidget)
+    function = "{}/representative-value-function.xml".format(roruta.relationsWidget)
+    old = int(time()) - 100
+    with TemporaryDirectory() as folder:
+        run = "{}/2024-01-01T10_00_00".format(folder)
+        makedirs(run)
+        with open("{}/preferences.xml".format(run), "w") as f:
+            f.write("x")
+        touchFolders(folder, old)
+        catalogue = roruta.runCatalogue(folder)
+        if catalogue.latest(relations) is not None:
+            raise Exception("The run has no relations yet.")
+        makedirs("{}/{}".format(run, roruta.relationsWidget))
+        with open("{}/{}".format(run, relations), "w") as f:
+            f.write("x")
+        touchFolders(folder, old + 50)
+        utime(folder, (old, old))  # the workflow folder does not change
+        latest = roruta.runCatalogue(folder, maxAge=0).latest(relations)
+        if latest is None or set(latest.outputs) != {"preferences.xml", relations}:
+            raise Exception("The catalogue did not notice the output {}.".format(relations))
+        with open("{}/{}".format(run, function), "w") as f:
+            f.write("x")
+        utime(folder, (old, old))
+        utime(run, (old + 50, old + 50))
+        if not roruta.runCatalogue(folder, maxAge=0).latest().has(function):
+            raise Exception("The catalogue did not notice the output {}.".format(function))
+
+        finished = "{}/2024-01-01T09_00_00/{}".format(folder, roruta.relationsWidget)
+        makedirs(finished)
+        for output in roruta.RunCatalogue.expectedOutputs:
+            with open("{}/{}".format(finished, output.split("/")[-1]), "w") as f:
+                f.write("x")
+        catalogue = roruta.runCatalogue(folder, maxAge=0)
+        runStamp = roruta.RunCatalogue.runStamp
+        stamped = []
+        roruta.RunCatalogue.runStamp = staticmethod(lambda entry: stamped.append(entry.name) or runStamp(entry))
+        refresh = roruta.RunCatalogue.refresh
+        try:
+            catalogue.refresh()
+            if stamped != ["2024-01-01T10_00_00"]:
+                raise Exception("The refresh checked the runs {} instead of the run in progress.".format(stamped))
+            roruta.RunCatalogue.refresh = None  # runCatalogue must not refresh
+            if len(roruta.runCatalogue(folder)) != 2:
+                raise Exception("The catalogue lost some runs.")
+        finally:
+            roruta.RunCatalogue.runStamp = staticmethod(runStamp)
+            roruta.RunCatalogue.refresh = refresh
+        del roruta.globalRunCatalogues[roruta.toSlash(folder)]
+    print("catalogue of runs: the later outputs of the runs are found, and only the runs in progress are checked")
+
+
+def checkSettingsFiles():
+    """
+    Checks that writeXMCDA rewrites a settings file only if its content changes: writing the same content again
+    must neither change the modification time of the file nor read it (once the file was written by this process),
+    and no temporary files may be left behind.
+
+    :return: None
+    """
+    from os import listdir, stat
+    import roruta
+
+    alt, criteria, perf = roruta.readPerformanceCSV()
+    with TemporaryDirectory() as folder:
+        fileName = "{}/performanceTable.xml".format(folder)
+        if not roruta.writeXMCDA(fileName, roruta.perfTableLines(alt, criteria, perf)):
+            raise Exception("A new file was not written.")
+        before = stat(fileName).st_mtime_ns
+        fileHash = roruta.fileHash
+        roruta.fileHash = None  # the file must not be read again
+        try:
+            if roruta.writeXMCDA(fileName, roruta.perfTableLines(alt, criteria, perf)):
+                raise Exception("The file with the same content was rewritten.")
+        finally:
+            roruta.fileHash = fileHash
+        if stat(fileName).st_mtime_ns != before:
+            raise Exception("The modification time of the file with the same content changed.")
+        del roruta.fileHashes[roruta.abspath(fileName)]  # as if the file was written by another process
+        if roruta.writeXMCDA(fileName, roruta.perfTableLines(alt, criteria, perf)):
+            raise Exception("The file with the same content was rewritten.")
+        if not roruta.writeXMCDA(fileName, roruta.perfTableLines(alt[1:], criteria, perf)):
+            raise Exception("The file with a different content was not rewritten.")
+        if listdir(folder) != ["performanceTable.xml"]:
+            raise Exception("The temporary files were not removed: {}".format(listdir(folder)))
+    print("settings files: the unchanged files are neither read nor written")
+
+
+def checkCache():
+    """
+    Checks the counters and the eviction of ResultCache: an entry without the relations must not count as a hit
+    of computeRelations, the representative function must be computed only once (for the same settings), and
+    the least recently used entries must be removed first.
+
+    :return: None
+    """
+    from os.path import isfile
+    import roruta
+
+    alt, criteria, perf = roruta.readPerformanceCSV()
+    prefList = [roruta.defineStrongRelations("{}/preferences/random12.pref".format(roruta.inputFolder)), [], []]
+    key = roruta.problemKey(alt, criteria, perf, carsDirections, prefList)
+    with TemporaryDirectory() as folder:
+        cache = roruta.ResultCache(folder)
+        divizFunction = carsRepresentativeFunction("random12")
+        cache.put(key, representative=divizFunction)
+        relations = roruta.computeRelations(alt, criteria, perf, carsDirections, prefList, cache=cache)
+        statistics = cache.statistics()
+        if (statistics["hits"], statistics["misses"]) != (0, 1):
+            raise Exception("An entry without the relations counted as a hit: {}".format(statistics))
+        if roruta.computeRelations(alt, criteria, perf, carsDirections, prefList, cache=cache) != relations:
+            raise Exception("The cached relations differ.")
+        if roruta.representativeFunction(alt, criteria, perf, carsDirections, prefList, cache=cache) != divizFunction:
+            raise Exception("The cached representative function differs.")
+        statistics = cache.statistics()
+        if (statistics["hits"], statistics["misses"]) != (2, 1):
+            raise Exception("Wrong numbers of hits and misses: {}".format(statistics))
+
+        # the representative function is computed (with the relations) only once
+        fullPrefList = [roruta.defineStrongRelations("{}/preferences/full.pref".format(roruta.inputFolder)), [], []]
+        function = roruta.representativeFunction(alt, criteria, perf, carsDirections, fullPrefList, cache=cache)
+        statistics = cache.statistics()
+        if (statistics["hits"], statistics["misses"]) != (2, 3):
+            raise Exception("Wrong numbers of hits and misses: {}".format(statistics))
+        incremental = roruta.IncrementalRelations(alt, criteria, perf, carsDirections, fullPrefList)
+        for cached in [roruta.representativeFunction(alt, criteria, perf, carsDirections, fullPrefList, cache=cache),
+                       incremental.representativeFunction(cache=cache)]:
+            if cached != function:
+                raise Exception("The cached representative function differs.")
+        statistics = cache.statistics()
+        if (statistics["hits"], statistics["misses"]) != (4, 3):
+            raise Exception("Wrong numbers of hits and misses: {}".format(statistics))
+        if roruta.representativeFunction(alt, criteria, perf, carsDirections, fullPrefList, compromise=True,
+                                         cache=cache) is None or cache.statistics()["misses"] != 4:
+            raise Exception("The function with other settings was taken from the cache.")
+
+        cache = roruta.ResultCache("{}/lru".format(folder))
+        cache.put(key, necessary=relations[0], possible=relations[1])
+        for k in ["b", "c"]:
+            cache.put(k, necessary=relations[0], possible=relations[1])
+        cache.maxBytes = cache.statistics()["bytes"]  # there is no space for one more entry
+        cache.get(key)  # key is now used more recently than b
+        cache.put("d", necessary=relations[0], possible=relations[1])
+        if isfile(cache.fileName("b")) or "b" in cache.entries:
+            raise Exception("The least recently used entry was not removed.")
+        if any(k not in cache.entries for k in [key, "c", "d"]):
+            raise Exception("A recently used entry was removed.")
+        if cache.statistics()["bytes"] > cache.maxBytes:
+            raise Exception("The cache is larger than maxBytes.")
+    print("result cache: hits, misses and eviction are correct")
+
+
+def checkSubsamples(n=8, size=5, draws=4000, maxChiSquare=60.0):
+    """
+    Checks the random subsamples of the pairs of alternatives (randomSubsample and streamRandomSubsample):
+    the sample of all the pairs must be found, the pairs must be distinct and agree with the linear order, and
+    over many seeds, each pair must be sampled about equally often (the chi-square statistic of the counts
+    of the n (n - 1) / 2 pairs must be below maxChiSquare).
+
+    :param n: number of alternatives for the test of uniformity
+    :param size: size of the samples for the test of uniformity
+    :param draws: number of samples for the test of uniformity
+    :param maxChiSquare: bound of the chi-square statistic (60 is exceeded with probability below 0.001 for 27
+    degrees of freedom)
+    :return: None
+    """
+    import roruta
+
+    for m in [2, 3, 10, 57]:
+        linearOrder = list(range(m))[::-1]
+        position = {"a{}".format(x): k for k, x in enumerate(linearOrder)}
+        allPairs = m * (m - 1) // 2
+        for mode, sampler in [("randomSubsample", roruta.randomSubsample),
+                              ("streamRandomSubsample", roruta.streamRandomSubsample)]:
+            for sampleSize in [0, 1, allPairs // 2, allPairs]:
+                pairs = [tuple(pair) for pair in sampler(linearOrder, sampleSize, 12345)]
+                if len(pairs) != sampleSize or len(set(pairs)) != sampleSize:
+                    raise Exception("{} returned {} distinct of {} pairs instead of {}.".format(
+                        mode, len(set(pairs)), len(pairs), sampleSize))
+                if any(position[better] >= position[worse] for better, worse in pairs):
+                    raise Exception("{} returned a pair that disagrees with the linear order.".format(mode))
+
+    linearOrder = list(range(n))
+    expected = draws * size / (n * (n - 1) // 2)
+    for mode, sampler in [("randomSubsample", roruta.randomSubsample),
+                          ("streamRandomSubsample", roruta.streamRandomSubsample)]:
+        counts = {}
+        for k in range(draws):
+            for better, worse in sampler(linearOrder, size, 12345 + k):
+                counts[better, worse] = counts.get((better, worse), 0) + 1
+        if len(counts) != n * (n - 1) // 2:
+            raise Exception("{} never sampled some pairs.".format(mode))
+        chiSquare = sum((c - expected) ** 2 / expected for c in counts.values())
+        print("{}: chi-square statistic of the counts of the pairs {:.2f} (bound: {:.2f})".format(mode, chiSquare,
+                                                                                                 maxChiSquare))
+        if chiSquare > maxChiSquare:
+            raise Exception("The samples of {} are not uniform.".format(mode))
+
+
+def checkColumns():
+    """
+    Checks that RorutaProject.performanceColumns memory-maps the binary file only if it was built from the same CSV
+    file and with the same numberTypes, even if the binary file is newer than the CSV file.
+
+    :return: None
+    """
+    from os import utime, stat
+    import roruta
+
+    def writeCSV(fileName, rows):
+        with open(fileName, "w") as f:
+            print("car,cr0,cr1", file=f)
+            for row in rows:
+                print(",".join(row), file=f)
+
+    with TemporaryDirectory() as folder:
+        csvFile = "{}/performances.csv".format(folder)
+        binaryFile = "{}/performances.bin".format(folder)
+        writeCSV(csvFile, [["a", "1", "2"], ["b", "3", "4"]])
+        project = roruta.RorutaProject(folder, "projects", "p", "performances.csv", numberTypes=[int, int])
+        if project.performanceColumns(binaryFile).namesLocation is not None:
+            raise Exception("The table was not built from the CSV file.")
+        project = roruta.RorutaProject(folder, "projects", "p", "performances.csv", numberTypes=[int, int])
+        if project.performanceColumns(binaryFile).namesLocation is None:
+            raise Exception("The binary file of the same CSV file was not used.")
+
+        # a restored CSV file, older than the binary file
+        writeCSV(csvFile, [["a", "5", "6"], ["b", "7", "8"], ["c", "9", "10"]])
+        old = stat(binaryFile).st_mtime - 100
+        utime(csvFile, (old, old))
+        project = roruta.RorutaProject(folder, "projects", "p", "performances.csv", numberTypes=[int, int])
+        table = project.performanceColumns(binaryFile)
+        if table.alternatives != ["a", "b", "c"] or table.columns[0].tolist() != [5, 7, 9]:
+            raise Exception("The binary file of another CSV file was used.")
+
+        project = roruta.RorutaProject(folder, "projects", "p", "performances.csv", numberTypes=[float, int])
+        table = project.performanceColumns(binaryFile)
+        if table.columns[0].dtype.kind != "f" or table.namesLocation is not None:
+            raise Exception("The binary file with other numberTypes was used.")
+        del table, project  # the binary file is memory-mapped
+    print("performance columns: the binary file is used only for the same CSV file and types")
+
+
+benchmarks = {"importTime": benchmarkImportTime,
+              "relations": benchmarkRelations,
+              "incremental": benchmarkIncremental,
+              "parallel": benchmarkParallel,
+              "parsers": benchmarkParsers,
+              "evaluation": benchmarkEvaluation,
+              "topK": benchmarkTopK,
+              "streaming": benchmarkStreaming,
+              "representative": benchmarkRepresentative,
+              "acceptability": benchmarkAcceptability,
+              "render": benchmarkRender,
+              "scaling": benchmarkScaling,
+              "intensities": benchmarkIntensities,
+              "conflict": benchmarkConflict,
+              "catalogue": checkCatalogue,
+              "settingsFiles": checkSettingsFiles,
+              "cache": checkCache,
+              "subsamples": checkSubsamples,
+              "columns": checkColumns}
+
+
+if __name__ == "__main__":
+    chdir(rorutaFolder)  # the paths of the cars example are relative
+    chosen = sys.argv[1:] if len(sys.argv) > 1 else list(benchmarks)
+    failed = []
+    for name in chosen:
+        try:
+            benchmarks[name]()
+        except Exception as e:
+            print("FAILED {}: {}".format(name, e))
+            failed.append(name)
+    sys.exit(1 if failed else 0)
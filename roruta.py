@@ -1,15 +1,10 @@
-from os import listdir
-from os.path import isfile
-from functools import partial
-from re import search
-from tkinter import *
-import matplotlib.pyplot as plt
-from random import random, seed
-
-
-# set the size of picture and font for pyplot
-plt.rcParams['figure.figsize'] = 20, 10
-plt.rcParams.update({'font.size': 15})
+from os import listdir, stat, cpu_count, makedirs, utime, replace, remove, getpid
+from os.path import isfile, abspath
+from re import search, compile as compileRegex
+from math import gcd, isqrt
+from random import Random
+from threading import Lock, get_ident
+from time import perf_counter, time
 
 
 def toSlash(myPath):
@@ -32,80 +27,806 @@ def toSlash(myPath):
 
 
 #############################################################################################
-# Performance table creation and reading                                                    #
+# Instrumentation                                                                           #
 #############################################################################################
 
 
-def populatePerfTableDict(alternativeName):
+def logger():
     """
-    For Semi-automatic filling of the performanceTableDict. You will be asked to enter
-    the values of the criteria. The input values are saved to performanceTableDict.
+    Returns the logger of the module (logging is imported only when something is logged). Configure it as any other
+    logger, e.g., logging.basicConfig(level=logging.INFO) shows the messages that used to be printed.
 
-    :param alternativeName: The name of the alternative, we want to describe.
-    :return: None
+    :return: logging.getLogger('roruta')
     """
+    import logging
 
-    print("Collecting data for", alternativeName)
-    performanceTableDict[alternativeName] = {}
-    for i,x in enumerate(criteriaNames):
-        numberType = numberTypes[i]
-        performanceTableDict[alternativeName][x] = numberType(input("Enter {}: ".format(x)).strip())
+    return logging.getLogger("roruta")
 
 
-def createCSVPerformanceTable():
+class Instrumentation:
+    """
+    Opt-in timers and counters of the stages of the pipeline (reading the performance table, writing the XML files,
+    reading the outputs, evaluating, drawing ...). When disabled (the default), an instrumented function costs only
+    one attribute check. When enabled, each call of an instrumented function is timed, logged (at the level DEBUG,
+    with the fields stage and seconds) and recorded, so that the per-stage statistics (summary) and a trace
+    (exportTrace) can be obtained.
     """
-    Creates a CSV (comma-separated) of the form
 
-    alternative,<crit1>,<crit2>,...,<critM>
-    <alternative1>,<value11>,<value12>,...
-    ...
-    <alternativeN>,<valueN1>,...
+    def __init__(self):
+        self.enabled = False
+        self.lock = Lock()
+        self.origin = perf_counter()
+        self.events = []  # [(stage, start, duration, thread), ...], start is relative to origin
+        self.counters = {}  # {name: value, ...}
 
-    where <critJ> are the names of the criteria, <alternativeI> are names of the alternatives, and <valueIJ> is the
-    value of J-th criterion for the I-th alternative.
+    def enable(self):
+        self.enabled = True
 
-    This file (table in it) is necessary for (almost) all of the following operations.
-    If the inputFolder/performanceTableCSV already exists, nothing happens, otherwise populatePerfTableDict is used,
-    and the result is saved to inputFolder/performanceTableCSV.
+    def disable(self):
+        self.enabled = False
 
-    :return: None
+    def reset(self):
+        """
+        Forgets the recorded calls and counters.
+
+        :return: None
+        """
+        with self.lock:
+            self.origin = perf_counter()
+            self.events = []
+            self.counters = {}
+
+    def record(self, stage, start, duration):
+        """
+        Records a call of a stage.
+
+        :param stage: name of the stage, e.g., 'readPerformanceCSV'
+        :param start: perf_counter() at the start of the call
+        :param duration: duration of the call in seconds
+        :return: None
+        """
+        with self.lock:
+            self.events.append((stage, start - self.origin, duration, get_ident()))
+        logger().debug("%s: %.6f s", stage, duration, extra={"stage": stage, "seconds": duration})
+
+    def count(self, name, increment=1):
+        """
+        Increases a counter (if the instrumentation is enabled), e.g., the number of solved linear programs.
+
+        :param name: name of the counter
+        :param increment: the increment
+        :return: None
+        """
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + increment
+
+    def stage(self, name):
+        """
+        Times a block of code, e.g.,
+
+        with instrumentation.stage('myStage'):
+            ...
+
+        :param name: name of the stage
+        :return: context manager
+        """
+        from contextlib import contextmanager
+
+        @contextmanager
+        def timer():
+            if not self.enabled:
+                yield
+                return
+            start = perf_counter()
+            try:
+                yield
+            finally:
+                self.record(name, start, perf_counter() - start)
+        return timer()
+
+    def summary(self):
+        """
+        :return: {'stages': {stage: {'calls': ..., 'total': ..., 'mean': ..., 'max': ...}, ...},
+        'counters': {name: value, ...}}, where the times are in seconds
+        """
+        with self.lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+        stages = {}
+        for stage, _, duration, _ in events:
+            s = stages.setdefault(stage, {"calls": 0, "total": 0.0, "max": 0.0})
+            s["calls"] += 1
+            s["total"] += duration
+            s["max"] = max(s["max"], duration)
+        for s in stages.values():
+            s["mean"] = s["total"] / s["calls"]
+        return {"stages": stages, "counters": counters}
+
+    def exportTrace(self, fileName):
+        """
+        Writes the recorded calls as a JSON trace (the Trace Event Format, which can be opened in, e.g.,
+        chrome://tracing or Perfetto), together with the summary.
+
+        :param fileName: path to the file
+        :return: None
+        """
+        import json
+
+        with self.lock:
+            events = list(self.events)
+        trace = {"traceEvents": [{"name": stage, "ph": "X", "ts": start * 10 ** 6, "dur": duration * 10 ** 6,
+                                  "pid": getpid(), "tid": thread}
+                                 for stage, start, duration, thread in events],
+                 "displayTimeUnit": "ms",
+                 "summary": self.summary()}
+        with open(fileName, "w") as f:
+            json.dump(trace, f)
+
+
+instrumentation = Instrumentation()
+
+
+def instrumented(function):
     """
+    Decorator of the entry points of the pipeline: if the instrumentation is enabled, each call is timed and recorded
+    under the name of the function (see Instrumentation).
+    """
+    from functools import wraps
 
-    separator = ","
-    alreadyExists = False
-    for f in listdir(inputFolder):
-        if isfile("{}/{}".format(inputFolder,f)) and f == performanceTableCSV:
-            alreadyExists = True
-            break
-    if alreadyExists:
-        print("The file that contains performance table already exists. This note is the only effect of this call of "
-              "createCSVPerformanceTable.")
-    else:
-        for x in myAlternatives:
-            populatePerfTableDict(x)
-        with open("{}/{}".format(inputFolder, performanceTableCSV), "w") as f:
-            print("{}{}{}".format(alternative, separator, separator.join(criteriaNames)), file=f)
-            for x in myAlternatives:
-                line = [x] + [str(performanceTableDict[x][y]) for y in criteriaNames]
-                print(separator.join(line),  file=f)
+    stage = function.__name__
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not instrumentation.enabled:
+            return function(*args, **kwargs)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            instrumentation.record(stage, start, perf_counter() - start)
+    return wrapper
+
+
+#############################################################################################
+# Decision problem (project)                                                                #
+#############################################################################################
+
+
+class RorutaProject:
+    """
+    Holds everything that defines a decision problem and its diviz project: the folders, the alternatives,
+    the criteria and the (cached) performance table. Different projects share no state, so many of them can be
+    prepared and analysed at the same time (e.g., in a thread pool).
+
+    The module level functions, such as alternativesXML, are thin wrappers of the methods of the project that is
+    defined by the module globals inputFolder, myProjects, projectName etc. (see globalProject).
+    """
+
+    def __init__(self, inputFolder, myProjects, projectName, performanceTableCSV, alternative="alternative",
+                 myAlternatives=None, criteriaNames=None, numberTypes=None, performanceTableDict=None):
+        """
+        :param inputFolder: location of performanceTableCSV and folders with settings files
+        :param myProjects: folder in inputFolder, where folders with settings files are stored
+        :param projectName: the name of the diviz workflow; the settings files are created in
+        inputFolder/myProjects/projectName
+        :param performanceTableCSV: name of the file (in inputFolder), where the performance table is stored
+        :param alternative: type of the alternatives, e.g., 'car' (the first column name in performanceTableCSV)
+        :param myAlternatives: list of the names of the alternatives; if None, the list is read from
+        performanceTableCSV
+        :param criteriaNames: list of the names of the criteria; if None, the list is read from performanceTableCSV
+        :param numberTypes: list of types (int or float) of the criteria; if None, float is used for all criteria
+        :param performanceTableDict: dictionary, filled by populatePerfTableDict; if None, an empty one is created
+        """
+        self.inputFolder = toSlash(inputFolder)
+        self.myProjects = myProjects
+        self.projectName = projectName
+        self.performanceTableCSV = performanceTableCSV
+        self.alternative = alternative
+        self.performanceTableDict = {} if performanceTableDict is None else performanceTableDict
+        self.cacheLock = Lock()
+        self.performanceTableCache = None  # (stamp of the CSV file, output of readPerformanceCSV)
+        self.performanceColumnsCache = None  # (stamp of the CSV file, output of performanceColumns)
+        if myAlternatives is None or criteriaNames is None:
+            alter, critNames, _ = self.readPerformanceCSV()
+            myAlternatives = alter if myAlternatives is None else myAlternatives
+            criteriaNames = critNames if criteriaNames is None else criteriaNames
+        self.myAlternatives = list(myAlternatives)
+        self.criteriaNames = list(criteriaNames)
+        self.numberTypes = [float] * len(self.criteriaNames) if numberTypes is None else list(numberTypes)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["cacheLock"]  # locks can not be pickled, e.g., when sending the project to a worker process
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cacheLock = Lock()
+
+    def settingsFile(self, fileName):
+        """
+        Returns the path to a settings file of the project.
+
+        :param fileName: name of the file, e.g., 'alternatives.xml'
+        :return: inputFolder/myProjects/projectName/fileName
+        """
+        return "{}/{}/{}/{}".format(self.inputFolder, self.myProjects, self.projectName, fileName)
+
+    #########################################################################################
+    # Performance table creation and reading                                                #
+    #########################################################################################
+
+    def populatePerfTableDict(self, alternativeName):
+        """
+        For Semi-automatic filling of the performanceTableDict. You will be asked to enter
+        the values of the criteria. The input values are saved to performanceTableDict.
+
+        :param alternativeName: The name of the alternative, we want to describe.
+        :return: None
+        """
+
+        logger().info("Collecting data for %s", alternativeName)
+        self.performanceTableDict[alternativeName] = {}
+        for i,x in enumerate(self.criteriaNames):
+            numberType = self.numberTypes[i]
+            self.performanceTableDict[alternativeName][x] = numberType(input("Enter {}: ".format(x)).strip())
+
+    @instrumented
+    def createCSVPerformanceTable(self):
+        """
+        Creates a CSV (comma-separated) of the form
+
+        alternative,<crit1>,<crit2>,...,<critM>
+        <alternative1>,<value11>,<value12>,...
+        ...
+        <alternativeN>,<valueN1>,...
+
+        where <critJ> are the names of the criteria, <alternativeI> are names of the alternatives, and <valueIJ> is the
+        value of J-th criterion for the I-th alternative.
+
+        This file (table in it) is necessary for (almost) all of the following operations.
+        If the inputFolder/performanceTableCSV already exists, nothing happens, otherwise populatePerfTableDict is used,
+        and the result is saved to inputFolder/performanceTableCSV.
+
+        :return: None
+        """
+
+        separator = ","
+        alreadyExists = False
+        for f in listdir(self.inputFolder):
+            if isfile("{}/{}".format(self.inputFolder, f)) and f == self.performanceTableCSV:
+                alreadyExists = True
+                break
+        if alreadyExists:
+            logger().info("The file that contains performance table already exists. This note is the only effect of "
+                          "this call of createCSVPerformanceTable.")
+        else:
+            for x in self.myAlternatives:
+                self.populatePerfTableDict(x)
+            with open("{}/{}".format(self.inputFolder, self.performanceTableCSV), "w") as f:
+                print("{}{}{}".format(self.alternative, separator, separator.join(self.criteriaNames)), file=f)
+                for x in self.myAlternatives:
+                    line = [x] + [str(self.performanceTableDict[x][y]) for y in self.criteriaNames]
+                    print(separator.join(line),  file=f)
+
+    @instrumented
+    def readPerformanceCSV(self):
+        """
+        Reads the performance table in the file  inputFolder/performanceTableCSV. The table is parsed only once
+        (and again only if the file changes), so the returned objects are shared and should not be modified.
+
+        :return: [altName1, ...], [critName1, ...], {altName1: {critName1: value11, ...}, ...}
+        """
+
+        fileName = "{}/{}".format(self.inputFolder, self.performanceTableCSV)
+        info = stat(fileName)
+        stamp = (info.st_mtime_ns, info.st_size)
+        with self.cacheLock:
+            if self.performanceTableCache is not None and self.performanceTableCache[0] == stamp:
+                return self.performanceTableCache[1]
+            alter = []
+            perf = {}
+            with open(fileName) as f:
+                critNames = f.readline().strip().split(",")[1:]
+                for x in f:
+                    line = x.strip().split(",")
+                    alter.append(line[0])
+                    perf[line[0]] = {critNames[i - 1]: line[i] for i in range(1, len(line))}
+            self.performanceTableCache = (stamp, (alter, critNames, perf))
+            return alter, critNames, perf
+
+    @instrumented
+    def performanceColumns(self, binaryFile=None):
+        """
+        Returns the performance table in the file inputFolder/performanceTableCSV as PerformanceColumns. The table is
+        parsed only once (and again only if the file changes). If binaryFile is given, the table is saved to it,
+        and is memory-mapped from it in the later runs, as long as it was built from the same CSV file (with the same
+        size and modification time) and with the same numberTypes; otherwise, it is built again.
+
+        :param binaryFile: path to the binary file (see PerformanceColumns.save) or None
+        :return: PerformanceColumns
+        """
+
+        fileName = "{}/{}".format(self.inputFolder, self.performanceTableCSV)
+        info = stat(fileName)
+        stamp = (info.st_mtime_ns, info.st_size, binaryFile)
+        with self.cacheLock:
+            if self.performanceColumnsCache is not None and self.performanceColumnsCache[0] == stamp:
+                return self.performanceColumnsCache[1]
+            source = {"csvSize": info.st_size, "csvMtime": info.st_mtime_ns,
+                      "numberTypes": [numberType.__name__ for numberType in self.numberTypes]}
+            table = None
+            if binaryFile is not None and isfile(binaryFile):
+                table = PerformanceColumns.load(binaryFile)
+                if table.source != source:
+                    table = None  # built from another CSV file or with other types
+            if table is None:
+                table = PerformanceColumns.fromCSV(fileName, self.numberTypes)
+                if binaryFile is not None:
+                    table.save(binaryFile, source)
+            self.performanceColumnsCache = (stamp, table)
+            return table
+
+    #########################################################################################
+    # Creating necessary XML settings files for diviz                                       #
+    #########################################################################################
+
+    @instrumented
+    def alternativesXML(self, alt, compact=False):
+        """
+        Creates alternatives XML in inputFolder/myProjects/projectName folder.
+
+        :param alt: List of the names of the alternatives.
+        :param compact: if True, the file is written without indentation and line breaks
+        :return: True if the file was (re)written, and False if its content did not change (see writeXMCDA)
+        """
+        return writeXMCDA(self.settingsFile("alternatives.xml"), alternativesLines(alt), compact)
+
+    @instrumented
+    def criteriaXML(self, criteria, compact=False):
+        """
+        Creates criteria XML in inputFolder/myProjects/projectName folder.
+
+        :param criteria: List of the names of the criteria.
+        :param compact: if True, the file is written without indentation and line breaks
+        :return: True if the file was (re)written, and False if its content did not change (see writeXMCDA)
+        """
+        return writeXMCDA(self.settingsFile("criteria.xml"), criteriaLines(criteria), compact)
+
+    @instrumented
+    def perfTableXML(self, alt, criteria, perf, compact=False):
+        """
+        Creates performance table XML in inputFolder/myProjects/projectName folder.
+
+        :param alt: names of laternatives (list)
+        :param criteria: names of criteria (list)
+        :param perf: pefrormance table (dictionary: {alternative: {criterion: value, ...}, ...})
+        :param compact: if True, the file is written without indentation and line breaks
+        :return: True if the file was (re)written, and False if its content did not change (see writeXMCDA)
+        """
+        return writeXMCDA(self.settingsFile("performanceTable.xml"), perfTableLines(alt, criteria, perf), compact)
+
+    @instrumented
+    def preferencesXML(self, prefList, compact=False):
+        """
+        Creates preferences XML of user defined preferences in inputFolder/myProjects/projectName folder.
+
+        :param prefList:  A list of length three: the elements correspond to strong, weak and indiference preferences.
+        Each of the three elements is of form [[a<id11>, a<id12>], [a<id21>, a<id22>], [a<id31>, a<id32>], ...]
+        and contains at least 0 pairs.
+        If R is a relation (>, >= or =), then [a<id1>, a<id2>] encodes the fact that a<id1> R a<id2>.
+        :param compact: if True, the file is written without indentation and line breaks
+        :return: True if the file was (re)written, and False if its content did not change (see writeXMCDA)
+        """
+        return writeXMCDA(self.settingsFile("preferences.xml"), preferencesLines(prefList), compact)
+
+    @instrumented
+    def criteriaDirectXML(self, directions, compact=False):
+        """
+        Creates criteria directions XML in inputFolder/myProjects/projectName folder.
+
+        :param directions: a 0/1 list of directions, where 0 is used for the criteria where more is better
+        (e.g., profit), and 1 otherwise (e.g., cost).
+        :param compact: if True, the file is written without indentation and line breaks
+        :return: True if the file was (re)written, and False if its content did not change (see writeXMCDA)
+        """
+        return writeXMCDA(self.settingsFile("criteriaPreferenceDirections.xml"), criteriaDirectLines(directions),
+                          compact)
+
+    @instrumented
+    def intensitiesOfPrefXML(self, pairsOfPairs, compact=False):
+        """
+        Creates intensities of preferences XML in inputFolder/myProjects/projectName folder.
+
+        :param pairsOfPairs: Like in the function preferences, the input list contains three elements that correspond
+        to strict, weak and indifferent intensities. Each of the three elements contains at least 0
+        elements of the form [[a,b],[c,d]] where a-d are alternatives. Such an element encodes the fact
+        that U(a)- U(b) R U(c) - U(d), where R is one of the relations >, >= and =, and U is a utility function.
+        :param compact: if True, the file is written without indentation and line breaks
+        :return: True if the file was (re)written, and False if its content did not change (see writeXMCDA)
+        """
+        return writeXMCDA(self.settingsFile("intensitiesOfPref.xml"), intensitiesOfPrefLines(pairsOfPairs), compact)
+
+    def writeSettingsFiles(self, alt, criteria, perf, prefList, directions, pairsOfPairs, compact=False):
+        """
+        Creates all the XML settings files in inputFolder/myProjects/projectName folder (see alternativesXML,
+        criteriaXML, perfTableXML, preferencesXML, criteriaDirectXML and intensitiesOfPrefXML for the parameters).
+        The files whose content did not change are not rewritten.
+
+        :return: list of the names of the settings files that were (re)written, e.g., ['preferences.xml']
+        """
+        written = [("alternatives.xml", self.alternativesXML(alt, compact)),
+                   ("criteria.xml", self.criteriaXML(criteria, compact)),
+                   ("performanceTable.xml", self.perfTableXML(alt, criteria, perf, compact)),
+                   ("preferences.xml", self.preferencesXML(prefList, compact)),
+                   ("criteriaPreferenceDirections.xml", self.criteriaDirectXML(directions, compact)),
+                   ("intensitiesOfPref.xml", self.intensitiesOfPrefXML(pairsOfPairs, compact))]
+        return [fileName for fileName, changed in written if changed]
+
+    #########################################################################################
+    # User defined relations                                                                #
+    #########################################################################################
+
+    def createRandomSubsampleOfAllRelations(self, linearOrder, size, file, randomSeed=12345, stream=False):
+        """
+        We sample uniformly at random (without replacement) some relations and save them to file.
+        :param linearOrder: [indexOfTheBestAlternative, indexOfSecondBestAlternative, ...], where indices >= 0 and they
+        correspond to the list myAlternatives.
+        :param size: the size of the random sample, 0 <= size <= n (n - 1) / 2
+        :param randomSeed: randomSeed used
+        :param file: The subsample will be saved to inputFolder/preferences/file.pref
+        :param stream: if True, the relations are written while they are sampled (see streamRandomSubsample),
+        so that the sample is never held in memory (the sample then differs from the one for stream=False)
+        :return:
+        """
+        pairs = streamRandomSubsample(linearOrder, size, randomSeed) if stream else \
+            randomSubsample(linearOrder, size, randomSeed)
+        writePreferences("{}/preferences/{}.pref".format(self.inputFolder, file), pairs)
+
+    def createRandomSubsamples(self, linearOrder, size, count, file=None, randomSeed=12345):
+        """
+        Creates many random subsamples at once (e.g., for simulation studies): the k-th one is the subsample of
+        createRandomSubsampleOfAllRelations with the seed randomSeed + k.
+
+        :param linearOrder: as in createRandomSubsampleOfAllRelations
+        :param size: the size of each subsample
+        :param count: the number of subsamples
+        :param file: if given, the k-th subsample is saved to inputFolder/preferences/file<k>.pref
+        :param randomSeed: the seed of the first subsample
+        :return: the output of randomSubsamples
+        """
+        subsamples = randomSubsamples(linearOrder, size, count, randomSeed)
+        if file is not None:
+            for k, pairs in enumerate(subsamples):
+                writePreferences("{}/preferences/{}{}.pref".format(self.inputFolder, file, k), pairs)
+        return subsamples
+
+    def createLinearRelations(self, linearOrder, file):
+        """
+        From the list linearOrder = [indexOfTheBestAlternative, indexOfSecondBestAlternative, ...] of length n,
+        we create a file that contains n - 1 lines:
+
+        a<indexOfTheBestAlternative> > a<indexOfSecondBestAlternative>
+        ...
+        a<indexOf(n-1)BestAlternative> > a<indexOf(n)BestAlternative>
+
+        :param linearOrder:
+        :param file: The relations will be saved to inputFolder/preferences/file.pref
+        :return:
+        """
+        with open("{}/preferences/{}.pref".format(self.inputFolder, file), "w") as f:
+            for i in range(len(linearOrder) - 1):
+                print("a{} > a{}".format(linearOrder[i], linearOrder[i + 1]), file=f)
+
+    #########################################################################################
+    # Analyzing results                                                                     #
+    #########################################################################################
+
+    @instrumented
+    def evalRepresentativeFunction(self, dictFunction, alternativesToEvaluate, file='', sortByUtility=True):
+        """
+        Evaluats the function given as the dictionary {'cr0': {x00: y00, x01: y01, ...}, ...} on the list of indices of
+        alternatives alternativesToEvaluate (with respect to myAlternatives). Indices of criteria correspond
+        to the criteriaNames.
+        :param dictFunction:
+        :param alternativesToEvaluate:
+        :param file: if file == '', the results are standardly output, otherwise, they are saved to the file.
+        :param sortByUtility: if True, the alternatives are sorted in descreasing order by their utilites when producing
+        output, otherwise, the alternatives are sorted as in alternativesToEvalueate.
+        :return: list of values representativeFunction(alternative) (in the order of alternativesToEvaluate);
+        the values between the breakpoints of dictFunction are interpolated (see CompiledValueFunction)
+        """
+        _, _, performances = self.readPerformanceCSV()
+        names = [self.myAlternatives[ind_a] for ind_a in alternativesToEvaluate]
+        function = CompiledValueFunction(dictFunction, len(self.criteriaNames))
+        utilities = function.score(performanceMatrix(names, self.criteriaNames, performances))
+        evaluations = {a: float(u) for a, u in zip(names, utilities)}
+        sortingCriteron = (lambda u: -evaluations[u]) if sortByUtility else lambda u: u
+        if file != '':
+            with open(file, "w") as f:
+                print("alternative,mostRepresentativeUtilityFunction(alternative)", file=f)
+                for x in sorted(evaluations, key=sortingCriteron):
+                    print("{},{:.4f}".format(x, evaluations[x]), file=f)
+        else:
+            print("alternative,mostRepresentativeUtilityFunction(alternative)")
+            for x in sorted(evaluations, key=sortingCriteron):
+                print("{},{:.4f}".format(x, evaluations[x]))
+        return [evaluations[a] for a in names]
+
+    def topRepresentative(self, dictFunction, k, chunkRows=100000):
+        """
+        Finds the k alternatives with the highest utilities (see topUtilities) in the file
+        inputFolder/performanceTableCSV, which is read chunk by chunk (and not parsed by readPerformanceCSV).
+
+        :param dictFunction: as in evalRepresentativeFunction
+        :param k: number of the alternatives
+        :param chunkRows: number of alternatives that are evaluated at once
+        :return: list of at most k pairs [name, utility], sorted by decreasing utility
+        """
+        return topUtilities(dictFunction, "{}/{}".format(self.inputFolder, self.performanceTableCSV), k, chunkRows)
+
+    def rankRepresentative(self, dictFunction, alternativesToRank, chunkRows=100000):
+        """
+        Finds the ranks of the alternatives with respect to their utilities (see utilityRanks) in the file
+        inputFolder/performanceTableCSV, which is read chunk by chunk.
+
+        :param dictFunction: as in evalRepresentativeFunction
+        :param alternativesToRank: list of indices of alternatives (with respect to myAlternatives)
+        :param chunkRows: number of alternatives that are evaluated at once
+        :return: list of pairs [rank, utility] (in the order of alternativesToRank)
+        """
+        names = [self.myAlternatives[ind_a] for ind_a in alternativesToRank]
+        ranks = utilityRanks(dictFunction, "{}/{}".format(self.inputFolder, self.performanceTableCSV), names,
+                             chunkRows)
+        return [ranks[a] for a in names]
+
+    def scoreRepresentative(self, dictFunction, file='', chunkRows=100000):
+        """
+        Evaluates the function on all the alternatives in inputFolder/performanceTableCSV while streaming
+        the table (see scoreCSV): unlike evalRepresentativeFunction, neither the table nor the utilities are kept
+        in memory, and the alternatives are output in the order of the table.
+
+        :param dictFunction: as in evalRepresentativeFunction
+        :param file: if file == '', the results are standardly output, otherwise, they are saved to the file.
+        :param chunkRows: number of alternatives that are evaluated at once
+        :return: the statistics of scoreCSV (number of rows, time and rows per second)
+        """
+        return scoreCSV(dictFunction, "{}/{}".format(self.inputFolder, self.performanceTableCSV),
+                        None if file == '' else file, chunkRows)
+
+globalProjectCache = {}
+
+
+def globalProject():
+    """
+    Returns the project that is defined by the module globals inputFolder, myProjects, projectName,
+    performanceTableCSV, alternative, myAlternatives, criteriaNames, numberTypes and performanceTableDict.
+    A new project is created only when some of these globals changes, so the cached performance table is reused.
+
+    :return: RorutaProject
+    """
+
+    key = (inputFolder, myProjects, projectName, performanceTableCSV, alternative, tuple(myAlternatives),
+           tuple(criteriaNames), tuple(numberTypes), id(performanceTableDict))
+    project = globalProjectCache.get(key)
+    if project is None:
+        project = RorutaProject(inputFolder, myProjects, projectName, performanceTableCSV, alternative,
+                                myAlternatives, criteriaNames, numberTypes, performanceTableDict)
+        globalProjectCache.clear()
+        globalProjectCache[key] = project
+    return project
+
+
+#############################################################################################
+# Performance table creation and reading                                                    #
+#############################################################################################
+
+
+def populatePerfTableDict(alternativeName):
+    """
+    Calls RorutaProject.populatePerfTableDict on the project, defined by the module globals (see globalProject).
+    """
+    globalProject().populatePerfTableDict(alternativeName)
+
+
+def createCSVPerformanceTable():
+    """
+    Calls RorutaProject.createCSVPerformanceTable on the project, defined by the module globals (see globalProject).
+    """
+    globalProject().createCSVPerformanceTable()
 
 
 def readPerformanceCSV():
     """
-    Reads the performance table in the file  inputFolder/performanceTableCSV.
+    Calls RorutaProject.readPerformanceCSV on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().readPerformanceCSV()
+
 
-    :return: [altName1, ...], [critName1, ...], {altName1: {critName1: value11, ...}, ...}
+
+def performanceColumns(binaryFile=None):
+    """
+    Calls RorutaProject.performanceColumns on the project, defined by the module globals (see globalProject).
     """
+    return globalProject().performanceColumns(binaryFile)
+
+
+class PerformanceColumns:
+    """
+    A performance table, stored by columns: one typed numpy array (int64 or float64) per criterion.
+    The CSV file is parsed only once (chunk by chunk, so that tables with millions of alternatives fit into memory),
+    and the table can be saved to a binary file, from which it is later memory-mapped: repeated runs and worker
+    processes then share the same pages of the file instead of parsing or copying the table. Needs numpy.
+
+    The binary file contains a magic line, the length of the header, the header (JSON with the names of the criteria,
+    types and offsets of the columns, and the description of the source of the table), the columns and the names
+    of the alternatives (one per line).
+    """
+
+    magic = b"RORUTA-COLUMNS-1\n"
+    alignment = 64
+
+    def __init__(self, alternatives, criteria, columns):
+        """
+        :param alternatives: list of the names of the alternatives (or None, if they are read lazily, see load)
+        :param criteria: list of the names of the criteria
+        :param columns: list of numpy arrays (one per criterion, in the order of criteria)
+        """
+        self.alternativeNames = alternatives
+        self.namesLocation = None  # (binaryFile, offset, length) of the lazily read names
+        self.criteria = list(criteria)
+        self.columns = list(columns)
+        self.source = None  # e.g., the size and modification time of the CSV file and the types (see save)
+
+    @property
+    def alternatives(self):
+        """
+        The list of the names of the alternatives (read from the binary file at the first access).
+        """
+        if self.alternativeNames is None:
+            binaryFile, offset, length = self.namesLocation
+            with open(binaryFile, "rb") as f:
+                f.seek(offset)
+                names = f.read(length).decode("utf-8")
+            self.alternativeNames = names.split("\n") if names else []
+        return self.alternativeNames
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __reduce__(self):
+        if self.namesLocation is not None:
+            # a memory-mapped table is sent to a worker process as the name of its file, and mapped again there
+            return self.__class__.load, (self.namesLocation[0],)
+        return self.__class__, (self.alternatives, self.criteria, self.columns)
+
+    @classmethod
+    def fromCSV(cls, csvFile, numberTypes=None, chunkRows=100000):
+        """
+        Parses a performance table in the CSV form of createCSVPerformanceTable.
+
+        :param csvFile: path to the CSV file
+        :param numberTypes: list of types (int or float) of the criteria; if None, a column is int if all its values
+        are integers, and float otherwise
+        :param chunkRows: number of rows that are parsed at once
+        :return: PerformanceColumns
+        """
+        import numpy as np
+
+        def convert(values, j):
+            if numberTypes is not None:
+                return np.array(values, dtype=np.int64 if numberTypes[j] is int else np.float64)
+            try:
+                return np.array(values, dtype=np.int64)
+            except ValueError:
+                return np.array(values, dtype=np.float64)
+
+        alternatives = []
+        with open(csvFile) as f:
+            criteria = f.readline().strip().split(",")[1:]
+            chunks = [[] for _ in criteria]
+            rows = []
+            for x in f:
+                line = x.strip()
+                if line:
+                    rows.append(line.split(","))
+                if len(rows) == chunkRows:
+                    alternatives.extend(row[0] for row in rows)
+                    for j, values in enumerate(zip(*rows)):
+                        if j > 0:
+                            chunks[j - 1].append(convert(values, j - 1))
+                    rows = []
+            if rows:
+                alternatives.extend(row[0] for row in rows)
+                for j, values in enumerate(zip(*rows)):
+                    if j > 0:
+                        chunks[j - 1].append(convert(values, j - 1))
+        columns = []
+        for parts in chunks:
+            if not parts:
+                columns.append(np.zeros(0))
+            elif any(part.dtype == np.float64 for part in parts):
+                columns.append(np.concatenate([part.astype(np.float64) for part in parts]))
+            else:
+                columns.append(np.concatenate(parts))
+        return cls(alternatives, criteria, columns)
+
+    def save(self, binaryFile, source=None):
+        """
+        Saves the table to a binary file (see load). The file is written to a temporary file first, so that
+        the processes that have the old file memory-mapped are not affected.
+
+        :param binaryFile: path to the file
+        :param source: JSON-serializable description of the source of the table (e.g., the size and modification time
+        of the CSV file), which is stored in the header and is available as the attribute source after load;
+        if None, self.source is stored
+        :return: None
+        """
+        import json
+
+        self.source = self.source if source is None else source
+        names = "\n".join(self.alternatives).encode("utf-8")
+        header = {"criteria": self.criteria, "n": len(self), "dtypes": [column.dtype.str for column in self.columns],
+                  "source": self.source}
+        headerBytes = json.dumps(header).encode("utf-8")
+        # the offsets depend on the length of the header, which contains them; hence, the space for them is fixed
+        headerLength = len(headerBytes) + 64 + 24 * (len(self.columns) + 2)
+        start = len(self.magic) + 8 + headerLength
+        offsets = []
+        for column in self.columns:
+            start += -start % self.alignment
+            offsets.append(start)
+            start += column.nbytes
+        header["offsets"] = offsets
+        header["names"] = [start, len(names)]
+        headerBytes = json.dumps(header).encode("utf-8").ljust(headerLength)
+        temporary = "{}.{}.{}.tmp".format(binaryFile, getpid(), get_ident())
+        with open(temporary, "wb") as f:
+            f.write(self.magic)
+            f.write(headerLength.to_bytes(8, "little"))
+            f.write(headerBytes)
+            for offset, column in zip(offsets, self.columns):
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(column.tobytes())
+            f.write(names)
+        replace(temporary, binaryFile)
+
+    @classmethod
+    def load(cls, binaryFile):
+        """
+        Loads the table from a binary file, created by save. The columns are memory-mapped (read-only),
+        and the names of the alternatives are read only when needed.
+
+        :param binaryFile: path to the file
+        :return: PerformanceColumns
+        """
+        import json
+        import numpy as np
+
+        with open(binaryFile, "rb") as f:
+            if f.read(len(cls.magic)) != cls.magic:
+                raise Exception("{} is not a file with performance columns.".format(binaryFile))
+            headerLength = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(headerLength).decode("utf-8"))
+        columns = [np.memmap(binaryFile, dtype=np.dtype(dtype), mode="r", offset=offset, shape=(header["n"],))
+                   if header["n"] else np.zeros(0, dtype=np.dtype(dtype))
+                   for dtype, offset in zip(header["dtypes"], header["offsets"])]
+        table = cls(None, header["criteria"], columns)
+        table.source = header.get("source")
+        table.namesLocation = (binaryFile, header["names"][0], header["names"][1])
+        return table
+
+    def matrix(self):
+        """
+        Returns the table as a matrix of floats (rows: alternatives, columns: criteria).
+
+        :return: numpy array
+        """
+        import numpy as np
+
+        return np.column_stack([np.asarray(column, dtype=np.float64) for column in self.columns])
 
-    alter = []
-    perf = {}
-    with open("{}/{}".format(inputFolder, performanceTableCSV)) as f:
-        critNames = f.readline().strip().split(",")[1:]
-        for x in f:
-            line = x.strip().split(",")
-            alter.append(line[0])
-            perf[line[0]] = {critNames[i - 1]: line[i] for i in range(1, len(line))}
-    return alter, critNames, perf
 
 #############################################################################################
 # Creating necessary XML settings files for diviz                                           #
@@ -130,329 +851,2590 @@ def endTag():
     return "</xmcda:XMCDA>"
 
 
-def alternativesXML(alt):
-    """
-    Creates alternatives XML in inputFolder/myProjects/projectName folder.
+def writeXMCDA(fileName, lines, compact=False, bufferLines=10000):
+    """
+    Writes an XMCDA file: the header, the given lines and the end tag. The lines are joined in large chunks,
+    so that large files (e.g., big performance tables) are written quickly.
+
+    The chunks are hashed while they are written to a temporary file in the same folder, so that only one chunk
+    is held in memory at a time. If the hash equals the hash of the existing file (see existingFileHash, which
+    reads the file only if it was not written or hashed by this process before), the temporary file is removed,
+    so the existing file (and its modification time) is left untouched. Otherwise, the temporary file atomically
+    replaces the existing one.
+
+    :param fileName: path to the file
+    :param lines: iterable of (depth, text), where depth is the level of indentation of the text
+    (the header and the end tag have depth 0), e.g., the output of alternativesLines
+    :param compact: if True, the file is written without indentation and line breaks
+    :param bufferLines: number of lines that are joined into one chunk
+    :return: True if the file was (re)written, and False if its content did not change
+    """
+    import hashlib
+    spaceString = 4 * " "
+    indents = []
+    newHash = hashlib.sha256()
+    buffer = [header()]
+
+    def flush(f):
+        chunk = "".join(buffer)
+        newHash.update(chunk.encode())
+        f.write(chunk)
+        buffer.clear()
+
+    temporary = "{}.{}.{}.tmp".format(fileName, getpid(), get_ident())
+    try:
+        with open(temporary, "w") as f:
+            for depth, text in lines:
+                if compact:
+                    buffer.append(text)
+                else:
+                    while depth >= len(indents):
+                        indents.append("\n" + spaceString * len(indents))
+                    buffer.append(indents[depth])
+                    buffer.append(text)
+                if len(buffer) >= bufferLines:
+                    flush(f)
+            buffer.append(endTag() if compact else "\n" + endTag())
+            buffer.append("\n")
+            flush(f)
+        digest = newHash.hexdigest()
+        if existingFileHash(fileName) == digest:
+            remove(temporary)
+            return False
+        replace(temporary, fileName)
+    except BaseException:
+        if isfile(temporary):
+            remove(temporary)
+        raise
+    info = stat(fileName)
+    fileHashes[abspath(fileName)] = ((info.st_mtime_ns, info.st_size), digest)
+    return True
+
+
+fileHashes = {}  # {path: ((mtime, size), hash), ...} of the files, written or hashed by writeXMCDA
+
+
+def existingFileHash(fileName):
+    """
+    Returns the hash of an existing file (see fileHash). The file is read only if it has changed (or has not been
+    seen) since it was last written or hashed by writeXMCDA; otherwise, only its modification time and size are read.
+
+    :param fileName: path to the file
+    :return: sha256 hex digest of the content, or None if there is no such file
+    """
+    try:
+        info = stat(fileName)
+    except FileNotFoundError:
+        return None
+    stamp = (info.st_mtime_ns, info.st_size)
+    path = abspath(fileName)
+    known = fileHashes.get(path)
+    if known is not None and known[0] == stamp:
+        return known[1]
+    digest = fileHash(fileName)
+    fileHashes[path] = (stamp, digest)
+    return digest
+
+
+def fileHash(fileName, chunkSize=2**20):
+    """
+    Computes the hash of a text file in the same way as writeXMCDA computes the hash of the content it writes.
+
+    :param fileName: path to the file
+    :param chunkSize: number of characters that are read at once
+    :return: sha256 hex digest of the content
+    """
+    import hashlib
+    h = hashlib.sha256()
+    with open(fileName) as f:
+        chunk = f.read(chunkSize)
+        while chunk:
+            h.update(chunk.encode())
+            chunk = f.read(chunkSize)
+    return h.hexdigest()
+
+
+def alternativesLines(alt):
+    """
+    Generates the lines of alternatives XML (see writeXMCDA).
+
+    :param alt: List of the names of the alternatives.
+    :return: generator of (depth, text)
+    """
+    yield 1, "<alternatives>"
+    for i, a in enumerate(alt):
+        yield 2, '<alternative id="a{}" name="{}"/>'.format(i, a)
+    yield 1, "</alternatives>"
+
+
+def criteriaLines(criteria):
+    """
+    Generates the lines of criteria XML (see writeXMCDA).
+
+    :param criteria: List of the names of the criteria.
+    :return: generator of (depth, text)
+    """
+    yield 1, "<criteria>"
+    yield 2, "<description>"
+    yield 3, "<title>List of criteria</title>"
+    yield 2, "</description>"
+    for i, cr in enumerate(criteria):
+        yield 2, '<criterion id="cr{}" name="{}"/>'.format(i, cr)
+    yield 1, "</criteria>"
+
+
+def perfTableLines(alt, criteria, perf):
+    """
+    Generates the lines of performance table XML (see writeXMCDA).
+
+    :param alt: names of laternatives (list)
+    :param criteria: names of criteria (list)
+    :param perf: pefrormance table (dictionary: {alternative: {criterion: value, ...}, ...})
+    :return: generator of (depth, text)
+    """
+    yield 1, "<performanceTable>"
+    yield 2, "<description>"
+    yield 3, "<title>Performance table</title>"
+    yield 2, "</description>"
+    criterionIDs = ["<criterionID>cr{}</criterionID>".format(j) for j in range(len(criteria))]
+    for i in range(len(alt)):
+        yield 2, "<alternativePerformances>"
+        yield 3, "<alternativeID>a{}</alternativeID>".format(i)
+        values = perf[alt[i]]
+        for j in range(len(criteria)):
+            value = values[criteria[j]]
+            mtype = "real" if "." in value else "integer"  # change this if necessary
+            yield 3, "<performance>"
+            yield 4, criterionIDs[j]
+            yield 4, "<value>"
+            yield 5, "<{0}>{1}</{0}>".format(mtype, value)
+            yield 4, "</value>"
+            yield 3, "</performance>"
+        yield 2, "</alternativePerformances>"
+    yield 1, "</performanceTable>"
+
+
+def preferencesLines(prefList):
+    """
+    Generates the lines of preferences XML (see writeXMCDA).
+
+    :param prefList: [strong, weak, indif], as in preferencesXML
+    :return: generator of (depth, text)
+    """
+    prefTypes = ["strong", "weak", "indif"]
+    for i in range(len(prefTypes)):
+        if prefList[i]:
+            yield 1, "<alternativesComparisons>"
+            yield 2, "<comparisonType>{}</comparisonType>".format(prefTypes[i])
+            yield 2, "<pairs>"
+            for pair in prefList[i]:
+                yield 3, "<pair>"
+                yield 4, "<initial>"
+                yield 5, "<alternativeID>{}</alternativeID>".format(pair[0])
+                yield 4, "</initial>"
+                yield 4, "<terminal>"
+                yield 5, "<alternativeID>{}</alternativeID>".format(pair[1])
+                yield 4, "</terminal>"
+                yield 3, "</pair>"
+            yield 2, "</pairs>"
+            yield 1, "</alternativesComparisons>"
+
+
+def criteriaDirectLines(directions):
+    """
+    Generates the lines of criteria directions XML (see writeXMCDA).
+
+    :param directions: a 0/1 list of directions, as in criteriaDirectXML
+    :return: generator of (depth, text)
+    """
+    yield 1, '<criteriaValues mcdaConcept="preferenceDirection">'
+    for i in range(len(directions)):
+        yield 2, "<criterionValue>"
+        yield 3, "<criterionID>cr{}</criterionID>".format(i)
+        yield 3, "<value>"
+        yield 4, "<integer>{}</integer>".format(directions[i])
+        yield 3, "</value>"
+        yield 2, "</criterionValue>"
+    yield 1, "</criteriaValues>"
+
+
+def intensitiesOfPrefLines(pairsOfPairs):
+    """
+    Generates the lines of intensities of preferences XML (see writeXMCDA).
+
+    :param pairsOfPairs: [strict, weak, indif], as in intensitiesOfPrefXML
+    :return: generator of (depth, text)
+    """
+    prefTypes = ["strict", "weak", "indif"]  # not strong, but strict!
+    for i in range(3):
+        if pairsOfPairs[i]:
+            yield 1, "<alternativesComparisons>"
+            yield 2, "<comparisonType>{}</comparisonType>".format(prefTypes[i])
+            yield 2, "<pairs>"
+            for pp in pairsOfPairs[i]:
+                yield 3, "<pair>"
+                for j, side in enumerate(["initial", "terminal"]):
+                    yield 4, "<{}>".format(side)
+                    yield 5, "<alternativesSet>"
+                    for elt in pp[j]:
+                        yield 6, "<element>"
+                        yield 7, "<alternativeID>{}</alternativeID>".format(elt)
+                        yield 6, "</element>"
+                    yield 5, "</alternativesSet>"
+                    yield 4, "</{}>".format(side)
+                yield 3, "</pair>"
+            yield 2, "</pairs>"
+            yield 1, "</alternativesComparisons>"
+
+
+def alternativesXML(alt, compact=False):
+    """
+    Calls RorutaProject.alternativesXML on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().alternativesXML(alt, compact=compact)
+
+
+def criteriaXML(criteria, compact=False):
+    """
+    Calls RorutaProject.criteriaXML on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().criteriaXML(criteria, compact=compact)
+
+
+def perfTableXML(alt, criteria, perf, compact=False):
+    """
+    Calls RorutaProject.perfTableXML on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().perfTableXML(alt, criteria, perf, compact=compact)
+
+
+def preferencesXML(prefList, compact=False):
+    """
+    Calls RorutaProject.preferencesXML on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().preferencesXML(prefList, compact=compact)
+
+
+def criteriaDirectXML(directions, compact=False):
+    """
+    Calls RorutaProject.criteriaDirectXML on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().criteriaDirectXML(directions, compact=compact)
+
+
+def intensitiesOfPrefXML(pairsOfPairs, compact=False):
+    """
+    Calls RorutaProject.intensitiesOfPrefXML on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().intensitiesOfPrefXML(pairsOfPairs, compact=compact)
+
+
+def writeSettingsFiles(alt, criteria, perf, prefList, directions, pairsOfPairs, compact=False):
+    """
+    Calls RorutaProject.writeSettingsFiles on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().writeSettingsFiles(alt, criteria, perf, prefList, directions, pairsOfPairs,
+                                              compact=compact)
+
+
+#############################################################################################
+# User defined relations                                                                    #
+#############################################################################################
+
+
+def defineStrongRelations(fileRels):
+    """
+    Reads a file with user defined strong relations.
+
+    :param fileRels: pathToMyRels/myRels, where myRels is a file with user defined strict relations, for example
+    a2 > a4
+    a0 > a2
+    a42 > a12
+    (if user defined 3 relations). The id numbers should be >= 0. The alternatives should be indexed with respect to
+    their order in the list myAlternatives.
+    :return: List of pairs [[2, 3], [0, 2], [42, 12]] (if we follow the same example).
+    """
+
+    def pomo(x):
+        return "a{}".format(x)
+    prefList = []
+    with open(fileRels, "r") as f:
+        for x in f:
+            line = x.strip()
+            if line:
+                a = search("a([0-9]+) > a([0-9]+)", line)
+                prefList.append([a.group(1), a.group(2)])
+    prefList = [[pomo(x), pomo(y)] for [x, y] in prefList]
+    return prefList
+
+
+def pairFromRank(rank, n):
+    """
+    Returns the pair of positions with the given rank in the lexicographic order
+    (0, 1), (0, 2), ..., (0, n - 1), (1, 2), ..., (n - 2, n - 1).
+
+    :param rank: 0 <= rank < n (n - 1) / 2
+    :param n: number of alternatives
+    :return: (i, j), where 0 <= i < j < n
+    """
+    b = 2 * n - 1  # there are i (b - i) / 2 pairs before the first pair (i, .)
+    i = max(0, (b - isqrt(b * b - 8 * rank)) // 2)
+    while i > 0 and i * (b - i) // 2 > rank:
+        i -= 1
+    while (i + 1) * (b - i - 1) // 2 <= rank:
+        i += 1
+    return i, rank - i * (b - i) // 2 + i + 1
+
+
+def checkSubsampleSize(n, size):
+    """
+    Raises an Exception if there are less than size different pairs of n alternatives.
+    """
+    if not 0 <= size <= n * (n - 1) // 2:
+        raise Exception("size = {} breaks the assumption 0 <= size <= #different pairs.".format(size))
+
+
+def randomSubsample(linearOrder, size, randomSeed=12345):
+    """
+    Samples uniformly at random (without replacement) size of the n (n - 1) / 2 pairs of alternatives, by sampling
+    the ranks of the pairs (see pairFromRank).
+
+    :param linearOrder: [indexOfTheBestAlternative, indexOfSecondBestAlternative, ...]
+    :param size: the size of the sample
+    :param randomSeed: randomSeed used
+    :return: list of pairs [a<better>, a<worse>], as returned by defineStrongRelations
+    """
+    n = len(linearOrder)
+    checkSubsampleSize(n, size)
+    generator = Random(randomSeed)  # own generator, so that concurrent samplings do not interfere
+    names = ["a{}".format(x) for x in linearOrder]
+    pairs = []
+    for rank in generator.sample(range(n * (n - 1) // 2), size):
+        i, j = pairFromRank(rank, n)
+        pairs.append([names[i], names[j]])
+    return pairs
+
+
+def randomSubsamples(linearOrder, size, count, randomSeed=12345):
+    """
+    :param linearOrder: as in randomSubsample
+    :param size: the size of each sample
+    :param count: the number of samples
+    :param randomSeed: the seed of the first sample
+    :return: list of count samples, where the k-th one is randomSubsample(linearOrder, size, randomSeed + k)
+    """
+    return [randomSubsample(linearOrder, size, randomSeed + k) for k in range(count)]
+
+
+def streamRandomSubsample(linearOrder, size, randomSeed=12345):
+    """
+    Samples uniformly at random (without replacement) size of the n (n - 1) / 2 pairs of alternatives, like
+    randomSubsample, but generates the pairs one by one, in the order of their ranks, so the memory use does not
+    depend on size. For each position i, the number of the sampled pairs (i, .) is drawn from the hypergeometric
+    distribution, and then these pairs are chosen. Needs numpy (which limits n (n - 1) / 2 to below 10^9).
+
+    :param linearOrder: as in randomSubsample
+    :param size: the size of the sample
+    :param randomSeed: randomSeed used
+    :return: generator of pairs [a<better>, a<worse>]
+    """
+    import numpy as np
+
+    n = len(linearOrder)
+    checkSubsampleSize(n, size)
+    generator = np.random.default_rng(randomSeed)
+    names = ["a{}".format(x) for x in linearOrder]
+    remainingPairs = n * (n - 1) // 2
+    for i in range(n - 1):
+        if size == 0:
+            return
+        rowPairs = n - 1 - i
+        chosen = generator.hypergeometric(rowPairs, remainingPairs - rowPairs, size) if rowPairs < remainingPairs \
+            else size
+        remainingPairs -= rowPairs
+        size -= chosen
+        better = names[i]
+        for j in np.sort(generator.choice(rowPairs, chosen, replace=False)).tolist():
+            yield [better, names[i + 1 + j]]
+
+
+def writePreferences(fileName, pairs, bufferLines=10000):
+    """
+    Writes strong relations to a .pref file (see defineStrongRelations).
+
+    :param fileName: path to the file
+    :param pairs: iterable of pairs [a<better>, a<worse>]
+    :param bufferLines: number of lines that are joined before they are written to the file
+    :return: None
+    """
+    with open(fileName, "w") as f:
+        buffer = []
+        for better, worse in pairs:
+            buffer.append("{} > {}\n".format(better, worse))
+            if len(buffer) >= bufferLines:
+                f.write("".join(buffer))
+                buffer.clear()
+        f.write("".join(buffer))
+
+
+def createRandomSubsampleOfAllRelations(linearOrder, size, file, randomSeed=12345, stream=False):
+    """
+    Calls RorutaProject.createRandomSubsampleOfAllRelations on the project, defined by the module globals
+    (see globalProject).
+    """
+    globalProject().createRandomSubsampleOfAllRelations(linearOrder, size, file, randomSeed=randomSeed, stream=stream)
+
+
+def createRandomSubsamples(linearOrder, size, count, file=None, randomSeed=12345):
+    """
+    Calls RorutaProject.createRandomSubsamples on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().createRandomSubsamples(linearOrder, size, count, file=file, randomSeed=randomSeed)
+
+
+def createLinearRelations(linearOrder, file):
+    """
+    Calls RorutaProject.createLinearRelations on the project, defined by the module globals (see globalProject).
+    """
+    globalProject().createLinearRelations(linearOrder, file)
+
+
+#############################################################################################
+# Relations as bit matrices                                                                 #
+#############################################################################################
+
+
+def alternativeIndex(altId):
+    """
+    Returns the id of an alternative.
+
+    :param altId: abbreviation of an alternative, e.g., 'a12'
+    :return: id of the alternative, e.g., 12
+    """
+    return int(altId[1:])
+
+
+def pairIndices(pair):
+    """
+    Returns the indices of the alternatives in a pair.
+
+    :param pair: [alt1, alt2] or (alt1, alt2), where alt1 and alt2 are either abbreviations a<id> or indices
+    :return: (index1, index2)
+    """
+    i, j = pair
+    return (i if isinstance(i, int) else alternativeIndex(i)), (j if isinstance(j, int) else alternativeIndex(j))
+
+
+class Relation:
+    """
+    A binary relation on the alternatives a0, ..., a<n-1>, stored as a bit matrix: the j-th bit of rows[i] is 1
+    if a<i> R a<j>. The membership test ['a<i>', 'a<j>'] in relation takes O(1) time, and the set operations
+    (|, &, -, ^) and the transitive closure work on whole rows at once.
+    """
+
+    def __init__(self, n, rows=None):
+        """
+        :param n: number of alternatives
+        :param rows: list of n integers (bit masks of the rows); if None, the relation is empty
+        """
+        self.n = n
+        self.rows = [0] * n if rows is None else list(rows)
+
+    @classmethod
+    def fromPairs(cls, pairs, n=None):
+        """
+        Creates the relation from a list of pairs, as returned by readRelations (or defined by the user).
+
+        :param pairs: [[alt1, alt2], ...], where alt1 and alt2 are abbreviations a<id> (or indices)
+        :param n: number of alternatives; if None, the largest index + 1 is used
+        :return: Relation
+        """
+        indices = [pairIndices(pair) for pair in pairs]
+        if n is None:
+            n = 1 + max([max(i, j) for i, j in indices], default=-1)
+        relation = cls(n)
+        for i, j in indices:
+            relation.rows[i] |= 1 << j
+        return relation
+
+    @classmethod
+    def fromMatrix(cls, matrix):
+        """
+        Creates the relation from an n x n matrix of bools, e.g., an output of computeRelations.
+
+        :param matrix: n x n list of bools
+        :return: Relation
+        """
+        return cls(len(matrix), [sum(1 << j for j, x in enumerate(row) if x) for row in matrix])
+
+    def toPairs(self):
+        """
+        Converts the relation to the list of pairs, as returned by readRelations(relations, False).
+
+        :return: [[a<i>, a<j>], ...]
+        """
+        return [["a{}".format(i), "a{}".format(j)] for i, j in self]
+
+    def toMatrix(self):
+        """
+        Converts the relation to an n x n matrix of bools.
+
+        :return: n x n list of bools
+        """
+        return [[bool(row >> j & 1) for j in range(self.n)] for row in self.rows]
+
+    def toArray(self, n=None):
+        """
+        Converts the relation to an n x n numpy array of bools (quickly, also for large n). Needs numpy.
+
+        :param n: the size of the array (at least the number of alternatives); if None, the number of alternatives
+        :return: n x n numpy array of bools
+        """
+        import numpy as np
+
+        n = self.n if n is None else n
+        nBytes = (n + 7) // 8
+        packed = np.frombuffer(b"".join(row.to_bytes(nBytes, "little") for row in self.rows), dtype=np.uint8)
+        array = np.zeros((n, n), dtype=bool)
+        if self.n:
+            bits = np.unpackbits(packed.reshape(self.n, nBytes), axis=1, bitorder="little")
+            array[:self.n] = bits[:, :n].astype(bool)
+        return array
+
+    def resize(self, n):
+        """
+        Changes the number of alternatives to n (at least the current number of alternatives).
+
+        :param n: the new number of alternatives
+        :return: None
+        """
+        if n > self.n:
+            self.rows.extend([0] * (n - self.n))
+            self.n = n
+
+    def add(self, pair):
+        """
+        Adds the pair to the relation.
+
+        :param pair: [alt1, alt2], as in pairIndices
+        :return: None
+        """
+        i, j = pairIndices(pair)
+        self.rows[i] |= 1 << j
+
+    def discard(self, pair):
+        """
+        Removes the pair from the relation (if it is there).
+
+        :param pair: [alt1, alt2], as in pairIndices
+        :return: None
+        """
+        i, j = pairIndices(pair)
+        self.rows[i] &= ~(1 << j)
+
+    def __contains__(self, pair):
+        i, j = pairIndices(pair)
+        return 0 <= i < self.n and self.rows[i] >> j & 1 == 1
+
+    def __iter__(self):
+        for i, row in enumerate(self.rows):
+            j = 0
+            while row:
+                if row & 1:
+                    yield i, j
+                row >>= 1
+                j += 1
+
+    def __len__(self):
+        return sum(bin(row).count("1") for row in self.rows)
+
+    def __eq__(self, other):
+        return isinstance(other, Relation) and self.n == other.n and self.rows == other.rows
+
+    def __repr__(self):
+        return "Relation({}, {})".format(self.n, self.toPairs())
+
+    def combine(self, other, operation):
+        """
+        Combines two relations row by row.
+
+        :param other: Relation on the same alternatives
+        :param operation: function of two bit masks
+        :return: Relation
+        """
+        if self.n != other.n:
+            raise Exception("The relations are defined on different numbers of alternatives: {} and {}.".format(
+                self.n, other.n))
+        return Relation(self.n, [operation(x, y) for x, y in zip(self.rows, other.rows)])
+
+    def __or__(self, other):
+        return self.combine(other, lambda x, y: x | y)
+
+    def __and__(self, other):
+        return self.combine(other, lambda x, y: x & y)
+
+    def __sub__(self, other):
+        return self.combine(other, lambda x, y: x & ~y)
+
+    def __xor__(self, other):
+        return self.combine(other, lambda x, y: x ^ y)
+
+    def transpose(self):
+        """
+        Returns the inverse relation: a<j> R' a<i> if and only if a<i> R a<j>.
+
+        :return: Relation
+        """
+        rows = [0] * self.n
+        for i, j in self:
+            rows[j] |= 1 << i
+        return Relation(self.n, rows)
+
+    def transitiveClosure(self):
+        """
+        Returns the transitive closure of the relation (Warshall's algorithm on the rows).
+
+        :return: Relation
+        """
+        rows = list(self.rows)
+        for k in range(self.n):
+            bit = 1 << k
+            rowK = rows[k]
+            for i in range(self.n):
+                if rows[i] & bit:
+                    rows[i] |= rowK
+        return Relation(self.n, rows)
+
+
+#############################################################################################
+# Necessary and possible relations (in-process ROR-UTA)                                     #
+#############################################################################################
+
+
+representativeMinimalStep = 0.01  # the minimal difference of consecutive values of strict marginal value functions
+
+
+class RorutaModel:
+    """
+    The linear program of ROR-UTA for a general additive value function U = sum_i u_i, the same as the one used
+    by the diviz widget RORUTA-NecessaryAndPossiblePreferenceRelations.
+
+    The variables are the values of the marginal value functions u_i in the characteristic points (all different values
+    of the i-th criterion in the performance table) and epsilon (the last variable). The constraints are
+
+    - u_i(the worst value of the i-th criterion) = 0 and sum_i u_i(the best value of the i-th criterion) = 1,
+    - u_i is monotone; if strict, the difference of two consecutive values is at least epsilon,
+    - user defined preferences and intensities of preferences, where the strong (strict) ones
+      must hold with the difference at least epsilon.
+
+    The relations are checked by maximizing epsilon subject to the constraints above and one additional constraint.
+    The model needs scipy, which is imported only when the model is solved.
+    """
+
+    def __init__(self, alt, criteria, perf, directions, prefList=None, pairsOfPairs=None, strict=True,
+                 tolerance=1e-7):
+        """
+        :param alt: names of alternatives (list); the alternative alt[i] is a<i>
+        :param criteria: names of criteria (list)
+        :param perf: performance table (dictionary: {alternative: {criterion: value, ...}, ...}), as returned by
+        readPerformanceCSV
+        :param directions: a 0/1 list of directions, as in criteriaDirectXML
+        :param prefList: [strong, weak, indif], as in preferencesXML (None means no preferences)
+        :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML (None means no intensities)
+        :param strict: if True, the marginal value functions are strictly monotone
+        :param tolerance: epsilon <= tolerance is treated as epsilon = 0
+        """
+        self.n = len(alt)
+        self.strict = strict
+        self.tolerance = tolerance
+        self.characteristicPoints = []  # for each criterion: values, sorted from the worst to the best
+        self.altVariables = [[] for _ in range(self.n)]  # for each alternative: its variable for each criterion
+        nVariables = 0
+        for j, cr in enumerate(criteria):
+            values = sorted({float(perf[a][cr]) for a in alt}, reverse=bool(directions[j]))
+            variables = {x: nVariables + k for k, x in enumerate(values)}
+            for i, a in enumerate(alt):
+                self.altVariables[i].append(variables[float(perf[a][cr])])
+            self.characteristicPoints.append(values)
+            nVariables += len(values)
+        self.epsilon = nVariables
+        self.nVariables = nVariables + 1
+        self.ubRows = []  # rows {variable: coefficient, ...} of constraints row * x <= 0
+        self.eqRows = []  # rows of constraints row * x == rhs
+        self.eqRhs = []
+        self.matrixCache = None
+
+        first = 0
+        best = {}
+        for values in self.characteristicPoints:
+            self.eqRows.append({first: 1.0})
+            self.eqRhs.append(0.0)
+            for k in range(first + 1, first + len(values)):
+                row = {k - 1: 1.0, k: -1.0}
+                if strict:
+                    row[self.epsilon] = 1.0
+                self.ubRows.append(row)
+            first += len(values)
+            best[first - 1] = 1.0
+        self.eqRows.append(best)
+        self.eqRhs.append(1.0)
+
+        self.prefList = [[], [], []]
+        self.addStatements(prefList, pairsOfPairs)
+
+    def addStatements(self, prefList=None, pairsOfPairs=None):
+        """
+        Adds the user defined preferences and intensities of preferences to the model.
+
+        :param prefList: [strong, weak, indif], as in preferencesXML (None means no preferences)
+        :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML (None means no intensities)
+        :return: None
+        """
+        prefList = prefList if prefList is not None else [[], [], []]
+        for kind in range(3):
+            for a, b in prefList[kind]:
+                self.prefList[kind].append([a, b])
+                self.addStatement(kind, self.difference([alternativeIndex(a)], [alternativeIndex(b)]))
+        pairsOfPairs = pairsOfPairs if pairsOfPairs is not None else [[], [], []]
+        for kind in range(3):
+            for (a, b), (c, d) in pairsOfPairs[kind]:
+                # U(a) - U(b) R U(c) - U(d)  <=>  U(a) + U(d) - U(b) - U(c) R 0
+                plus = [alternativeIndex(a), alternativeIndex(d)]
+                minus = [alternativeIndex(b), alternativeIndex(c)]
+                self.addStatement(kind, self.difference(plus, minus))
+
+    def size(self):
+        """
+        :return: {'rows': number of constraints, 'nonzeros': number of nonzero coefficients}
+        """
+        rows = self.ubRows + self.eqRows
+        return {"rows": len(rows), "nonzeros": sum(len(row) for row in rows)}
+
+    def difference(self, plus, minus):
+        """
+        Returns the row of the linear function sum_{a in plus} U(a) - sum_{b in minus} U(b).
+
+        :param plus: list of indices of alternatives
+        :param minus: list of indices of alternatives
+        :return: {variable: coefficient, ...}
+        """
+        row = {}
+        for alternatives, sign in [(plus, 1.0), (minus, -1.0)]:
+            for i in alternatives:
+                for v in self.altVariables[i]:
+                    row[v] = row.get(v, 0.0) + sign
+        return {v: c for v, c in row.items() if c != 0.0}
+
+    def addStatement(self, kind, row):
+        """
+        Adds the constraint row * x > 0 (kind = 0, i.e., row * x >= epsilon), row * x >= 0 (kind = 1)
+        or row * x = 0 (kind = 2).
+
+        :param kind: 0, 1 or 2 (strong, weak or indif)
+        :param row: {variable: coefficient, ...}, e.g., the output of difference
+        :return: None
+        """
+        if kind == 2:
+            self.eqRows.append(row)
+            self.eqRhs.append(0.0)
+        else:
+            negated = {v: -c for v, c in row.items()}
+            if kind == 0:
+                negated[self.epsilon] = negated.get(self.epsilon, 0.0) + 1.0
+            self.ubRows.append(negated)
+        self.matrixCache = None
+
+    def matrices(self):
+        """
+        Returns the (cached) sparse matrices of the constraints.
+
+        :return: A_ub, A_eq, b_eq (for the constraints A_ub x <= 0, A_eq x = b_eq)
+        """
+        from scipy.sparse import csr_matrix
+
+        if self.matrixCache is None:
+            matrices = []
+            for rows in [self.ubRows, self.eqRows]:
+                data, rowIndices, colIndices = [], [], []
+                for r, row in enumerate(rows):
+                    for v, c in row.items():
+                        data.append(c)
+                        rowIndices.append(r)
+                        colIndices.append(v)
+                matrices.append(csr_matrix((data, (rowIndices, colIndices)), shape=(len(rows), self.nVariables)))
+            self.matrixCache = (matrices[0], matrices[1], list(self.eqRhs))
+        return self.matrixCache
+
+    def maximizeEpsilon(self, extraRow=None):
+        """
+        Maximizes epsilon subject to the constraints of the model and the additional constraint extraRow * x <= 0.
+
+        :param extraRow: {variable: coefficient, ...} or None
+        :return: the maximal epsilon, or None if the program is infeasible
+        """
+        from scipy.optimize import linprog
+        from scipy.sparse import csr_matrix, vstack
+
+        aUb, aEq, bEq = self.matrices()
+        if extraRow:
+            row = csr_matrix((list(extraRow.values()), ([0] * len(extraRow), list(extraRow))),
+                             shape=(1, self.nVariables))
+            aUb = vstack([aUb, row], format="csr")
+        objective = [0.0] * self.nVariables
+        objective[self.epsilon] = -1.0
+        bounds = [(0, None)] * self.epsilon + [(None, 1)]
+        result = linprog(objective, A_ub=aUb, b_ub=[0.0] * aUb.shape[0], A_eq=aEq, b_eq=bEq, bounds=bounds,
+                         method="highs")
+        if result.status == 2:
+            return None
+        if result.status != 0:
+            raise Exception("The linear program could not be solved: {}".format(result.message))
+        return -result.fun
+
+    def isConsistent(self):
+        """
+        Checks whether there is a (strictly, if strict) monotone value function, compatible with the preferences.
+
+        :return: bool
+        """
+        eps = self.maximizeEpsilon()
+        return eps is not None and eps > self.tolerance
+
+    def necessary(self, i, j):
+        """
+        Checks whether a<i> is necessarily weakly preferred to a<j>, i.e., U(a<i>) >= U(a<j>) for all compatible U.
+
+        :param i: index of alternative
+        :param j: index of alternative
+        :return: bool
+        """
+        if i == j:
+            return True
+        row = self.difference([i], [j])
+        row[self.epsilon] = 1.0  # U(a<j>) >= U(a<i>) + epsilon
+        eps = self.maximizeEpsilon(row)
+        return eps is None or eps <= self.tolerance
+
+    def possible(self, i, j):
+        """
+        Checks whether a<i> is possibly weakly preferred to a<j>, i.e., U(a<i>) >= U(a<j>) for some compatible U.
+
+        :param i: index of alternative
+        :param j: index of alternative
+        :return: bool
+        """
+        if i == j:
+            return True
+        eps = self.maximizeEpsilon(self.difference([j], [i]))  # U(a<i>) >= U(a<j>)
+        return eps is not None and eps > self.tolerance
+
+
+workerModel = None  # the model of a worker process of solvePairs
+
+
+def initRelationWorker(model):
+    """
+    Initializes a worker process of solvePairs: the model is sent to each worker only once (and not for each pair).
+
+    :param model: RorutaModel
+    :return: None
+    """
+    global workerModel
+    workerModel = model
+
+
+def solveRelationTasks(tasks, model=None):
+    """
+    Solves the linear programs for the given pairs of alternatives.
+
+    :param tasks: list of (necessaryRel, i, j), where necessaryRel is bool and i and j are indices of alternatives
+    :param model: RorutaModel; if None, the model of the worker process is used
+    :return: list of (result, time), where result is model.necessary(i, j) (or model.possible(i, j)) and time
+    the time (in seconds) of the computation
+    """
+    model = workerModel if model is None else model
+    results = []
+    for necessaryRel, i, j in tasks:
+        t0 = perf_counter()
+        result = model.necessary(i, j) if necessaryRel else model.possible(i, j)
+        results.append((result, perf_counter() - t0))
+    return results
+
+
+def relationPool(model, workers):
+    """
+    Starts a pool of worker processes for solvePairs. The model is built only once and sent to each worker when
+    the worker starts, so the pool should be reused for all the pairs of the model.
+
+    :param model: RorutaModel
+    :param workers: number of worker processes
+    :return: ProcessPoolExecutor
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    model.matrices()  # the workers get the model with the matrices already built
+    return ProcessPoolExecutor(max_workers=workers, initializer=initRelationWorker, initargs=(model,))
+
+
+def solvePairs(model, tasks, workers=1, pool=None):
+    """
+    Solves the linear programs for the given pairs of alternatives, in the current process (workers = 1) or in a pool
+    of worker processes (see relationPool).
+
+    :param model: RorutaModel
+    :param tasks: list of (necessaryRel, i, j), as in solveRelationTasks
+    :param workers: number of worker processes; if None, the number of processors is used
+    :param pool: the output of relationPool for the model, or None (then a pool is started and shut down,
+    if workers > 1)
+    :return: the output of solveRelationTasks (in the order of tasks)
+    """
+    workers = cpu_count() if workers is None else workers
+    if workers <= 1 or len(tasks) <= 1:
+        return solveRelationTasks(tasks, model)
+    chunkSize = max(1, len(tasks) // (4 * workers))
+    chunks = [tasks[k:k + chunkSize] for k in range(0, len(tasks), chunkSize)]
+    results = []
+    if pool is None:
+        with relationPool(model, workers) as pool:
+            for chunkResults in pool.map(solveRelationTasks, chunks):
+                results.extend(chunkResults)
+    else:
+        for chunkResults in pool.map(solveRelationTasks, chunks):
+            results.extend(chunkResults)
+    return results
+
+
+def solveTimeStatistics(times):
+    """
+    Computes simple statistics of the solve times.
+
+    :param times: list of times (in seconds)
+    :return: {'pairs': number of times, 'total': ..., 'mean': ..., 'min': ..., 'median': ..., 'max': ...}
+    """
+    times = sorted(times)
+    m = len(times)
+    if m == 0:
+        return {"pairs": 0, "total": 0.0, "mean": 0.0, "min": 0.0, "median": 0.0, "max": 0.0}
+    median = times[m // 2] if m % 2 else (times[m // 2 - 1] + times[m // 2]) / 2
+    return {"pairs": m, "total": sum(times), "mean": sum(times) / m, "min": times[0], "median": median,
+            "max": times[-1]}
+
+
+class PairScheduler:
+    """
+    Keeps the known values of the necessary and possible relations (None means unknown) and infers the values of
+    as many other pairs as possible, so that only the remaining pairs need to be solved. Since >= (necessary) and
+    >= (possible) are defined by U(a) >= U(b) for all (some) compatible value functions U, we use
+
+    - a >=N b and b >=N c imply a >=N c; a >=N b implies a >=P b,
+    - a >=N b and b >=P c (or a >=P b and b >=N c) imply a >=P c,
+    - not a >=N b implies b >=P a, and not a >=P b implies b >=N a,
+    - the contrapositives of these implications (e.g., a >=N c and not a >=N b imply not c >=N b).
+    """
+
+    def __init__(self, n):
+        """
+        :param n: number of alternatives
+        """
+        self.n = n
+        self.necessary = [[None] * n for _ in range(n)]
+        self.possible = [[None] * n for _ in range(n)]
+        self.stack = []
+        self.taskPosition = 0
+        self.tasks = [(necessaryRel, i, j) for necessaryRel in [True, False] for i in range(n) for j in range(n)
+                      if i != j]
+
+    def useModel(self, model):
+        """
+        Sets the values that follow directly from the model: reflexivity, user defined preferences and (Pareto)
+        dominance.
+
+        :param model: RorutaModel
+        :return: None
+        """
+        for i in range(self.n):
+            self.setNecessary(i, i, True)
+        strong, weak, indif = model.prefList
+        for a, b in strong:
+            self.setPossible(alternativeIndex(b), alternativeIndex(a), False)
+        for a, b in weak + indif:
+            self.setNecessary(alternativeIndex(a), alternativeIndex(b), True)
+        for a, b in indif:
+            self.setNecessary(alternativeIndex(b), alternativeIndex(a), True)
+        # the variables of a criterion are ordered from the worst to the best value
+        for i in range(self.n):
+            for j in range(self.n):
+                differences = [vi - vj for vi, vj in zip(model.altVariables[i], model.altVariables[j])]
+                if i != j and min(differences) >= 0:
+                    if model.strict and max(differences) > 0:
+                        self.setPossible(j, i, False)
+                    else:
+                        self.setNecessary(i, j, True)
+
+    def setNecessary(self, i, j, value):
+        """
+        Sets the value of a<i> >=N a<j> and infers the consequences.
+
+        :param i: index of alternative
+        :param j: index of alternative
+        :param value: bool
+        :return: None
+        """
+        self.stack.append((True, i, j, value))
+        self.propagate()
+
+    def setPossible(self, i, j, value):
+        """
+        Sets the value of a<i> >=P a<j> and infers the consequences.
+
+        :param i: index of alternative
+        :param j: index of alternative
+        :param value: bool
+        :return: None
+        """
+        self.stack.append((False, i, j, value))
+        self.propagate()
+
+    def propagate(self):
+        """
+        Infers the consequences of the values on the stack.
+
+        :return: None
+        """
+        nec = self.necessary
+        pos = self.possible
+        push = self.stack.append
+        while self.stack:
+            necessaryRel, i, j, value = self.stack.pop()
+            matrix = nec if necessaryRel else pos
+            if matrix[i][j] is not None:
+                continue
+            matrix[i][j] = value
+            if necessaryRel and value:
+                push((False, i, j, True))
+                for c in range(self.n):
+                    if nec[c][i]:
+                        push((True, c, j, True))
+                    if nec[j][c]:
+                        push((True, i, c, True))
+                    if nec[i][c] is False:
+                        push((True, j, c, False))
+                    if nec[c][j] is False:
+                        push((True, c, i, False))
+                    if pos[j][c]:
+                        push((False, i, c, True))
+                    if pos[c][i]:
+                        push((False, c, j, True))
+                    if pos[c][j] is False:
+                        push((False, c, i, False))
+                    if pos[i][c] is False:
+                        push((False, j, c, False))
+            elif necessaryRel:
+                push((False, j, i, True))
+                for c in range(self.n):
+                    if nec[i][c]:
+                        push((True, c, j, False))
+                    if nec[c][j]:
+                        push((True, i, c, False))
+            elif value:
+                for c in range(self.n):
+                    if nec[c][i]:
+                        push((False, c, j, True))
+                    if nec[j][c]:
+                        push((False, i, c, True))
+            else:
+                push((True, j, i, True))
+                push((True, i, j, False))
+                for c in range(self.n):
+                    if nec[i][c]:
+                        push((False, c, j, False))
+                    if nec[c][j]:
+                        push((False, i, c, False))
+
+    def nextTasks(self, count):
+        """
+        Returns at most count pairs, whose values are still unknown.
+
+        :param count: the maximal number of pairs
+        :return: list of (necessaryRel, i, j), as in solveRelationTasks
+        """
+        chosen = []
+        while self.taskPosition < len(self.tasks) and len(chosen) < count:
+            necessaryRel, i, j = self.tasks[self.taskPosition]
+            if (self.necessary if necessaryRel else self.possible)[i][j] is None:
+                chosen.append((necessaryRel, i, j))
+            self.taskPosition += 1
+        return chosen
+
+
+class StatementMatrix:
+    """
+    A compact representation of the user defined preferences and intensities of preferences: each statement is a
+    sparse row of integer coefficients over the indices of the alternatives, e.g.,
+    U(a1) - U(a2) > U(a3) - U(a4) is the row {1: 1, 2: -1, 3: -1, 4: 1} of kind 0, and a5 >= a6 is the row {5: 1, 6: -1}
+    of kind 1 (the kinds 0, 1 and 2 mean row * U > 0, row * U >= 0 and row * U = 0). The coefficients of a row are
+    divided by their greatest common divisor, so the same statement, given in different ways, has the same row.
+    The method reduced removes duplicates and redundant statements.
+    """
+
+    def __init__(self, n):
+        """
+        :param n: number of alternatives
+        """
+        self.n = n
+        self.rows = []  # [{alternative index: coefficient, ...}, ...]
+        self.kinds = []  # [0, 1 or 2, ...]
+
+    @classmethod
+    def fromLists(cls, n, prefList=None, pairsOfPairs=None):
+        """
+        :param n: number of alternatives
+        :param prefList: [strong, weak, indif], as in preferencesXML
+        :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+        :return: StatementMatrix with the preferences and then the intensities
+        """
+        statements = cls(n)
+        prefList = prefList if prefList is not None else [[], [], []]
+        pairsOfPairs = pairsOfPairs if pairsOfPairs is not None else [[], [], []]
+        for kind in range(3):
+            for a, b in prefList[kind]:
+                statements.add(kind, [alternativeIndex(a)], [alternativeIndex(b)])
+        for kind in range(3):
+            for (a, b), (c, d) in pairsOfPairs[kind]:
+                # U(a) - U(b) R U(c) - U(d)  <=>  U(a) + U(d) - U(b) - U(c) R 0
+                statements.add(kind, [alternativeIndex(a), alternativeIndex(d)],
+                               [alternativeIndex(b), alternativeIndex(c)])
+        return statements
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, kind, plus, minus):
+        """
+        Adds the statement sum_{a in plus} U(a) - sum_{b in minus} U(b) R 0, where R is given by kind.
+
+        :param kind: 0, 1 or 2 (strong, weak or indif)
+        :param plus: list of indices of alternatives
+        :param minus: list of indices of alternatives
+        :return: None
+        """
+        row = {}
+        for alternatives, sign in [(plus, 1), (minus, -1)]:
+            for i in alternatives:
+                row[i] = row.get(i, 0) + sign
+        row = {i: c for i, c in row.items() if c != 0}
+        divisor = 0
+        for c in row.values():
+            divisor = gcd(divisor, c)
+        self.rows.append({i: c // divisor for i, c in sorted(row.items())})
+        self.kinds.append(kind)
+
+    def matrix(self):
+        """
+        :return: len(self) x n scipy.sparse.csr_matrix of the coefficients (the kinds are in self.kinds)
+        """
+        from scipy.sparse import csr_matrix
+
+        data, indices, indptr = [], [], [0]
+        for row in self.rows:
+            indices.extend(row)
+            data.extend(row.values())
+            indptr.append(len(indices))
+        return csr_matrix((data, indices, indptr), shape=(len(self.rows), self.n))
+
+    def reduced(self, model=None):
+        """
+        Removes the statements that follow from the other ones:
+
+        - trivial statements (0 >= 0, 0 = 0) and duplicates,
+        - weak statements r >= 0 if r > 0 or r = 0 (or -r = 0) is also given,
+        - the pairs r >= 0 and -r >= 0 are merged to r = 0,
+        - if a model is given, the statements r >= 0 (and r > 0, if the model is strict) that follow from the
+          dominance of the alternatives, e.g., a >= b if a is at least as good as b on all criteria.
+
+        The removed statements do not change the set of compatible value functions, so the relations are the same.
+
+        :param model: RorutaModel or None; only its altVariables and strict are used
+        :return: (reduced StatementMatrix, {'statements': ..., 'trivial': ..., 'duplicates': ..., 'implied': ...,
+        'merged': ..., 'dominated': ..., 'remaining': ...})
+        """
+        report = {"statements": len(self.rows), "trivial": 0, "duplicates": 0, "implied": 0, "merged": 0,
+                  "dominated": 0}
+        keep = {}  # {(kind, row as a tuple): row}, in the order of the first occurrence
+        for row, kind in zip(self.rows, self.kinds):
+            if not row and kind != 0:
+                report["trivial"] += 1
+                continue
+            if kind == 2 and row and next(iter(row.values())) < 0:
+                row = {i: -c for i, c in row.items()}  # r = 0 and -r = 0 are the same statement
+            key = (kind, tuple(row.items()))
+            if key in keep:
+                report["duplicates"] += 1
+            else:
+                keep[key] = row
+
+        def canonical(items):
+            return items if not items or items[0][1] > 0 else tuple((i, -c) for i, c in items)
+
+        result = StatementMatrix(self.n)
+        equalities = set()  # the equalities, merged from pairs of weak statements
+        for (kind, items), row in keep.items():
+            if kind == 1:
+                if (0, items) in keep or (2, canonical(items)) in keep:
+                    report["implied"] += 1
+                    continue
+                if (1, tuple((i, -c) for i, c in items)) in keep:
+                    # r >= 0 and -r >= 0  <=>  r = 0
+                    report["merged"] += 1
+                    if canonical(items) in equalities:
+                        continue
+                    equalities.add(canonical(items))
+                    row, kind = dict(canonical(items)), 2
+            if kind != 2 and model is not None and self.dominated(row, kind, model):
+                report["dominated"] += 1
+                continue
+            result.rows.append(row)
+            result.kinds.append(kind)
+        report["remaining"] = len(result.rows)
+        return result, report
+
+    @staticmethod
+    def dominated(row, kind, model):
+        """
+        Checks whether row * U >= 0 (kind = 1) or row * U > 0 (kind = 0) holds for every value function of the
+        model, because the alternatives with the positive coefficients dominate the ones with the negative
+        coefficients (pair by pair).
+
+        :param row: {alternative index: coefficient, ...}
+        :param kind: 0 or 1
+        :param model: RorutaModel
+        :return: bool
+        """
+        from itertools import permutations
+
+        plus = [i for i, c in row.items() for _ in range(c) if c > 0]
+        minus = [i for i, c in row.items() for _ in range(-c) if c < 0]
+        if len(plus) != len(minus) or len(plus) > 3:
+            return False
+        for order in permutations(minus):
+            strictly = False
+            for i, j in zip(plus, order):
+                differences = [vi - vj for vi, vj in zip(model.altVariables[i], model.altVariables[j])]
+                if min(differences) < 0:
+                    break
+                strictly = strictly or max(differences) > 0
+            else:
+                if kind == 1 or (model.strict and strictly):
+                    return True
+        return False
+
+    def toLists(self):
+        """
+        Converts the statements back to the lists of preferences and intensities (a row with one positive and one
+        negative coefficient is a preference, the other ones are intensities).
+
+        :return: prefList, pairsOfPairs, as in preferencesXML and intensitiesOfPrefXML
+        """
+        prefList = [[], [], []]
+        pairsOfPairs = [[], [], []]
+        for row, kind in zip(self.rows, self.kinds):
+            plus = ["a{}".format(i) for i, c in row.items() for _ in range(c) if c > 0]
+            minus = ["a{}".format(i) for i, c in row.items() for _ in range(-c) if c < 0]
+            if len(plus) == 1 and len(minus) == 1:
+                prefList[kind].append([plus[0], minus[0]])
+            elif len(plus) == 2 and len(minus) == 2:
+                # U(p0) + U(p1) - U(m0) - U(m1) R 0  <=>  U(p0) - U(m0) R U(m1) - U(p1)
+                pairsOfPairs[kind].append([[plus[0], minus[0]], [minus[1], plus[1]]])
+            elif not row:
+                pairsOfPairs[kind].append([["a0", "a0"], ["a0", "a0"]])  # 0 > 0: no compatible value function
+            else:
+                raise Exception("The statement {} can not be written as a preference or an intensity.".format(row))
+        return prefList, pairsOfPairs
+
+
+def reduceStatements(alt, criteria, perf, directions, prefList, pairsOfPairs=None, strict=True):
+    """
+    Removes the duplicate and redundant preferences and intensities (see StatementMatrix.reduced), e.g., before they
+    are written by preferencesXML and intensitiesOfPrefXML. The relations of the reduced statements are the same.
+
+    :param alt: names of alternatives (list), as returned by readPerformanceCSV
+    :param criteria: names of criteria (list), as returned by readPerformanceCSV
+    :param perf: performance table, as returned by readPerformanceCSV
+    :param directions: a 0/1 list of directions, as in criteriaDirectXML
+    :param prefList: [strong, weak, indif], as in preferencesXML
+    :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+    :param strict: as in computeRelations
+    :return: prefList, pairsOfPairs, report (the reduced statements and the report of StatementMatrix.reduced)
+    """
+    model = RorutaModel(alt, criteria, perf, directions, strict=strict)
+    statements, report = StatementMatrix.fromLists(len(alt), prefList, pairsOfPairs).reduced(model)
+    prefList, pairsOfPairs = statements.toLists()
+    return prefList, pairsOfPairs, report
+
+
+def statementLine(kind, statement, intensity=False):
+    """
+    Writes a preference (or an intensity of preference) in the form of the lines of the .pref files.
+
+    :param kind: 0, 1 or 2 (strong, weak or indif)
+    :param statement: [a, b] (or [[a, b], [c, d]] for an intensity)
+    :param intensity: True for an intensity of preference
+    :return: e.g., 'a2 > a4', 'a2 >= a4', 'a2 = a4' or 'a2 - a4 > a1 - a3'
+    """
+    relation = [">", ">=", "="][kind]
+    if intensity:
+        (a, b), (c, d) = statement
+        return "{} - {} {} {} - {}".format(a, b, relation, c, d)
+    return "{} {} {}".format(statement[0], relation, statement[1])
+
+
+@instrumented
+def minimalConflict(alt, criteria, perf, directions, prefList, pairsOfPairs=None, strict=True, statistics=None):
+    """
+    Finds a minimal set of conflicting preferences and intensities, i.e., a set of statements that no
+    (strictly, if strict) monotone value function satisfies, while any of its proper subsets is satisfied by some
+    function. If the statements are inconsistent, diviz writes no outputs; removing (or correcting) one statement of
+    the conflict removes this conflict (but there may be others, so the function can be called again).
+
+    The conflict is found by incremental addition: the statements are added (in the order of prefList and
+    pairsOfPairs) to the statements of the conflict so far, and the shortest inconsistent prefix is found by doubling
+    and bisection, so that its last statement belongs to the conflict. This is repeated until the conflict is
+    inconsistent on its own. Finally, deletion filtering checks that no statement can be removed from the conflict.
+    The sparse matrices of the model without the statements and the rows of each statement are assembled once, and
+    only stacked for each linear program. Still, each probe is a full linear program, solved from scratch (linprog
+    can not warm-start HiGHS), so the cost of a probe grows with the size of the model.
+
+    :param alt: names of alternatives (list), as returned by readPerformanceCSV
+    :param criteria: names of criteria (list), as returned by readPerformanceCSV
+    :param perf: performance table, as returned by readPerformanceCSV
+    :param directions: a 0/1 list of directions, as in criteriaDirectXML
+    :param prefList: [strong, weak, indif], as in preferencesXML
+    :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+    :param strict: as in computeRelations
+    :param statistics: if a dictionary is given, the number of solved linear programs is saved to it
+    :return: prefList, pairsOfPairs, lines (the statements of the conflict, and their lines, e.g., ['a2 > a4', ...],
+    see statementLine); the lists are empty if the statements are consistent
+    """
+    from scipy.sparse import vstack
+
+    pairsOfPairs = pairsOfPairs if pairsOfPairs is not None else [[], [], []]
+    model = RorutaModel(alt, criteria, perf, directions, strict=strict)
+    baseUb, baseEq, baseRhs = model.matrices()
+    statements = []  # (kind, statement, intensity)
+    for kind in range(3):
+        statements.extend((kind, [a, b], False) for a, b in prefList[kind])
+    for kind in range(3):
+        statements.extend((kind, [[a, b], [c, d]], True) for (a, b), (c, d) in pairsOfPairs[kind])
+    model.ubRows, model.eqRows, model.eqRhs = [], [], []
+    rows = []  # the ranges of the rows of each statement in statementUb and statementEq
+    for kind, statement, intensity in statements:
+        ubStart, eqStart = len(model.ubRows), len(model.eqRows)
+        model.addStatements(None if intensity else [[statement] if k == kind else [] for k in range(3)],
+                            [[statement] if k == kind else [] for k in range(3)] if intensity else None)
+        rows.append((range(ubStart, len(model.ubRows)), range(eqStart, len(model.eqRows))))
+    model.matrixCache = None
+    statementUb, statementEq, _ = model.matrices()
+    solved = [0]
+
+    def consistent(indices):
+        aUb = vstack([baseUb, statementUb[[r for k in indices for r in rows[k][0]]]], format="csr")
+        aEq = vstack([baseEq, statementEq[[r for k in indices for r in rows[k][1]]]], format="csr")
+        model.matrixCache = (aUb, aEq, baseRhs + [0.0] * (aEq.shape[0] - baseEq.shape[0]))
+        solved[0] += 1
+        return model.isConsistent()
+
+    conflict = []
+    if not consistent([]):
+        raise Exception("There is no (strictly, if strict) monotone value function, even without the preferences.")
+    candidates = list(range(len(statements)))
+    if not consistent(candidates):
+        while consistent(conflict):
+            # the shortest prefix of the candidates, inconsistent together with the conflict so far
+            low, high = 0, 1
+            while high < len(candidates) and consistent(conflict + candidates[:high]):
+                low, high = high, min(2 * high, len(candidates))
+            while high - low > 1:
+                middle = (low + high) // 2
+                if consistent(conflict + candidates[:middle]):
+                    low = middle
+                else:
+                    high = middle
+            conflict.append(candidates[high - 1])
+            candidates = candidates[:high - 1]
+        for k in list(conflict):
+            if not consistent([other for other in conflict if other != k]):
+                conflict.remove(k)
+    if statistics is not None:
+        statistics["linearPrograms"] = solved[0]
+    conflictPrefs = [[], [], []]
+    conflictPairs = [[], [], []]
+    lines = []
+    for k in sorted(conflict):
+        kind, statement, intensity = statements[k]
+        (conflictPairs if intensity else conflictPrefs)[kind].append(statement)
+        lines.append(statementLine(kind, statement, intensity))
+    return conflictPrefs, conflictPairs, lines
+
+
+@instrumented
+def computeRelations(alt, criteria, perf, directions, prefList, pairsOfPairs=None, strict=True, workers=1,
+                     statistics=None, prune=True, cache=None, reduce=True):
+    """
+    Computes the necessary and possible relations in-process, i.e., without the diviz workflow. The results are
+    the same as necessary-relations.xml and possible-relations.xml, produced by the diviz widget
+    RORUTA-NecessaryAndPossiblePreferenceRelations (with the parameter strict).
+
+    :param alt: names of alternatives (list), as returned by readPerformanceCSV
+    :param criteria: names of criteria (list), as returned by readPerformanceCSV
+    :param perf: performance table, as returned by readPerformanceCSV
+    :param directions: a 0/1 list of directions, as in criteriaDirectXML
+    :param prefList: [strong, weak, indif], as in preferencesXML
+    :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+    :param strict: if True, the marginal value functions are strictly monotone
+    :param workers: number of worker processes that solve the linear programs (see solvePairs)
+    :param statistics: if a dictionary is given, the output of solveTimeStatistics for the solved pairs is saved to it,
+    together with the number of pairs whose linear programs were skipped (statistics['skipped'])
+    :param prune: if True, the values of the pairs that can be inferred (see PairScheduler) are not solved;
+    with more than one worker, a free worker gets the next pair whose value is still unknown
+    :param cache: ResultCache or None; if the relations of the same problem are in the cache, they are returned
+    at once (and the statistics are not changed), otherwise they are computed and saved to the cache
+    :param reduce: if True, the duplicate and redundant statements are removed before solving (see
+    StatementMatrix.reduced); the report of the reduction and the sizes of the model with and without the reduction
+    are saved to statistics['reduction']
+    :return: necessary, possible: two n x n lists of bools, where necessary[i][j] (possible[i][j]) is True if
+    a<i> is necessarily (possibly) weakly preferred to a<j>.
+    """
+    if cache is not None:
+        key = problemKey(alt, criteria, perf, directions, prefList, pairsOfPairs, strict)
+        result = cache.get(key, ["necessary", "possible"])
+        if result is not None:
+            return result["necessary"], result["possible"]
+    if reduce:
+        model = RorutaModel(alt, criteria, perf, directions, strict=strict)
+        statements, report = StatementMatrix.fromLists(len(alt), prefList, pairsOfPairs).reduced(model)
+        model.addStatements(*statements.toLists())  # as reduceStatements, but the model is built only once
+        if statistics is not None:
+            report["modelSize"] = model.size()
+            report["fullModelSize"] = RorutaModel(alt, criteria, perf, directions, prefList, pairsOfPairs,
+                                                  strict).size()
+            statistics["reduction"] = report
+    else:
+        model = RorutaModel(alt, criteria, perf, directions, prefList, pairsOfPairs, strict)
+    if not model.isConsistent():
+        raise Exception("There is no value function, compatible with the preferences (see minimalConflict).")
+    scheduler = PairScheduler(len(alt))
+    if prune:
+        scheduler.useModel(model)
+    necessary, possible = solveScheduledPairs(model, scheduler, workers, statistics, prune)
+    if cache is not None:
+        cache.put(key, necessary=necessary, possible=possible)
+    return necessary, possible
+
+
+def solveScheduledPairs(model, scheduler, workers=1, statistics=None, prune=True):
+    """
+    Solves the pairs whose values are unknown to the scheduler, and returns the relations.
+
+    :param model: RorutaModel
+    :param scheduler: PairScheduler
+    :param workers: as in computeRelations
+    :param statistics: as in computeRelations
+    :param prune: as in computeRelations
+    :return: necessary, possible, as in computeRelations
+    """
+    workers = cpu_count() if workers is None else workers
+    times = []
+
+    def setResult(task, result, t):
+        necessaryRel, i, j = task
+        if necessaryRel:
+            scheduler.setNecessary(i, j, result)
+        else:
+            scheduler.setPossible(i, j, result)
+        times.append(t)
+
+    if not prune:
+        tasks = scheduler.nextTasks(len(scheduler.tasks))
+        if workers <= 1 or len(tasks) <= 1:
+            results = solveRelationTasks(tasks, model)
+        else:
+            with relationPool(model, workers) as pool:
+                results = solvePairs(model, tasks, workers, pool)
+        for task, (result, t) in zip(tasks, results):
+            setResult(task, result, t)
+    elif workers <= 1:
+        tasks = scheduler.nextTasks(1)
+        while tasks:
+            (result, t), = solveRelationTasks(tasks, model)
+            setResult(tasks[0], result, t)
+            tasks = scheduler.nextTasks(1)
+    else:
+        # a new pair is given to a worker as soon as the worker is free, and only if its value is still unknown,
+        # so that the values, inferred from the finished pairs, are used at once
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        with relationPool(model, workers) as pool:
+            running = {}
+            while True:
+                for task in scheduler.nextTasks(workers - len(running)):
+                    running[pool.submit(solveRelationTasks, [task])] = task
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    (result, t), = future.result()
+                    setResult(running.pop(future), result, t)
+    if statistics is not None:
+        statistics.update(solveTimeStatistics(times))
+        statistics["skipped"] = len(scheduler.tasks) - len(times)
+    instrumentation.count("linearPrograms", len(times))
+    instrumentation.count("skippedLinearPrograms", len(scheduler.tasks) - len(times))
+    necessary = [[i == j or bool(x) for j, x in enumerate(row)] for i, row in enumerate(scheduler.necessary)]
+    possible = [[i == j or bool(x) for j, x in enumerate(row)] for i, row in enumerate(scheduler.possible)]
+    return necessary, possible
+
+
+class IncrementalRelations:
+    """
+    Keeps the model and the necessary and possible relations of a problem, and updates them when the user defined
+    preferences (or intensities) change. If statements are only added, a necessary relation stays necessary and
+    a relation that is not possible stays impossible, so only the remaining pairs are checked (and the statements
+    are added to the existing model). If statements are only removed, the reverse holds. Otherwise, the relations
+    are computed from scratch.
+    """
+
+    def __init__(self, alt, criteria, perf, directions, prefList, pairsOfPairs=None, strict=True, workers=1):
+        """
+        The parameters are the same as in computeRelations. The relations are computed at once.
+        """
+        self.alt = alt
+        self.criteria = criteria
+        self.perf = perf
+        self.directions = directions
+        self.strict = strict
+        self.workers = workers
+        self.model = None
+        self.statements = None
+        self.necessary = None
+        self.possible = None
+        self.lastFunction = None  # the last representative function and what it was computed from
+        self.update(prefList, pairsOfPairs)
+
+    @instrumented
+    def update(self, prefList, pairsOfPairs=None, statistics=None):
+        """
+        Updates the relations for the new preferences and intensities.
+
+        :param prefList: [strong, weak, indif], as in preferencesXML
+        :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+        :param statistics: as in computeRelations; statistics['mode'] is one of 'unchanged', 'added', 'removed'
+        and 'full'
+        :return: necessary, possible, as in computeRelations
+        """
+        prefList = prefList if prefList is not None else [[], [], []]
+        pairsOfPairs = pairsOfPairs if pairsOfPairs is not None else [[], [], []]
+        statements = [{tuple(pair) for pair in prefList[kind]} for kind in range(3)] + \
+                     [{(tuple(a), tuple(b)) for a, b in pairsOfPairs[kind]} for kind in range(3)]
+        if self.statements is None:
+            mode = "full"
+        else:
+            added = any(new - old for new, old in zip(statements, self.statements))
+            removed = any(old - new for new, old in zip(statements, self.statements))
+            mode = "full" if added and removed else "added" if added else "removed" if removed else "unchanged"
+        if statistics is not None:
+            statistics.update(solveTimeStatistics([]))
+            statistics["skipped"] = len(self.alt) * (len(self.alt) - 1) * 2
+            statistics["mode"] = mode
+        if mode == "unchanged":
+            return self.necessary, self.possible
+
+        if mode == "added":
+            model = self.model
+            model.addStatements([list(statements[kind] - self.statements[kind]) for kind in range(3)],
+                                [list(statements[3 + kind] - self.statements[3 + kind]) for kind in range(3)])
+        else:
+            model = RorutaModel(self.alt, self.criteria, self.perf, self.directions,
+                                [[list(pair) for pair in prefList[kind]] for kind in range(3)], pairsOfPairs,
+                                self.strict)
+        if not model.isConsistent():
+            self.model = None  # the model of the added statements is inconsistent, so we start from scratch next time
+            self.statements = None
+            raise Exception("There is no value function, compatible with the preferences (see minimalConflict).")
+
+        scheduler = PairScheduler(len(self.alt))
+        scheduler.useModel(model)
+        n = len(self.alt)
+        for i in range(n):
+            for j in range(n):
+                if mode == "added":
+                    if self.necessary[i][j]:
+                        scheduler.setNecessary(i, j, True)
+                    if not self.possible[i][j]:
+                        scheduler.setPossible(i, j, False)
+                elif mode == "removed":
+                    if not self.necessary[i][j]:
+                        scheduler.setNecessary(i, j, False)
+                    if self.possible[i][j]:
+                        scheduler.setPossible(i, j, True)
+        self.necessary, self.possible = solveScheduledPairs(model, scheduler, self.workers, statistics)
+        if statistics is not None:
+            statistics["mode"] = mode
+        self.model = model
+        self.statements = statements
+        return self.necessary, self.possible
+
+    @instrumented
+    def representativeFunction(self, compromise=False, minimalStep=representativeMinimalStep, statistics=None,
+                               cache=None):
+        """
+        Computes the representative value function (see representativeFunction) of the current statements from
+        the current relations. If statements were only added since the last call, the necessary relation has not
+        changed and the last function satisfies the added statements, the last function is still optimal (the
+        added constraints can not improve the optimum, and the last optimum is still feasible), so it is returned
+        without solving anything.
+
+        :param compromise: as in representativeFunction
+        :param minimalStep: as in representativeFunction
+        :param statistics: if a dictionary is given, statistics['reused'] tells whether the last function was reused
+        :param cache: ResultCache or None; if the last function can not be reused, the function is looked up in
+        the cache (as in representativeFunction) before it is computed, and a computed function is saved to it
+        :return: the function, as in representativeFunction
+        """
+        last = self.lastFunction
+        reused = last is not None and last["settings"] == (compromise, minimalStep) and \
+            last["necessary"] == self.necessary and all(old <= new for old, new in zip(last["statements"],
+                                                                                      self.statements))
+        if reused:
+            x = last["solution"]["x"]
+            epsilon = last["solution"]["epsilon"]
+            bounds = [epsilon, 0.0, 0.0]  # the minimal values of row * x for strong, weak and indif statements
+            for kind in range(6):
+                for statement in self.statements[kind] - last["statements"][kind]:
+                    if kind < 3:
+                        a, b = statement
+                        plus, minus = [alternativeIndex(a)], [alternativeIndex(b)]
+                    else:
+                        (a, b), (c, d) = statement
+                        plus = [alternativeIndex(a), alternativeIndex(d)]
+                        minus = [alternativeIndex(b), alternativeIndex(c)]
+                    value = sum(c * x[v] for v, c in self.model.difference(plus, minus).items())
+                    tolerance = self.model.tolerance
+                    if value < bounds[kind % 3] - tolerance or (kind % 3 == 2 and value > tolerance):
+                        reused = False
+        if statistics is not None:
+            statistics["reused"] = reused
+        if reused:
+            return last["function"]
+        prefList = [[list(pair) for pair in self.statements[kind]] for kind in range(3)]
+        pairsOfPairs = [[[list(a), list(b)] for a, b in self.statements[3 + kind]] for kind in range(3)]
+        if cache is not None:
+            key = representativeKey(problemKey(self.alt, self.criteria, self.perf, self.directions, prefList,
+                                               pairsOfPairs, self.strict), compromise, minimalStep)
+            result = cache.get(key, ["representative"])
+            if result is not None:
+                return result["representative"]
+        model = RorutaModel(self.alt, self.criteria, self.perf, self.directions, prefList, pairsOfPairs, strict=False)
+        solution = {}
+        function = solveRepresentativeFunction(model, self.necessary, self.strict, compromise, minimalStep, solution)
+        self.lastFunction = {"settings": (compromise, minimalStep), "necessary": self.necessary,
+                             "statements": self.statements, "solution": solution, "function": function}
+        if cache is not None:
+            cache.put(key, representative=function)
+        return function
+
+
+def relationPairs(matrix):
+    """
+    Converts a relation matrix to the list of pairs, as returned by readRelations(relations, False).
+
+    :param matrix: n x n list of bools, e.g., an output of computeRelations
+    :return: [[a<i>, a<j>], ...] for all i, j, such that matrix[i][j]
+    """
+    return [["a{}".format(i), "a{}".format(j)] for i, row in enumerate(matrix) for j, x in enumerate(row) if x]
+
+
+#############################################################################################
+# Representative value function (in-process)                                                #
+#############################################################################################
+
+@instrumented
+def representativeFunction(alt, criteria, perf, directions, prefList, pairsOfPairs=None, strict=True,
+                           compromise=False, relations=None, minimalStep=representativeMinimalStep, cache=None):
+    """
+    Computes the most representative value function in-process, i.e., without the diviz workflow, like the diviz
+    widget RORUTA-RepresentativeValueFunction (with the parameters strict and compromise):
+
+    1. maximize epsilon, such that U(a) - U(b) >= epsilon for all pairs, where a is necessarily strictly preferred
+       to b (a >=N b, but not b >=N a),
+    2. with epsilon fixed, minimize delta, such that |U(a) - U(b)| <= delta for all pairs a, b that are not
+       comparable in the necessary relation,
+
+    or, if compromise, maximize epsilon - delta at once. If strict, the consecutive values of each marginal value
+    function differ for at least minimalStep. The optimal value function need not be unique, so when compared to
+    diviz, epsilon and delta (and, typically, the utilities of the alternatives) are the same, but the marginal
+    values may differ.
+
+    :param alt: names of alternatives (list), as returned by readPerformanceCSV
+    :param criteria: names of criteria (list), as returned by readPerformanceCSV
+    :param perf: performance table, as returned by readPerformanceCSV
+    :param directions: a 0/1 list of directions, as in criteriaDirectXML
+    :param prefList: [strong, weak, indif], as in preferencesXML
+    :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+    :param strict: if True, the marginal value functions are strictly monotone
+    :param compromise: if True, epsilon - delta is maximized (instead of the two stages)
+    :param relations: (necessary, possible), as returned by computeRelations; if None, they are computed
+    :param minimalStep: see strict
+    :param cache: ResultCache or None; if the function of the same problem (and settings, see representativeKey)
+    is in the cache, it is returned at once, otherwise it is computed and saved to the cache (the relations are
+    computed with the same cache)
+    :return: {'cr0': {x00: y00, x01: y01, ...}, ...}, as returned by getRepresentativeFunction
+    """
+    if cache is not None:
+        key = representativeKey(problemKey(alt, criteria, perf, directions, prefList, pairsOfPairs, strict),
+                                compromise, minimalStep)
+        result = cache.get(key, ["representative"])
+        if result is not None:
+            return result["representative"]
+    if relations is None:
+        relations = computeRelations(alt, criteria, perf, directions, prefList, pairsOfPairs, strict, cache=cache)
+    necessary = relations[0]
+    model = RorutaModel(alt, criteria, perf, directions, prefList, pairsOfPairs, strict=False)
+    function = solveRepresentativeFunction(model, necessary, strict, compromise, minimalStep)
+    if cache is not None:
+        cache.put(key, representative=function)
+    return function
+
+
+def solveRepresentativeFunction(model, necessary, strict=True, compromise=False, minimalStep=representativeMinimalStep,
+                                solution=None):
+    """
+    Solves the linear programs of representativeFunction.
+
+    :param model: RorutaModel with strict = False (the monotonicity constraints are the first rows of model.ubRows)
+    :param necessary: n x n list of bools, the necessary relation
+    :param strict: as in representativeFunction
+    :param compromise: as in representativeFunction
+    :param minimalStep: as in representativeFunction
+    :param solution: if a dictionary is given, the values of the variables (solution['x']), epsilon and delta are
+    saved to it
+    :return: the function, as in representativeFunction
+    """
+    from scipy.optimize import linprog
+    from scipy.sparse import csr_matrix, hstack, vstack
+
+    n = model.n
+    epsilon = model.epsilon
+    delta = model.nVariables  # an additional variable
+    monotonicity = sum(len(values) - 1 for values in model.characteristicPoints)
+    aUb, aEq, bEq = model.matrices()
+    bUb = [-minimalStep if strict else 0.0] * monotonicity + [0.0] * (aUb.shape[0] - monotonicity)
+
+    rows = []
+    for i in range(n):
+        for j in range(n):
+            if necessary[i][j] and not necessary[j][i]:
+                row = {v: -c for v, c in model.difference([i], [j]).items()}  # U(j) - U(i) + epsilon <= 0
+                row[epsilon] = row.get(epsilon, 0.0) + 1.0
+                rows.append(row)
+            elif i != j and not necessary[i][j] and not necessary[j][i]:
+                row = dict(model.difference([i], [j]))  # U(i) - U(j) - delta <= 0
+                row[delta] = -1.0
+                rows.append(row)
+    extra = csr_matrix(([c for row in rows for c in row.values()],
+                        ([r for r, row in enumerate(rows) for _ in row], [v for row in rows for v in row])),
+                       shape=(len(rows), delta + 1))
+    aUb = vstack([hstack([aUb, csr_matrix((aUb.shape[0], 1))]), extra], format="csr")
+    aEq = hstack([aEq, csr_matrix((aEq.shape[0], 1))], format="csr")
+    bUb = bUb + [0.0] * len(rows)
+    bounds = [(0, None)] * epsilon + [(None, 1), (0, None)]
+
+    def solve(objective, bounds):
+        result = linprog(objective, A_ub=aUb, b_ub=bUb, A_eq=aEq, b_eq=bEq, bounds=bounds, method="highs")
+        if result.status == 2:
+            raise Exception("There is no value function, compatible with the preferences (see minimalConflict).")
+        if result.status != 0:
+            raise Exception("The linear program could not be solved: {}".format(result.message))
+        return result
+
+    objective = [0.0] * (delta + 1)
+    objective[epsilon] = -1.0
+    if compromise:
+        objective[delta] = 1.0
+        x = solve(objective, bounds).x
+    else:
+        maxEpsilon = -solve(objective, bounds).fun
+        objective[epsilon] = 0.0
+        objective[delta] = 1.0
+        bounds[epsilon] = (maxEpsilon, maxEpsilon)
+        x = solve(objective, bounds).x
+    if solution is not None:
+        solution.update({"x": [float(v) for v in x], "epsilon": float(x[epsilon]), "delta": float(x[delta])})
+
+    function = {}
+    first = 0
+    for j, values in enumerate(model.characteristicPoints):
+        points = {}
+        for k, value in enumerate(values):
+            points[int(value) if value.is_integer() else value] = max(0.0, float(x[first + k]))
+        function["cr{}".format(j)] = points
+        first += len(values)
+    return function
+
+
+#############################################################################################
+# Stochastic acceptability indices (SMAA)                                                   #
+#############################################################################################
+
+class ValueFunctionSampler:
+    """
+    Samples the value functions, compatible with the user defined preferences and intensities of preferences
+    (the feasible set of RorutaModel), uniformly at random by hit-and-run: in each step, each walker chooses
+    a random direction and moves to a random point of the feasible set on the line through its current point
+    in this direction. Many walkers are moved at once (vectorized), and a walker is moved only within the subspace
+    of the equality constraints. The strict inequalities (strong preferences, strict monotonicity) differ from
+    the weak ones only on a set of measure zero, so epsilon is not sampled. Needs numpy and scipy.
+    """
+
+    def __init__(self, model):
+        """
+        :param model: RorutaModel
+        :return: None
+        """
+        import numpy as np
+        from scipy.linalg import null_space
+        from scipy.optimize import linprog
+        from scipy.sparse import csr_matrix, hstack
+
+        aUb, aEq, bEq = model.matrices()
+        nVariables = model.epsilon
+        self.inequalities = csr_matrix(aUb[:, :nVariables])  # the feasible set: inequalities * x <= 0, ...
+        equalities = aEq[:, :nVariables].toarray()  # ... equalities * x = rhs
+        self.basis = null_space(equalities)  # orthonormal basis of the directions of the moves
+        if self.basis.shape[1] == 0:
+            raise Exception("There is only one compatible value function.")
+        data, rowIndices, colIndices = [], [], []
+        for i, variables in enumerate(model.altVariables):
+            data.extend([1.0] * len(variables))
+            rowIndices.extend([i] * len(variables))
+            colIndices.extend(variables)
+        self.utilities = csr_matrix((data, (rowIndices, colIndices)), shape=(model.n, nVariables))
+
+        # start in the center of the largest ball (within the subspace) that fits into the feasible set
+        norms = np.sqrt(np.asarray((self.inequalities @ self.basis) ** 2).sum(axis=1))
+        useful = norms > model.tolerance
+        self.inequalities = self.inequalities[np.flatnonzero(useful)]
+        radiusColumn = csr_matrix(norms[useful].reshape(-1, 1))
+        aUb = hstack([self.inequalities, radiusColumn], format="csr")
+        aEq = hstack([csr_matrix(equalities), csr_matrix((equalities.shape[0], 1))], format="csr")
+        objective = [0.0] * nVariables + [-1.0]
+        result = linprog(objective, A_ub=aUb, b_ub=[0.0] * aUb.shape[0], A_eq=aEq, b_eq=bEq,
+                         bounds=[(None, None)] * nVariables + [(None, 1)], method="highs")
+        if result.status == 2:
+            raise Exception("The preferences are inconsistent: there is no compatible value function.")
+        if result.status != 0:
+            raise Exception("The linear program could not be solved: {}".format(result.message))
+        if -result.fun <= model.tolerance:
+            raise Exception("The compatible value functions satisfy some weak preferences with equality: "
+                            "write them as indifferences.")
+        self.start = result.x[:nVariables]
+
+    def walk(self, points, steps, generator):
+        """
+        Moves the walkers for the given number of hit-and-run steps.
+
+        :param points: nVariables x walkers array of the current points of the walkers (modified in place)
+        :param steps: number of steps
+        :param generator: numpy.random.Generator
+        :return: points
+        """
+        import numpy as np
+
+        walkers = points.shape[1]
+        for _ in range(steps):
+            directions = self.basis @ generator.standard_normal((self.basis.shape[1], walkers))
+            directions /= np.linalg.norm(directions, axis=0)
+            slack = -(self.inequalities @ points)  # >= 0 for the feasible points
+            change = self.inequalities @ directions
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratios = slack / change
+            upper = np.where(change > 1e-12, ratios, np.inf).min(axis=0)
+            lower = np.where(change < -1e-12, ratios, -np.inf).max(axis=0)
+            upper = np.maximum(upper, 0.0)
+            lower = np.minimum(lower, 0.0)
+            points += directions * (lower + (upper - lower) * generator.random(walkers))
+        return points
+
+
+def sampleAcceptabilities(sampler, points, samples, burnIn, thinning, randomSeed):
+    """
+    Runs one chain (a group of walkers) of the sampler and counts the outcomes of its samples.
+
+    :param sampler: ValueFunctionSampler
+    :param points: nVariables x walkers array of the starting points of the walkers
+    :param samples: number of samples per walker
+    :param burnIn: number of steps before the first sample
+    :param thinning: number of steps between the samples
+    :param randomSeed: seed of the chain
+    :return: {'points': the last points, 'samples': number of samples, 'wins': n x n counts of U(a<i>) > U(a<j>),
+    'ranks': n x n counts of a<i> being at the place r + 1, 'sum', 'sumOfSquares': of the utilities}
+    """
+    import numpy as np
+
+    generator = np.random.default_rng(randomSeed)
+    n = sampler.utilities.shape[0]
+    points = np.array(points, dtype=float)
+    walkers = points.shape[1]
+    wins = np.zeros((n, n), dtype=np.int64)
+    ranks = np.zeros((n, n), dtype=np.int64)
+    total = np.zeros(n)
+    totalSquares = np.zeros(n)
+    sampler.walk(points, burnIn, generator)
+    for k in range(samples):
+        if k > 0:
+            sampler.walk(points, thinning, generator)
+        utilities = sampler.utilities @ points  # n x walkers
+        for j in range(n):
+            wins[:, j] += np.count_nonzero(utilities > utilities[j], axis=1)
+        order = np.argsort(-utilities, axis=0, kind="stable")
+        np.add.at(ranks, (order, np.arange(n)[:, None]), 1)
+        total += utilities.sum(axis=1)
+        totalSquares += (utilities ** 2).sum(axis=1)
+    return {"points": points, "samples": samples * walkers, "wins": wins, "ranks": ranks, "sum": total,
+            "sumOfSquares": totalSquares}
+
+
+def acceptabilityDiagnostics(chains):
+    """
+    Computes the convergence diagnostics from the outputs of sampleAcceptabilities of (at least two) chains.
+
+    :param chains: list of the outputs of sampleAcceptabilities
+    :return: {'rHat': the largest potential scale reduction factor (Gelman-Rubin) of the utilities of
+    the alternatives, 'standardError': the largest standard error of the winning probabilities and rank
+    acceptability indices (from the differences between the chains)}
+    """
+    import numpy as np
+
+    counts = np.array([chain["samples"] for chain in chains], dtype=float)
+    means = np.array([chain["sum"] for chain in chains]) / counts[:, None]
+    variances = np.array([chain["sumOfSquares"] for chain in chains]) / counts[:, None] - means ** 2
+    m = counts.min()
+    within = np.maximum(variances.mean(axis=0), 1e-300)
+    between = m * means.var(axis=0, ddof=1)
+    rHat = np.sqrt(((m - 1) / m * within + between / m) / within)
+    estimates = [np.concatenate([chain["wins"].ravel(), chain["ranks"].ravel()]) / chain["samples"]
+                 for chain in chains]
+    standardError = np.std(estimates, axis=0, ddof=1) / np.sqrt(len(chains))
+    return {"rHat": float(rHat.max()), "standardError": float(standardError.max())}
+
+
+@instrumented
+def acceptabilityIndices(alt, criteria, perf, directions, prefList, pairsOfPairs=None, samples=10000, chains=4,
+                         walkers=100, burnIn=None, thinning=None, workers=1, randomSeed=12345, targetError=None,
+                         maxRounds=10, statistics=None):
+    """
+    Estimates the stochastic acceptability indices (as in SMAA) of the alternatives by sampling the compatible value
+    functions uniformly at random (see ValueFunctionSampler): the winning probabilities P(U(a<i>) > U(a<j>)) and the
+    rank acceptability indices P(a<i> is at the place r + 1). Unlike the necessary and possible relations,
+    they show how many of the compatible value functions support a conclusion.
+
+    The samples come from independent chains (in the first round, the chain k uses the seed randomSeed + k, and in
+    the round r, the seed randomSeed + k + r * chains, so the results do not depend on workers), each with
+    the given number of walkers. If targetError is given, the chains are continued
+    (in rounds of samples samples) until the largest standard error of the estimates is at most targetError.
+
+    :param alt: names of alternatives (list), as returned by readPerformanceCSV
+    :param criteria: names of criteria (list), as returned by readPerformanceCSV
+    :param perf: performance table, as returned by readPerformanceCSV
+    :param directions: a 0/1 list of directions, as in criteriaDirectXML
+    :param prefList: [strong, weak, indif], as in preferencesXML
+    :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+    :param samples: number of samples (in each round), divided among the chains and walkers
+    :param chains: number of chains (at least 2, for the diagnostics)
+    :param walkers: number of walkers in each chain
+    :param burnIn: number of steps before the first sample (default: 10 times the dimension of the feasible set)
+    :param thinning: number of steps between the samples of a walker (default: the dimension of the feasible set)
+    :param workers: number of worker processes, among which the chains are divided; if None, the number of
+    processors is used
+    :param randomSeed: seed of the first chain
+    :param targetError: if given, the required largest standard error of the estimates
+    :param maxRounds: the largest number of rounds (if targetError is given)
+    :param statistics: if a dictionary is given, the convergence diagnostics (see acceptabilityDiagnostics), the
+    number of samples and rounds and the time are saved to it
+    :return: (winning, acceptability), two n x n numpy arrays: winning[i][j] is the probability that
+    U(a<i>) > U(a<j>), and acceptability[i][r] is the probability that a<i> is at the place r + 1
+    """
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+
+    if chains < 2:
+        raise Exception("At least two chains are needed for the diagnostics.")
+    t0 = perf_counter()
+    model = RorutaModel(alt, criteria, perf, directions, prefList, pairsOfPairs, strict=False)
+    sampler = ValueFunctionSampler(model)
+    dimension = sampler.basis.shape[1]
+    burnIn = 10 * dimension if burnIn is None else burnIn
+    thinning = dimension if thinning is None else thinning
+    perChain = max(1, -(-samples // (chains * walkers)))
+    points = [np.repeat(sampler.start[:, None], walkers, axis=1) for _ in range(chains)]
+    workers = cpu_count() if workers is None else workers
+    pool = ProcessPoolExecutor(max_workers=min(workers, chains)) if workers > 1 else None
+    results = None
+    rounds = 0
+    try:
+        while True:
+            seeds = [randomSeed + k + rounds * chains for k in range(chains)]
+            steps = burnIn if rounds == 0 else thinning  # a continued chain needs no burn-in
+            arguments = [[sampler] * chains, points, [perChain] * chains, [steps] * chains, [thinning] * chains, seeds]
+            chainResults = list(pool.map(sampleAcceptabilities, *arguments) if pool is not None else
+                                map(sampleAcceptabilities, *arguments))
+            if results is None:
+                results = chainResults
+            else:
+                for result, new in zip(results, chainResults):
+                    for key in ["samples", "wins", "ranks", "sum", "sumOfSquares"]:
+                        result[key] = result[key] + new[key]
+            points = [result["points"] for result in chainResults]
+            rounds += 1
+            diagnostics = acceptabilityDiagnostics(results)
+            logger().debug("SMAA round %d: R-hat %.4f, standard error %.4f", rounds, diagnostics["rHat"],
+                           diagnostics["standardError"])
+            if targetError is None or diagnostics["standardError"] <= targetError or rounds >= maxRounds:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    total = sum(result["samples"] for result in results)
+    winning = sum(result["wins"] for result in results) / total
+    acceptability = sum(result["ranks"] for result in results) / total
+    if statistics is not None:
+        statistics.update(diagnostics)
+        statistics.update({"samples": total, "rounds": rounds, "dimension": dimension, "burnIn": burnIn,
+                           "thinning": thinning, "time": perf_counter() - t0})
+    return winning, acceptability
+
+
+#############################################################################################
+# Result cache                                                                              #
+#############################################################################################
+
+
+def problemKey(alt, criteria, perf, directions, prefList, pairsOfPairs=None, strict=True):
+    """
+    Computes the key of a problem: the hash of everything that defines it, i.e., the inputs of the *XML functions
+    (and the parameter strict). The order of the user defined statements does not matter.
+
+    :param alt: names of alternatives (list)
+    :param criteria: names of criteria (list)
+    :param perf: performance table (dictionary: {alternative: {criterion: value, ...}, ...})
+    :param directions: a 0/1 list of directions, as in criteriaDirectXML
+    :param prefList: [strong, weak, indif], as in preferencesXML
+    :param pairsOfPairs: [strict, weak, indif] intensities, as in intensitiesOfPrefXML
+    :param strict: as in computeRelations
+    :return: hexadecimal SHA-256 hash
+    """
+    import json
+    from hashlib import sha256
+
+    prefList = prefList if prefList is not None else [[], [], []]
+    pairsOfPairs = pairsOfPairs if pairsOfPairs is not None else [[], [], []]
+    problem = {"alternatives": list(alt),
+               "criteria": list(criteria),
+               "performances": [[str(perf[a][cr]) for cr in criteria] for a in alt],
+               "directions": [int(d) for d in directions],
+               "preferences": [sorted([str(x) for x in pair] for pair in prefList[k]) for k in range(3)],
+               "intensities": [sorted([[str(x) for x in pair] for pair in pp] for pp in pairsOfPairs[k])
+                               for k in range(3)],
+               "strict": bool(strict)}
+    return sha256(json.dumps(problem, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def representativeKey(key, compromise=False, minimalStep=representativeMinimalStep):
+    """
+    Computes the key, under which the representative value function of a problem is cached: the key of the problem
+    for the default settings (so that the function is kept together with the relations), and the hash of the key and
+    the settings otherwise.
+
+    :param key: key of a problem (see problemKey)
+    :param compromise: as in representativeFunction
+    :param minimalStep: as in representativeFunction
+    :return: hexadecimal SHA-256 hash
+    """
+    from hashlib import sha256
+
+    if not compromise and minimalStep == representativeMinimalStep:
+        return key
+    return sha256("{}|{}|{!r}".format(key, bool(compromise), float(minimalStep)).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    A persistent cache of results (necessary and possible relations and the representative value function),
+    keyed by problemKey. Each problem is a JSON file <key>.json in the cache folder. When the files take more than
+    maxBytes, the least recently used ones are removed. The numbers of hits and misses are counted.
+    """
+
+    def __init__(self, folder, maxBytes=100 * 2 ** 20):
+        """
+        :param folder: the folder of the cache (created if it does not exist)
+        :param maxBytes: the maximal total size of the files in the cache
+        """
+        self.folder = toSlash(folder)
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+        makedirs(self.folder, exist_ok=True)
+        self.entries = {}  # {key: [size, time of the last use], ...}
+        for f in listdir(self.folder):
+            if f.endswith(".json"):
+                info = stat("{}/{}".format(self.folder, f))
+                self.entries[f[:-5]] = [info.st_size, info.st_mtime]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = Lock()
+
+    def fileName(self, key):
+        """
+        :param key: key of a problem
+        :return: the path to the file of the problem
+        """
+        return "{}/{}.json".format(self.folder, key)
+
+    def get(self, key, fields=None):
+        """
+        Returns the cached result of the problem. It counts as a hit only if all the required fields are known.
+
+        :param key: key of a problem (see problemKey)
+        :param fields: the required fields, e.g., ['necessary', 'possible']; if None, any known field suffices
+        :return: {'necessary': ..., 'possible': ..., 'representative': ...} (only the known fields),
+        or None if the problem is not in the cache (or some of the required fields are not known)
+        """
+        import json
+
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            try:
+                with open(self.fileName(key)) as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                del self.entries[key]  # removed by another process or broken
+                self.misses += 1
+                return None
+            if fields is not None and any(field not in result for field in fields):
+                self.misses += 1
+                return None
+            self.hits += 1
+            now = time()
+            self.entries[key][1] = now
+            utime(self.fileName(key), (now, now))  # so that the order of the uses survives the restarts
+        if "representative" in result:
+            result["representative"] = {cr: {x: y for x, y in points} for cr, points in result["representative"]}
+        return result
+
+    def put(self, key, necessary=None, possible=None, representative=None):
+        """
+        Saves (a part of) the result of a problem to the cache. The fields that are not given are kept
+        (if the problem is already in the cache).
+
+        :param key: key of a problem (see problemKey)
+        :param necessary: n x n list of bools (see computeRelations)
+        :param possible: n x n list of bools (see computeRelations)
+        :param representative: the representative value function {crN: {x: y, ...}, ...}, as returned by
+        getRepresentativeFunction (or representativeFunction)
+        :return: None
+        """
+        import json
+
+        with self.lock:
+            result = {}
+            if key in self.entries:
+                try:
+                    with open(self.fileName(key)) as f:
+                        result = json.load(f)
+                except (OSError, ValueError):
+                    result = {}
+            if necessary is not None:
+                result["necessary"] = necessary
+            if possible is not None:
+                result["possible"] = possible
+            if representative is not None:
+                # a list of points, since JSON keys are strings
+                result["representative"] = [[cr, list(points.items())] for cr, points in representative.items()]
+            temporary = "{}.{}.tmp".format(self.fileName(key), getpid())
+            with open(temporary, "w") as f:
+                json.dump(result, f)
+            replace(temporary, self.fileName(key))
+            self.entries[key] = [stat(self.fileName(key)).st_size, time()]
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used problems while the cache is larger than maxBytes.
+
+        :return: None
+        """
+        total = sum(size for size, _ in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k][1]):
+            if total <= self.maxBytes:
+                break
+            total -= self.entries.pop(key)[0]
+            try:
+                remove(self.fileName(key))
+            except OSError:
+                pass
+
+    def statistics(self):
+        """
+        :return: {'hits': ..., 'misses': ..., 'entries': ..., 'bytes': ...}
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries),
+                    "bytes": sum(size for size, _ in self.entries.values())}
+
+
+#############################################################################################
+# Catalogue of diviz runs                                                                   #
+#############################################################################################
+
+
+runNamePattern = compileRegex(r"^(\d{4})-(\d{2})-(\d{2})T(\d{2})_(\d{2})_(\d{2})(?:\.(\d+))?")
+relationsWidget = "RORUTA-NecessaryAndPossiblePreferenceRelations-1"
+functionWidget = "RORUTA-RepresentativeValueFunction-1"
+
+
+def runTimestamp(name):
+    """
+    Parses the name of a diviz output folder.
+
+    :param name: name of the folder, e.g., 2017-05-31T12_30_45.123+0200
+    :return: datetime (the part after + is ignored), or None if the name is not of this form
+    (e.g., if the run has been renamed)
+    """
+    from datetime import datetime
+
+    match = runNamePattern.search(name)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, millis = match.groups()
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                    int((millis or "0").ljust(3, "0")[:3]) * 1000)
+
+
+class DivizRun:
+    """
+    An indexed output folder of a diviz workflow: its name, timestamp, variant and the sizes of the outputs
+    of the widgets. The relations and the representative value function are read only when asked for,
+    and then kept.
+    """
+
+    def __init__(self, folder, name, timestamp, variant, outputs, stamp):
+        """
+        :param folder: the workflow folder
+        :param name: name of the output folder
+        :param timestamp: POSIX timestamp of the run (parsed from the name, or the modification time of the folder
+        if the run has been renamed)
+        :param variant: name of the variant of the user defined preferences (the name of a renamed run), or None
+        :param outputs: {widgetFolder/file: size in bytes, ...}
+        :param stamp: modification time of the output folder (in ns) at the time of indexing
+        """
+        self.folder = folder
+        self.name = name
+        self.timestamp = timestamp
+        self.variant = variant
+        self.outputs = outputs
+        self.stamp = stamp
+        self.loaded = {}
+
+    def __repr__(self):
+        return "DivizRun({!r}, variant={!r}, outputs={})".format(self.name, self.variant, len(self.outputs))
+
+    def path(self, output=""):
+        """
+        :param output: e.g., 'preferences.xml' or 'RORUTA-RepresentativeValueFunction-1/messages.xml'
+        :return: workflowFolder/name/output
+        """
+        return "{}/{}/{}".format(self.folder, self.name, output) if output else "{}/{}".format(self.folder, self.name)
+
+    def has(self, output):
+        """
+        :param output: relative path of an output, as in path
+        :return: True if the output existed at the time of indexing
+        """
+        return output in self.outputs
+
+    def relations(self, necessaryRels, n=None):
+        """
+        Reads (once) the necessary or possible relations of the run (see streamRelations).
+
+        :param necessaryRels: bool, if True, the necessary relations are read, otherwise the possible ones
+        :param n: number of alternatives
+        :return: Relation
+        """
+        relXml = "necessary-relations.xml" if necessaryRels else "possible-relations.xml"
+        output = "{}/{}".format(relationsWidget, relXml)
+        return self.load(output, lambda f: streamRelations(f, False, n))
+
+    def preferences(self, n=None):
+        """
+        Reads (once) the user defined preferences of the run (see streamRelations).
+
+        :param n: number of alternatives
+        :return: [strong, weak, indif]
+        """
+        return self.load("preferences.xml", lambda f: streamRelations(f, True, n))
+
+    def representativeFunction(self):
+        """
+        Reads (once) the representative value function of the run (see streamRepresentativeFunction).
+
+        :return: {cr<i>: {x: y, ...}, ...}
+        """
+        return self.load("{}/{}".format(functionWidget, "representative-value-function.xml"),
+                         streamRepresentativeFunction)
+
+    def load(self, output, reader):
+        """
+        :param output: relative path of an output, as in path
+        :param reader: function that reads the output from the given path
+        :return: the (kept) result of the reader
+        """
+        if output not in self.loaded:
+            if not self.has(output):
+                raise Exception("The run {} has no output {}".format(self.name, output))
+            self.loaded[output] = reader(self.path(output))
+        return self.loaded[output]
+
 
-    :param alt: List of the names of the alternatives.
-    :return: None
+class RunCatalogue:
+    """
+    An index of the output folders (runs) of a diviz workflow. Each run is scanned once; refresh (which is called
+    explicitly) scans the new runs and the runs that are still in progress (see inProgress) and forgets the removed
+    ones. The queries (latest, byVariant, between) use the index and do not touch the workflow folder.
+    If indexFile is given, the index is stored there, so that it survives between the sessions.
     """
 
-    spaceString = 4 * " "
-    with open("{}/{}/{}/alternatives.xml".format(inputFolder, myProjects, projectName), "w") as f:
-        space = 0
-        print(header(), file=f)
-        space += 1
-        print("{}<alternatives>".format(spaceString * space), file=f)
-        space += 1
-        for i,a in enumerate(alt):
-            print('{}<alternative id="a{}" name="{}"/>'.format(spaceString * space, i,a), file=f)
-        space -= 1
-        print("{}</alternatives>".format(spaceString * space), file=f)
-        space -= 1
-        print(endTag(), file=f)
+    # the outputs of a finished run; a run without some of them is checked again by refresh, until it settles
+    expectedOutputs = ("{}/necessary-relations.xml".format(relationsWidget),
+                       "{}/possible-relations.xml".format(relationsWidget))
+    settleTime = 3600.0  # in seconds: a run that has not changed for so long is not checked again
 
+    def __init__(self, workflowFolder, indexFile=None, refresh=True):
+        """
+        :param workflowFolder: root folder of a workflow, where the outputs are stored, e.g.,
+        'C:/Users/user/diviz_workspace/rorUtaNecessaryAndPossibleRelations'
+        :param indexFile: JSON file where the index is stored, or None (the index is kept in memory only)
+        :param refresh: if True, the catalogue is refreshed at once
+        """
+        import json
+
+        self.folder = toSlash(workflowFolder)
+        self.indexFile = indexFile
+        self.runs = {}  # {name: DivizRun, ...}
+        self.order = []  # runs, sorted by timestamp
+        self.refreshed = None  # time of the last refresh
+        if indexFile is not None and isfile(indexFile):
+            with open(indexFile) as f:
+                index = json.load(f)
+            if index["folder"] == self.folder:
+                for name, timestamp, variant, outputs, stamp in index["runs"]:
+                    self.runs[name] = DivizRun(self.folder, name, timestamp, variant, outputs, stamp)
+                self.sortRuns()
+        if refresh:
+            self.refresh()
+
+    def __len__(self):
+        return len(self.runs)
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def refresh(self, full=False):
+        """
+        Updates the index: the workflow folder is listed once, the new runs are scanned, and the runs in progress are
+        scanned again if their stamps (see runStamp) have changed, since diviz writes the outputs of the widgets into
+        the run folder after it has created it, which does not change the workflow folder. The finished runs are not
+        touched.
 
-def criteriaXML(criteria):
-    """
-    Creates criteria XML in inputFolder/myProjects/projectName folder.
+        :param full: if True, all the runs are scanned again
+        :return: the names of the runs that were (re)scanned
+        """
+        from os import scandir
+
+        now = time()
+        present = {}
+        for entry in scandir(self.folder):
+            if entry.is_dir() and "current" not in entry.name:
+                present[entry.name] = entry
+        scanned = []
+        removed = [name for name in self.runs if name not in present]
+        for name in removed:
+            del self.runs[name]
+        for name, entry in present.items():
+            run = self.runs.get(name)
+            if full or run is None or self.inProgress(run, now):
+                runStamp = self.runStamp(entry)
+                if full or run is None or run.stamp != runStamp:
+                    self.runs[name] = self.scanRun(entry, runStamp)
+                    scanned.append(name)
+        self.refreshed = now
+        self.sortRuns()
+        if scanned or removed:
+            self.save()
+        return scanned
+
+    def inProgress(self, run, now):
+        """
+        :param run: DivizRun
+        :param now: the current time (POSIX timestamp)
+        :return: True if some of the expectedOutputs of the run are missing and the run changed less than
+        settleTime ago
+        """
+        return any(not run.has(output) for output in self.expectedOutputs) and \
+            now - run.stamp / 10 ** 9 < self.settleTime
 
-    :param criteria: List of the names of the criteria.
-    :return: None
-    """
-    spaceString = 4 * " "
-    with open("{}/{}/{}/criteria.xml".format(inputFolder, myProjects, projectName), "w") as f:
-        space = 0
-        print(header(), file=f)
-        space += 1
-        print("{}<criteria>".format(spaceString * space), file=f)
-        space += 1
-        print("{}<description>".format(spaceString * space), file=f)
-        space += 1
-        print("{}<title>List of criteria</title>".format(spaceString * space), file=f)
-        space -= 1
-        print("{}</description>".format(spaceString * space), file=f)
-        for i,cr in enumerate(criteria):
-            print('{}<criterion id="cr{}" name="{}"/>'.format(spaceString * space, i, cr), file=f)
-        space -= 1
-        print("{}</criteria>".format(spaceString * space), file=f)
-        space -= 1
-        print(endTag(), file=f)
-
-
-def perfTableXML(alt, criteria, perf):
-    """
-    Creates performance table XML in inputFolder/myProjects/projectName folder.
+    @staticmethod
+    def runStamp(entry):
+        """
+        :param entry: DirEntry of a run folder
+        :return: the latest modification time (in ns) of the run folder and its (widget) subfolders, which changes
+        whenever an output is added to the run
+        """
+        from os import scandir
 
-    :param alt: names of laternatives (list)
-    :param criteria: names of criteria (list)
-    :param perf: pefrormance table (dictionary: {alternative: {criterion: value, ...}, ...})
-    :return: None
-    """
+        stamp = entry.stat().st_mtime_ns
+        for item in scandir(entry.path):
+            if item.is_dir():
+                stamp = max(stamp, item.stat().st_mtime_ns)
+        return stamp
 
-    spaceString = 4 * " "
-    with open("{}/{}/{}/performanceTable.xml".format(inputFolder, myProjects, projectName), "w") as f:
-        space = 0
-        print(header(), file=f)
-        space += 1
-        print("{}<performanceTable>".format(spaceString * space), file=f)
-        space += 1
-        print("{}<description>".format(spaceString * space), file=f)
-        space += 1
-        print("{}<title>Performance table</title>".format(spaceString * space), file=f)
-        space -= 1
-        print("{}</description>".format(spaceString * space), file=f)
-
-        for i in range(len(alt)):
-            print("{}<alternativePerformances>".format(spaceString * space), file=f)
-            space += 1
-            print("{}<alternativeID>a{}</alternativeID>".format(spaceString * space, i), file=f)
-            for j in range(len(criteria)):
-                print("{}<performance>".format(spaceString * space), file=f)
-                space += 1
-                print("{}<criterionID>cr{}</criterionID>".format(spaceString * space, j), file=f)
-                print("{}<value>".format(spaceString * space), file=f)
-                space += 1
-                mtype = "real" if "." in perf[alt[i]][criteria[j]] else "integer"# change this if necessary
-                print("{0}<{1}>{2}</{1}>".format(spaceString * space, mtype, perf[alt[i]][criteria[j]]), file=f)
-                space -= 1
-                print("{}</value>".format(spaceString * space), file=f)
-
-                space -= 1
-                print("{}</performance>".format(spaceString * space), file=f)
-
-            space -= 1
-            print("{}</alternativePerformances>".format(spaceString * space), file=f)
-
-        space -= 1
-        print("{}</performanceTable>".format(spaceString * space), file=f)
-        space -= 1
-        print(endTag(), file=f)
-
-
-def preferencesXML(prefList):
-    """
-    Creates preferences XML of user defined preferences in inputFolder/myProjects/projectName folder.
-
-    :param prefList:  A list of length three: the elements correspond to strong, weak and indiference preferences.
-    Each of the three elements is of form [[a<id11>, a<id12>], [a<id21>, a<id22>], [a<id31>, a<id32>], ...]
-    and contains at least 0 pairs.
-    If R is a relation (>, >= or =), then [a<id1>, a<id2>] encodes the fact that a<id1> R a<id2>.
-    :return: None
-    """
-    prefTypes = ["strong", "weak", "indif"]
-    spaceString = 4 * " "
-    with open("{}/{}/{}/preferences.xml".format(inputFolder, myProjects, projectName), "w") as f:
-        printf = partial(print, file=f)
-        space = 0
-        printf(header())
-        space += 1
-        for i in range(len(prefTypes)):
-            if prefList[i]:
-                printf("{}<alternativesComparisons>".format(spaceString * space))
-                space += 1
-                printf("{}<comparisonType>{}</comparisonType>".format(spaceString * space, prefTypes[i]))
-                printf("{}<pairs>".format(spaceString * space))
-                space += 1
-                for pair in prefList[i]:
-                    printf("{}<pair>".format(spaceString * space))
-                    space += 1
-
-                    printf("{}<initial>".format(spaceString * space))
-                    space += 1
-                    printf("{}<alternativeID>{}</alternativeID>".format(spaceString * space, pair[0]))
-                    space -= 1
-                    printf("{}</initial>".format(spaceString * space))
-                    printf("{}<terminal>".format(spaceString * space))
-                    space += 1
-                    printf("{}<alternativeID>{}</alternativeID>".format(spaceString * space, pair[1]))
-                    space -= 1
-                    printf("{}</terminal>".format(spaceString * space))
-
-                    space -= 1
-                    printf("{}</pair>".format(spaceString * space))
-
-                space -= 1
-                printf("{}</pairs>".format(spaceString * space))
-
-                space -= 1
-                printf("{}</alternativesComparisons>".format(spaceString * space))
-
-        space -= 1
-        print(endTag(), file=f)
-
-
-def criteriaDirectXML(directions):
-    """
-    Creates criteria directions XML in inputFolder/myProjects/projectName folder.
-
-    :param directions: a 0/1 list of directions, where 0 is used for the criteria where more is better
-    (e.g., profit), and 1 otherwise (e.g., cost).
-    :return: None
-    """
+    def scanRun(self, entry, runStamp):
+        """
+        :param entry: DirEntry of a run folder
+        :param runStamp: its stamp (see runStamp)
+        :return: DivizRun
+        """
+        from os import scandir
+
+        outputs = {}
+        for item in scandir(entry.path):
+            if item.is_dir():
+                for output in scandir(item.path):
+                    if output.is_file():
+                        outputs["{}/{}".format(item.name, output.name)] = output.stat().st_size
+            elif item.is_file():
+                outputs[item.name] = item.stat().st_size
+        parsed = runTimestamp(entry.name)
+        if parsed is None:
+            return DivizRun(self.folder, entry.name, entry.stat().st_mtime_ns / 10 ** 9, entry.name, outputs, runStamp)
+        return DivizRun(self.folder, entry.name, parsed.timestamp(), None, outputs, runStamp)
+
+    def sortRuns(self):
+        self.order = sorted(self.runs.values(), key=lambda run: (run.timestamp, run.name))
+
+    def save(self):
+        """
+        Stores the index to indexFile (if it is given).
 
-    spaceString = 4 * " "
-    with open("{}/{}/{}/criteriaPreferenceDirections.xml".format(inputFolder, myProjects, projectName), "w") as f:
-        printf = partial(print, file=f)
-        space = 0
-        printf(header())
-        space += 1
-        printf('{}<criteriaValues mcdaConcept="preferenceDirection">'.format(spaceString * space))
-        space += 1
-
-        for i in range(len(directions)):
-            printf("{}<criterionValue>".format(spaceString * space))
-            space += 1
-            printf("{}<criterionID>cr{}</criterionID>".format(spaceString * space, i))
-            printf("{}<value>".format(spaceString * space))
-            space += 1
-            printf("{}<integer>{}</integer>".format(spaceString * space, directions[i]))
-            space -= 1
-            printf("{}</value>".format(spaceString * space))
-            space -= 1
-            printf("{}</criterionValue>".format(spaceString * space))
-
-        space -= 1
-        printf('{}</criteriaValues>'.format(spaceString * space))
-
-        space -= 1
-        printf(endTag())
-
-
-def intensitiesOfPrefXML(pairsOfPairs):
-    """
-    Creates intensities of preferences XML in inputFolder/myProjects/projectName folder.
-
-    :param pairsOfPairs: Like in the function preferences, the input list contains three elements that correspond
-    to strict, weak and indifferent intensities. Each of the three elements contains at least 0
-    elements of the form [[a,b],[c,d]] where a-d are alternatives. Such an element encodes the fact
-    that U(a)- U(b) R U(c) - U(d), where R is one of the relations >, >= and =, and U is a utility function.
-    :return: None
-    """
+        :return: None
+        """
+        import json
+
+        if self.indexFile is None:
+            return
+        index = {"folder": self.folder,
+                 "runs": [[run.name, run.timestamp, run.variant, run.outputs, run.stamp] for run in self.order]}
+        temporary = "{}.{}.tmp".format(self.indexFile, getpid())
+        with open(temporary, "w") as f:
+            json.dump(index, f)
+        replace(temporary, self.indexFile)
+
+    def setVariant(self, name, variant):
+        """
+        Assigns the variant of the user defined preferences to a (timestamped) run.
 
-    spaceString = 4 * " "
-    prefTypes = ["strict", "weak", "indif"] # not strong, but strict!
-    with open("{}/{}/{}/intensitiesOfPref.xml".format(inputFolder, myProjects, projectName), "w") as f:
-        printf = partial(print, file=f)
-        space = 0
-        printf(header())
-        space += 1
-        for i in range(3):
-            if pairsOfPairs[i]:
-                printf('{}<alternativesComparisons>'.format(spaceString * space))
-                printf("{}<comparisonType>{}</comparisonType>".format(spaceString * space, prefTypes[i]))
-                printf("{}<pairs>".format(spaceString * space))
-                space += 1
-                for pp in pairsOfPairs[i]:
-                    printf("{}<pair>".format(spaceString * space))
-                    space += 1
-                    for j in range(2):
-                        printf("{}{}".format(spaceString * space,"<initial>" if j == 0 else "<terminal>"))
-                        space += 1
-                        printf("{}<alternativesSet>".format(spaceString * space))
-                        space += 1
-                        for elt in pp[j]:
-                            printf("{}<element>".format(spaceString * space))
-                            space += 1
-                            printf("{}<alternativeID>{}</alternativeID>".format(spaceString * space, elt))
-                            space -= 1
-                            printf("{}</element>".format(spaceString * space))
-
-                        space -= 1
-                        printf("{}</alternativesSet>".format(spaceString * space))
-
-                        space -= 1
-                        printf("{}{}".format(spaceString * space,"</initial>" if j == 0 else "</terminal>"))
-
-                    space -= 1
-                    printf("{}</pair>".format(spaceString * space))
-                    space -= 1
-
-
-                printf("{}</pairs>".format(spaceString * space))
-                printf('{}</alternativesComparisons>'.format(spaceString * space))
-        space -= 1
-        printf(endTag())
+        :param name: name of the run
+        :param variant: e.g., 'random12'
+        :return: None
+        """
+        self.runs[name].variant = variant
+        self.save()
 
+    def run(self, name):
+        """
+        :param name: name of the run
+        :return: DivizRun
+        """
+        if name not in self.runs:
+            raise Exception("No run {} in {}".format(name, self.folder))
+        return self.runs[name]
 
-#############################################################################################
-# User defined relations                                                                    #
-#############################################################################################
+    def latest(self, output=None):
+        """
+        :param output: if given, only the runs with this output (e.g., 'preferences.xml') are considered
+        :return: the latest run (by timestamp, not by name), or None if there are no such runs
+        """
+        for run in reversed(self.order):
+            if output is None or run.has(output):
+                return run
+        return None
 
+    def byVariant(self, variant):
+        """
+        :param variant: name of the variant, e.g., 'random12'
+        :return: the runs of the variant, sorted by timestamp
+        """
+        return [run for run in self.order if run.variant == variant]
 
-def defineStrongRelations(fileRels):
-    """
-    Reads a file with user defined strong relations.
+    def between(self, start=None, end=None):
+        """
+        :param start: datetime or POSIX timestamp; if None, there is no lower bound
+        :param end: datetime or POSIX timestamp; if None, there is no upper bound
+        :return: the runs with start <= timestamp <= end, sorted by timestamp
+        """
+        from bisect import bisect_left, bisect_right
 
-    :param fileRels: pathToMyRels/myRels, where myRels is a file with user defined strict relations, for example
-    a2 > a4
-    a0 > a2
-    a42 > a12
-    (if user defined 3 relations). The id numbers should be >= 0. The alternatives should be indexed with respect to
-    their order in the list myAlternatives.
-    :return: List of pairs [[2, 3], [0, 2], [42, 12]] (if we follow the same example).
-    """
+        if hasattr(start, "timestamp"):
+            start = start.timestamp()
+        if hasattr(end, "timestamp"):
+            end = end.timestamp()
+        timestamps = [run.timestamp for run in self.order]
+        first = 0 if start is None else bisect_left(timestamps, start)
+        last = len(timestamps) if end is None else bisect_right(timestamps, end)
+        return self.order[first:last]
 
-    def pomo(x):
-        return "a{}".format(x)
-    prefList = []
-    with open(fileRels, "r") as f:
-        for x in f:
-            line = x.strip()
-            if line:
-                a = search("a([0-9]+) > a([0-9]+)", line)
-                prefList.append([a.group(1), a.group(2)])
-    prefList = [[pomo(x), pomo(y)] for [x, y] in prefList]
-    return prefList
 
+globalRunCatalogues = {}
 
-def createRandomSubsampleOfAllRelations(linearOrder, size, file, randomSeed=12345):
-    """
-    We sample uniformly at random some relations and save them to file.
-    :param linearOrder: [indexOfTheBestAlternative, indexOfSecondBestAlternative, ...], where indices >= 0 and they
-    correspond to the list myAlternatives.
-    :param size: the size of the random sample
-    :param randomSeed: randomSeed used
-    :param file: The subsample will be saved to inputFolder/preferences/file.pref
-    :return:
-    """
-    seed(randomSeed)
-    indices = {x: i for i, x in enumerate(linearOrder)}
-    n = len(linearOrder)
-    maxPairs = n * (n + 1) // 2
-    if not 0 <= size <= maxPairs:
-        raise Exception("size = {} breaks the assumption 0 <= size <= #different pairs.".format(size))
-    subsample = set()
-    while len(subsample) < size:
-        ind1 = int(random() * n)
-        ind2 = int(random() * n)
-        while ind2 == ind1:
-            ind2 = int(random() * n)
-        ind1, ind2 = (ind1, ind2) if ind1 < ind2 else (ind2, ind1)
-        subsample.add((linearOrder[ind1], linearOrder[ind2]))
-    with open("{}/preferences/{}.pref".format(inputFolder, file), "w") as f:
-        for (alt1, alt2) in subsample:
-            better = max(alt1, alt2, key=lambda x: -indices[x])
-            worse = min(alt1, alt2, key=lambda x: -indices[x])
-            print("a{} > a{}".format(better, worse), file=f)
 
+catalogueMaxAge = 10.0  # in seconds: latestRun refreshes the catalogue if it is older
 
-def createLinearRelations(linearOrder, file):
-    """
-    From the list linearOrder = [indexOfTheBestAlternative, indexOfSecondBestAlternative, ...] of length n,
-    we create a file that contains n - 1 lines:
 
-    a<indexOfTheBestAlternative> > a<indexOfSecondBestAlternative>
-    ...
-    a<indexOf(n-1)BestAlternative> > a<indexOf(n)BestAlternative>
+def runCatalogue(workflowFolder, maxAge=None):
+    """
+    Returns the catalogue of the workflow folder. The catalogue is created (and refreshed) only once per folder;
+    later, it is returned without touching the disk, unless it is older than maxAge.
 
-    :param linearOrder:
-    :param file: The relations will be saved to inputFolder/preferences/file.pref
-    :return:
+    :param workflowFolder: root folder of a workflow
+    :param maxAge: if given, the catalogue is refreshed if its last refresh was more than maxAge seconds ago
+    (0 means always); the caller may also call RunCatalogue.refresh itself
+    :return: RunCatalogue
     """
-    with open("{}/preferences/{}.pref".format(inputFolder, file), "w") as f:
-        for i in range(len(linearOrder) - 1):
-            print("a{} > a{}".format(linearOrder[i], linearOrder[i + 1]), file=f)
+    folder = toSlash(workflowFolder)
+    catalogue = globalRunCatalogues.get(folder)
+    if catalogue is None:
+        catalogue = RunCatalogue(folder)
+        globalRunCatalogues[folder] = catalogue
+    elif maxAge is not None and (catalogue.refreshed is None or time() - catalogue.refreshed >= maxAge):
+        catalogue.refresh()
+    return catalogue
 
 
 #############################################################################################
@@ -460,6 +3442,7 @@ def createLinearRelations(linearOrder, file):
 #############################################################################################
 
 
+@instrumented
 def getRepresentativeFunction(utilityXML):
     """
     Reads the XML file of the most representative utility function and returns it as a dictionary.
@@ -508,35 +3491,279 @@ def getRepresentativeFunction(utilityXML):
 
 def evalRepresentativeFunction(dictFunction, alternativesToEvaluate, file='', sortByUtility=True):
     """
-    Evaluats the function given as the dictionary {'cr0': {x00: y00, x01: y01, ...}, ...} on the list of indices of
-    alternatives alternativesToEvaluate (with respect to myAlternatives). Indices of criteria correspond
-    to the criteriaNames.
-    :param dictFunction:
-    :param alternativesToEvaluate:
-    :param file: if file == '', the results are standardly output, otherwise, they are saved to the file.
-    :param sortByUtility: if True, the alternatives are sorted in descreasing order by their utilites when producing
-    output, otherwise, the alternatives are sorted as in alternativesToEvalueate.
-    :return: list of values representativeFunction(alternative)
-    """
-    _, _, performances = readPerformanceCSV()
-    evaluations = {myAlternatives[ind_a]: 0.0 for ind_a in alternativesToEvaluate}
-    for ind_a in alternativesToEvaluate:
-        a = myAlternatives[ind_a]
-        for ind_cr, cr in enumerate(criteriaNames):
-            value = numberTypes[ind_cr](performances[a][cr])
-            evaluations[a] += dictFunction["cr{}".format(ind_cr)][value]
-    sortingCriteron = (lambda u: -evaluations[u]) if sortByUtility else lambda u: u
-    if file != '':
-        with open(file, "w") as f:
-            print("alternative,mostRepresentativeUtilityFunction(alternative)", file=f)
-            for x in sorted(evaluations, key=sortingCriteron):
-                print("{},{:.4f}".format(x, evaluations[x]), file=f)
-    else:
-        print("alternative,mostRepresentativeUtilityFunction(alternative)")
-        for x in sorted(evaluations, key=sortingCriteron):
-            print("{},{:.4f}".format(x, evaluations[x]))
+    Calls RorutaProject.evalRepresentativeFunction on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().evalRepresentativeFunction(dictFunction, alternativesToEvaluate, file=file,
+                                                      sortByUtility=sortByUtility)
+
+
+def topRepresentative(dictFunction, k, chunkRows=100000):
+    """
+    Calls RorutaProject.topRepresentative on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().topRepresentative(dictFunction, k, chunkRows)
+
+
+def rankRepresentative(dictFunction, alternativesToRank, chunkRows=100000):
+    """
+    Calls RorutaProject.rankRepresentative on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().rankRepresentative(dictFunction, alternativesToRank, chunkRows)
+
+
+def scoreRepresentative(dictFunction, file='', chunkRows=100000):
+    """
+    Calls RorutaProject.scoreRepresentative on the project, defined by the module globals (see globalProject).
+    """
+    return globalProject().scoreRepresentative(dictFunction, file, chunkRows)
+
+
+def performanceMatrix(alt, criteria, perf):
+    """
+    Converts (a part of) the performance table to a matrix of numbers. Needs numpy.
+
+    :param alt: names of alternatives (list), the rows of the matrix
+    :param criteria: names of criteria (list), the columns of the matrix
+    :param perf: performance table, as returned by readPerformanceCSV
+    :return: len(alt) x len(criteria) numpy array of floats
+    """
+    import numpy as np
+
+    matrix = np.empty((len(alt), len(criteria)))
+    for i, a in enumerate(alt):
+        values = perf[a]
+        matrix[i] = [float(values[cr]) for cr in criteria]
+    return matrix
+
+
+class CompiledValueFunction:
+    """
+    A value function (e.g., the output of getRepresentativeFunction), compiled to sorted arrays of breakpoints:
+    one pair (abscissae, ordinates) of arrays per criterion. Between the breakpoints, the marginal value functions
+    are interpolated linearly, and outside of them, they are constant. The function is evaluated on whole
+    performance matrices (or their columns) at once. Needs numpy.
+    """
+
+    def __init__(self, dictFunction, nCriteria=None):
+        """
+        :param dictFunction: {'cr0': {x00: y00, x01: y01, ...}, ...}, as returned by getRepresentativeFunction
+        :param nCriteria: number of criteria; if None, len(dictFunction) is used
+        """
+        import numpy as np
+
+        nCriteria = len(dictFunction) if nCriteria is None else nCriteria
+        self.breakpoints = []
+        for j in range(nCriteria):
+            points = sorted((float(x), float(y)) for x, y in dictFunction["cr{}".format(j)].items())
+            self.breakpoints.append((np.array([x for x, _ in points]), np.array([y for _, y in points])))
+
+    def scoreColumns(self, columns):
+        """
+        Evaluates the function on the alternatives, given by the columns of a performance table.
+
+        :param columns: list of arrays (one per criterion) of the same length n
+        :return: numpy array of n utilities
+        """
+        import numpy as np
+
+        total = None
+        for (xs, ys), column in zip(self.breakpoints, columns):
+            values = np.interp(np.asarray(column, dtype=float), xs, ys)
+            total = values if total is None else total + values
+        return total
+
+    def score(self, matrix):
+        """
+        Evaluates the function on the alternatives, given by the rows of a performance matrix.
+
+        :param matrix: n x m array (rows: alternatives, columns: criteria), e.g., the output of performanceMatrix
+        :return: numpy array of n utilities
+        """
+        import numpy as np
+
+        matrix = np.asarray(matrix, dtype=float)
+        return self.scoreColumns([matrix[:, j] for j in range(len(self.breakpoints))])
+
+
+def utilityChunks(dictFunction, source, chunkRows=100000):
+    """
+    Evaluates a value function on a performance table chunk by chunk, so that only one chunk of the table and
+    its utilities is held in memory at a time.
+
+    :param dictFunction: {'cr0': {x00: y00, ...}, ...}, as returned by getRepresentativeFunction; 'crJ' is
+    the J-th criterion (column) of the table
+    :param source: path to a CSV file in the form of createCSVPerformanceTable, or PerformanceColumns
+    (e.g., memory-mapped by PerformanceColumns.load)
+    :param chunkRows: number of alternatives that are evaluated at once
+    :return: generator of triples (start, names, utilities), where start is the position of the first alternative
+    of the chunk in the table, names are the names of the alternatives of the chunk (None for PerformanceColumns,
+    whose names are not read) and utilities is a numpy array
+    """
+    import numpy as np
+
+    if isinstance(source, PerformanceColumns):
+        function = CompiledValueFunction(dictFunction, len(source.criteria))
+        for start in range(0, len(source), chunkRows):
+            yield start, None, function.scoreColumns([column[start:start + chunkRows] for column in source.columns])
+        return
+    with open(source) as f:
+        nCriteria = len(f.readline().strip().split(",")) - 1
+        function = CompiledValueFunction(dictFunction, nCriteria)
+        start = 0
+        rows = []
+        for x in f:
+            line = x.strip()
+            if line:
+                rows.append(line.split(","))
+            if len(rows) == chunkRows:
+                matrix = np.array([row[1:] for row in rows], dtype=float)
+                yield start, [row[0] for row in rows], function.score(matrix)
+                start += len(rows)
+                rows = []
+        if rows:
+            matrix = np.array([row[1:] for row in rows], dtype=float)
+            yield start, [row[0] for row in rows], function.score(matrix)
+
+
+def alternativeNames(source, positions):
+    """
+    Returns the names of the alternatives at the given positions of a memory-mapped performance table.
+
+    :param source: PerformanceColumns
+    :param positions: list of positions
+    :return: list of names
+    """
+    alternatives = source.alternatives
+    return [alternatives[position] for position in positions]
+
+
+@instrumented
+def topUtilities(dictFunction, source, k, chunkRows=100000):
+    """
+    Finds the k alternatives with the highest utilities, without sorting (or storing) the utilities of all
+    the alternatives: in each chunk of the table (see utilityChunks), only the alternatives whose utilities are at
+    least the k-th highest utility of the chunk are selected (by a partial selection), and they are merged with
+    the best alternatives so far. Ties are broken by the order of the alternatives in the table, as in
+    evalRepresentativeFunction with sortByUtility=True.
+
+    :param dictFunction: as in utilityChunks
+    :param source: as in utilityChunks
+    :param k: number of the alternatives
+    :param chunkRows: as in utilityChunks
+    :return: list of at most k pairs [name, utility], sorted by decreasing utility
+    """
+    import numpy as np
+
+    if k <= 0:
+        return []
+    bestUtilities = np.zeros(0)
+    bestPositions = np.zeros(0, dtype=np.int64)
+    bestNames = []
+    for start, names, utilities in utilityChunks(dictFunction, source, chunkRows):
+        if len(utilities) > k:
+            threshold = np.partition(utilities, len(utilities) - k)[len(utilities) - k]
+            selected = np.flatnonzero(utilities >= threshold)
+        else:
+            selected = np.arange(len(utilities))
+        candidates = np.concatenate((bestUtilities, utilities[selected]))
+        positions = np.concatenate((bestPositions, selected + start))
+        if names is not None:
+            bestNames.extend(names[i] for i in selected)
+        order = np.lexsort((positions, -candidates))[:k]
+        bestUtilities = candidates[order]
+        bestPositions = positions[order]
+        if names is not None:
+            bestNames = [bestNames[i] for i in order]
+    if isinstance(source, PerformanceColumns):
+        bestNames = alternativeNames(source, bestPositions.tolist())
+    return [[name, float(u)] for name, u in zip(bestNames, bestUtilities)]
+
+
+@instrumented
+def utilityRanks(dictFunction, source, alternatives, chunkRows=100000):
+    """
+    Finds the ranks of some alternatives with respect to the utilities of all the alternatives in the table,
+    without sorting (or storing) the utilities: the table is read twice, first to evaluate the given alternatives,
+    and then to count (chunk by chunk) the alternatives with higher utilities. The rank of an alternative is
+    1 + the number of the alternatives with higher utilities, so the alternatives with equal utilities share the rank.
+
+    :param dictFunction: as in utilityChunks
+    :param source: as in utilityChunks
+    :param alternatives: list of the names of the alternatives
+    :param chunkRows: as in utilityChunks
+    :return: {name: [rank, utility], ...}
+    """
+    import numpy as np
+
+    wanted = set(alternatives)
+    found = {}
+    isColumns = isinstance(source, PerformanceColumns)
+    if isColumns:
+        for position, name in enumerate(source.alternatives):
+            if name in wanted:
+                found[name] = position
+    values = {}
+    for start, names, utilities in utilityChunks(dictFunction, source, chunkRows):
+        if isColumns:
+            for name, position in found.items():
+                if start <= position < start + len(utilities):
+                    values[name] = float(utilities[position - start])
+        else:
+            for i, name in enumerate(names):
+                if name in wanted:
+                    values[name] = float(utilities[i])
+        if len(values) == len(wanted):
+            break
+    missing = wanted - set(values)
+    if missing:
+        raise Exception("Unknown alternatives: {}".format(sorted(missing)))
+    names = sorted(values, key=lambda a: values[a])
+    targets = np.array([values[a] for a in names])
+    higher = np.zeros(len(names), dtype=np.int64)
+    for _, _, utilities in utilityChunks(dictFunction, source, chunkRows):
+        if len(targets) <= 16:
+            higher += [np.count_nonzero(utilities > t) for t in targets]
+        else:
+            utilities = np.sort(utilities)
+            higher += len(utilities) - np.searchsorted(utilities, targets, side="right")
+    return {a: [int(h) + 1, values[a]] for a, h in zip(names, higher)}
+
+
+@instrumented
+def scoreCSV(dictFunction, csvFile, output=None, chunkRows=100000):
+    """
+    Evaluates a value function on the performance table in csvFile and writes the utilities chunk by chunk
+    (see utilityChunks), so that the memory does not grow with the number of alternatives. The output has the form
+    of evalRepresentativeFunction with sortByUtility=False, i.e., the alternatives are in the order of the table.
+
+    :param dictFunction: as in utilityChunks
+    :param csvFile: path to a CSV file in the form of createCSVPerformanceTable
+    :param output: path to the output file; if None, the utilities are written to the standard output
+    :param chunkRows: number of alternatives that are evaluated (and written) at once
+    :return: {'rows': number of alternatives, 'seconds': time, 'rowsPerSecond': throughput}
+    """
+    import sys
+
+    t0 = perf_counter()
+    rows = 0
+    f = sys.stdout if output is None else open(output, "w")
+    try:
+        print("alternative,mostRepresentativeUtilityFunction(alternative)", file=f)
+        for _, names, utilities in utilityChunks(dictFunction, csvFile, chunkRows):
+            f.write("".join(["{},{:.4f}\n".format(a, u) for a, u in zip(names, utilities.tolist())]))
+            rows += len(names)
+    finally:
+        if output is None:
+            f.flush()
+        else:
+            f.close()
+    seconds = perf_counter() - t0
+    statistics = {"rows": rows, "seconds": seconds, "rowsPerSecond": rows / seconds if seconds > 0 else 0.0}
+    logger().info("Scored %d alternatives in %.3f s (%.0f rows/s)", rows, seconds, statistics["rowsPerSecond"])
+    return statistics
 
 
+@instrumented
 def readRelations(relations, inputRels):
     """
     Reads the relations (either computed by diviz or user-defined.)
@@ -549,7 +3776,7 @@ def readRelations(relations, inputRels):
           relation (>, >= or =).
     """
 
-    print("Reading", relations)
+    logger().info("Reading %s", relations)
 
     prefTypes = {"strong": 0, "weak": 1, "indif": 2}
     pairs = [[],[],[]] if inputRels else []
@@ -573,27 +3800,179 @@ def readRelations(relations, inputRels):
     return pairs
 
 
+def xmlChunks(xmlFile, chunkSize=2 ** 20):
+    """
+    Reads an XML file in chunks of (about) chunkSize characters. Each chunk (except the last one) ends just before
+    a <, so no tag is split between two chunks, and the text after a tag is always in the same chunk as the tag.
+    Hence, the chunks can be parsed one by one, and the layout of the file (whitespace, line breaks) does not matter.
+
+    :param xmlFile: path to the XML file
+    :param chunkSize: number of characters that are read at once
+    :return: generator of strings
+    """
+    with open(xmlFile, "r") as f:
+        rest = ""
+        while True:
+            chunk = f.read(chunkSize)
+            if not chunk:
+                yield rest
+                return
+            data = rest + chunk
+            end = data.rfind("<")
+            if end <= 0:
+                rest = data
+            else:
+                yield data[:end]
+                rest = data[end:]
+
+
+# the tokens of the files with relations and value functions: each tag is followed by the text after it
+relationTokens = compileRegex(r"<(?:[\w.-]+:)?(comparisonType|alternativeID)(?:\s[^>]*)?>([^<]*)")
+functionTokens = compileRegex(r"<(?:(/)(?:[\w.-]+:)?criteria>|(?:[\w.-]+:)?([\w.-]+)([^>]*)>([^<]*))")
+idAttribute = compileRegex(r"""\bid\s*=\s*["']([^"']*)["']""")
+
+
+@instrumented
+def streamRelations(relations, inputRels, n=None):
+    """
+    Reads the relations (either computed by diviz or user-defined), like readRelations, but chunk by chunk
+    (see xmlChunks), so the file is never held in memory as a whole and can be of any layout. The relations are saved
+    directly to Relation objects.
+
+    :param relations: path pathToFile/file to the xml file, where the relations are stored
+    :param inputRels: bool, if True, then the relations are input relations (user defined), otherwise,
+    the relations were computed by diviz.
+    :param n: number of alternatives; if None, the largest index + 1 is used
+    :return: [strong, weak, indif] (three Relation objects) if inputRels, otherwise a single Relation
+    """
+
+    prefTypes = {"strong": 0, "weak": 1, "indif": 2}
+    result = [Relation(0 if n is None else n) for _ in range(3 if inputRels else 1)]
+    relation = result[0]
+    initial = None
+    for chunk in xmlChunks(relations):
+        for tag, text in relationTokens.findall(chunk):
+            if tag == "alternativeID":
+                if initial is None:
+                    initial = alternativeIndex(text.strip())
+                else:
+                    terminal = alternativeIndex(text.strip())
+                    if n is None and max(initial, terminal) >= relation.n:
+                        relation.resize(max(initial, terminal) + 1)
+                    relation.rows[initial] |= 1 << terminal
+                    initial = None
+            elif inputRels:
+                relation = result[prefTypes[text.strip()]]
+    if n is None:
+        size = max(r.n for r in result)
+        for r in result:
+            r.resize(size)
+    return result if inputRels else result[0]
+
+
+@instrumented
+def streamRepresentativeFunction(utilityXML):
+    """
+    Reads the XML file of the most representative utility function, like getRepresentativeFunction, but chunk by
+    chunk (see xmlChunks), so the file is never held in memory as a whole and can be of any layout.
+
+    :param utilityXML: name of XML file of most representative utility function
+    :return: the same dictionary as getRepresentativeFunction
+    """
+
+    dicty = {}
+    criterion = None
+    point = [None, None]
+    afterAxis = -1
+    for chunk in xmlChunks(utilityXML):
+        for closing, tag, attributes, text in functionTokens.findall(chunk):
+            if closing:
+                return dicty
+            elif tag == "criterion":
+                criterion = idAttribute.search(attributes).group(1)
+                dicty[criterion] = {}
+            elif tag == "abscissa":
+                afterAxis = 0
+            elif tag == "ordinate":
+                afterAxis = 1
+            elif afterAxis >= 0:
+                u = text.strip()
+                if afterAxis == 0:
+                    # u may not be a number
+                    try:
+                        point[0] = float(u) if "." in u else int(u)
+                    except ValueError:
+                        point[0] = u
+                else:
+                    dicty[criterion][point[0]] = float(u)
+                afterAxis = -1
+    return dicty
+
+
+performanceTokens = compileRegex(r"<(?:[\w.-]+:)?(alternativeID|criterionID|real|integer)(?:\s[^>]*)?>([^<]*)")
+
+
+@instrumented
+def streamPerformanceTable(performanceXML):
+    """
+    Reads the XML file of a performance table (e.g., the one that perfTableXML creates) chunk by chunk
+    (see xmlChunks).
+
+    :param performanceXML: path to the file
+    :return: (alt, criteria, perf), like readPerformanceCSV, but with the ids (a<i>, cr<j>) as names and
+    with the values as numbers
+    """
+
+    alt = []
+    criteria = []
+    perf = {}
+    alternative = None
+    criterion = None
+    for chunk in xmlChunks(performanceXML):
+        for tag, text in performanceTokens.findall(chunk):
+            text = text.strip()
+            if tag == "alternativeID":
+                alternative = text
+                if alternative not in perf:
+                    alt.append(alternative)
+                    perf[alternative] = {}
+            elif tag == "criterionID":
+                criterion = text
+                if not alt or alt[0] == alternative:
+                    criteria.append(criterion)
+            else:
+                perf[alternative][criterion] = float(text) if tag == "real" else int(text)
+    return alt, criteria, perf
+
+
 def latestRun(folder):
     """
     Returns the name of the latest output folder in a folder than corresponds to some diviz workflow.
     The folder names are of form
     <year>-<month>-<day>T<hour>_<minute>_<second>.<miliseconds>+<something> or 'current'.
+    The runs are compared by their timestamps (see RunCatalogue), so renamed runs are handled correctly.
+    The catalogue is refreshed at most once per catalogueMaxAge seconds.
 
     :param folder: folder of the output folders
     :return: The name of the latest output file from a folder of the output files folder
     """
 
-    files = [f for f in listdir(folder) if "current" not in f]  # folder names
-    return max(files)
+    run = runCatalogue(folder, catalogueMaxAge).latest()
+    if run is None:
+        raise Exception("No runs in {}".format(folder))
+    return run.name
 
 
+@instrumented
 def drawRelations(alter, divizWorkflowFolder, necessaryRels, divizRun=""):
     """
     Draws the relations. Green / red coloured field in the intersection of i-th row and j-th column, means that
     alternative_i R alternative_j, where R is discovered / user defined relation.
     (For all feasible models, user defined relations are subset of discovered relations.
     If the model is infeasible, then the output xmls are non-existent, hence there is no possible
-    source of confusion, from where the given relation comes.)
+    source of confusion, from where the given relation comes. In this case, minimalConflict finds the preferences
+    that should be removed.)
+    For many alternatives (or without a display), use renderRelations instead.
 
     :param alter: list with the real names of alternatives, e.g., ['Mazda CX-5 SkyActiv-D 150 Skylease GT 2015 - 2016', ...]
     and not ['a1', ...]
@@ -604,6 +3983,7 @@ def drawRelations(alter, divizWorkflowFolder, necessaryRels, divizRun=""):
     then the latest output folder is chosen
     :return: None
     """
+    from tkinter import Tk, Canvas  # imported here, so that importing roruta does not need a display
 
     def colour(i1, i2):
         """
@@ -615,11 +3995,9 @@ def drawRelations(alter, divizWorkflowFolder, necessaryRels, divizRun=""):
         :return:
         """
 
-        i = "a" + str(i1)
-        j = "a" + str(i2)
-        if any([[i,j] in dmPref[k] for k in range(3)]):
+        if (i1, i2) in dmPref:
             return "red"
-        elif [i,j] in outputRelations:
+        elif (i1, i2) in outputRelations:
             return "green"
         else:
             return "black"
@@ -628,12 +4006,13 @@ def drawRelations(alter, divizWorkflowFolder, necessaryRels, divizRun=""):
     run = "{}/{}".format(divizWorkflowFolder, divizRun if divizRun != "" else latestRun(divizWorkflowFolder))
     outputRelationsFolder = "{}/{}".format(run, "RORUTA-NecessaryAndPossiblePreferenceRelations-1")
 
-    dmPref = readRelations("{}/{}".format(run, "preferences.xml"), True)  # decision maker preferences
+    n = len(alter)
+    strong, weak, indif = streamRelations("{}/{}".format(run, "preferences.xml"), True, n)
+    dmPref = strong | weak | indif  # decision maker preferences
 
     relXml = "necessary-relations.xml" if necessaryRels else "possible-relations.xml"
-    outputRelations = readRelations("{}/{}".format(outputRelationsFolder, relXml), False)
+    outputRelations = streamRelations("{}/{}".format(outputRelationsFolder, relXml), False, n)
 
-    n = len(alter)
     altId = ["a{}".format(i) for i in range(n)]
 
     #canvas creation
@@ -660,6 +4039,103 @@ def drawRelations(alter, divizWorkflowFolder, necessaryRels, divizRun=""):
     window.mainloop()
 
 
+relationColours = {"red": (255, 0, 0), "green": (0, 255, 0), "black": (0, 0, 0)}  # the colours of drawRelations
+
+
+def relationImage(dmPref, outputRelations, order=None, cellSize=1):
+    """
+    Colours the relation matrix like drawRelations does: the pixel in the i-th row and j-th column is red if
+    a<i> R a<j> is user defined, green if it is discovered, and black otherwise. Needs numpy.
+
+    :param dmPref: Relation of user defined preferences
+    :param outputRelations: Relation, computed by diviz (or computeRelations)
+    :param order: list of indices of the alternatives in the order of the rows (and columns), e.g., by utility rank;
+    if None, the order of the indices is used
+    :param cellSize: the number of pixels of the side of a cell
+    :return: (n * cellSize) x (n * cellSize) x 3 numpy array of uint8
+    """
+    import numpy as np
+
+    n = max(dmPref.n, outputRelations.n)
+    codes = outputRelations.toArray(n).view(np.uint8)  # 0: black, 1: green, 2: red
+    codes[dmPref.toArray(n)] = 2
+    if order is not None:
+        order = np.asarray(order)
+        codes = codes[order][:, order]
+    palette = np.array([relationColours[c] for c in ["black", "green", "red"]], dtype=np.uint8)
+    image = palette[codes]
+    if cellSize > 1:
+        image = image.repeat(cellSize, axis=0).repeat(cellSize, axis=1)
+    return image
+
+
+def writePNG(fileName, image, compression=1):
+    """
+    Writes an RGB image to a PNG file (without any plotting library or display).
+
+    :param fileName: path to the file
+    :param image: height x width x 3 numpy array of uint8
+    :param compression: zlib compression level (0-9)
+    :return: None
+    """
+    import numpy as np
+    from struct import pack
+    from zlib import compress, crc32
+
+    height, width, _ = image.shape
+    raw = np.zeros((height, 3 * width + 1), dtype=np.uint8)  # each row starts with filter type 0
+    raw[:, 1:] = image.reshape(height, 3 * width)
+
+    def chunk(kind, data):
+        return pack(">I", len(data)) + kind + data + pack(">I", crc32(kind + data) & 0xFFFFFFFF)
+
+    with open(fileName, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", compress(raw.tobytes(), compression)))
+        f.write(chunk(b"IEND", b""))
+
+
+@instrumented
+def renderRelations(n, divizWorkflowFolder, necessaryRels, fileName, divizRun="", orderByUtility=False,
+                    cellSize=None):
+    """
+    Renders the relations to a PNG file, coloured as in drawRelations, but as a single raster image, so it needs
+    no display and works for thousands of alternatives.
+
+    :param n: number of alternatives
+    :param divizWorkflowFolder: root folder of a workflow, where the outputs are stored, as in drawRelations
+    :param necessaryRels: bool, if necessaryRels, then we render necessary relations, otherwise the possible-ones
+    :param fileName: path to the PNG file
+    :param divizRun: name of the output folder of the workflow, if divizRun = '',
+    then the latest output folder is chosen
+    :param orderByUtility: if True, the alternatives are ordered by their utilities under the representative
+    value function of the run (the best one first), otherwise by their indices
+    :param cellSize: the number of pixels of the side of a cell; if None, it is chosen so that the image is
+    (about) as large as the canvas of drawRelations
+    :return: the order of the alternatives (list of indices) in the image
+    """
+    run = "{}/{}".format(divizWorkflowFolder, divizRun if divizRun != "" else latestRun(divizWorkflowFolder))
+    strong, weak, indif = streamRelations("{}/{}".format(run, "preferences.xml"), True, n)
+    relXml = "necessary-relations.xml" if necessaryRels else "possible-relations.xml"
+    outputRelations = streamRelations("{}/{}/{}".format(run, relationsWidget, relXml), False, n)
+
+    order = list(range(n))
+    if orderByUtility:
+        alt, criteria, perf = streamPerformanceTable("{}/{}".format(run, "performanceTable.xml"))
+        function = streamRepresentativeFunction("{}/{}/{}".format(run, functionWidget,
+                                                                  "representative-value-function.xml"))
+        scores = CompiledValueFunction(function, len(criteria)).score(performanceMatrix(alt, criteria, perf))
+        utilities = [0.0] * n
+        for a, u in zip(alt, scores):
+            utilities[alternativeIndex(a)] = float(u)
+        order.sort(key=lambda i: -utilities[i])
+    cellSize = max(1, 650 // n) if cellSize is None else cellSize
+    writePNG(fileName, relationImage(strong | weak | indif, outputRelations, order, cellSize))
+    return order
+
+
+@instrumented
 def drawUtilityFunction(divizWorkflowFolder, criteriaNames, file="", dimGraphs=(3, 3)):
     """
     Draws chosen most representative utility function and returns its values.
@@ -674,11 +4150,16 @@ def drawUtilityFunction(divizWorkflowFolder, criteriaNames, file="", dimGraphs=(
      be empty (using the default value of dimGraphs)
     :return: the output of the function getRepresentativeFunction for the chosen run of representative-value-function
     """
+    import matplotlib.pyplot as plt  # imported here, since loading matplotlib is slow
+
+    # set the size of picture and font for pyplot
+    plt.rcParams['figure.figsize'] = 20, 10
+    plt.rcParams.update({'font.size': 15})
 
     #reading
     run = "{}/{}".format(divizWorkflowFolder, file if file != "" else latestRun(divizWorkflowFolder))
     outputFolder = "{}/{}".format(run, "RORUTA-RepresentativeValueFunction-1")
-    functionDict = getRepresentativeFunction("{}/{}".format(outputFolder, "representative-value-function.xml"))
+    functionDict = streamRepresentativeFunction("{}/{}".format(outputFolder, "representative-value-function.xml"))
 
     #draw marginal functions
     n = len(functionDict)               # number of criteria
@@ -719,10 +4200,215 @@ def drawUtilityFunction(divizWorkflowFolder, criteriaNames, file="", dimGraphs=(
     return functionDict
 
 
+#############################################################################################
+# Bulk analysis of runs                                                                     #
+#############################################################################################
+
+
+@instrumented
+def analyzeRun(runFolder):
+    """
+    Reads the outputs of a single run (user defined preferences, necessary and possible relations,
+    representative value function and performance table) and summarizes them. Needs no GUI.
+
+    :param runFolder: path to the output folder of the run
+    :return: {'run': name of the folder, 'n': number of alternatives, 'userDefined': number of user defined
+    statements, 'necessary': number of pairs (a<i>, a<j>), i != j, in the necessary relation, 'possible': ...,
+    'necessaryDensity': necessary / (n (n - 1)), 'possibleDensity': ..., 'utilities': [U(a0), U(a1), ...],
+    'ranks': [rank of a0, ...] (1 is the best), 'relations': {'necessary': Relation, 'possible': Relation}};
+    the fields whose files do not exist are None
+    """
+    folder = toSlash(runFolder)
+    summary = {"run": folder.split("/")[-1]}
+    perfFile = "{}/{}".format(folder, "performanceTable.xml")
+    prefFile = "{}/{}".format(folder, "preferences.xml")
+    functionFile = "{}/{}/{}".format(folder, functionWidget, "representative-value-function.xml")
+    alt, criteria, perf = streamPerformanceTable(perfFile) if isfile(perfFile) else (None, None, None)
+    n = None if alt is None else len(alt)
+    relations = {}
+    for name in ["necessary", "possible"]:
+        relationFile = "{}/{}/{}-relations.xml".format(folder, relationsWidget, name)
+        relations[name] = streamRelations(relationFile, False, n) if isfile(relationFile) else None
+    if n is None:
+        n = max([rel.n for rel in relations.values() if rel is not None] + [0])
+    summary["n"] = n
+    summary["userDefined"] = sum(len(rel) for rel in streamRelations(prefFile, True, n)) if isfile(prefFile) else None
+    for name, rel in relations.items():
+        if rel is None:
+            summary[name] = summary[name + "Density"] = None
+        else:
+            count = len(rel) - sum((i, i) in rel for i in range(n))
+            summary[name] = count
+            summary[name + "Density"] = count / (n * (n - 1)) if n > 1 else 0.0
+    summary["utilities"] = summary["ranks"] = None
+    if alt is not None and isfile(functionFile):
+        function = CompiledValueFunction(streamRepresentativeFunction(functionFile), len(criteria))
+        utilities = [float(u) for u in function.score(performanceMatrix(alt, criteria, perf))]
+        order = sorted(range(n), key=lambda i: -utilities[i])
+        ranks = [0] * n
+        for position, i in enumerate(order):
+            tied = position > 0 and utilities[order[position - 1]] == utilities[i]
+            ranks[i] = ranks[order[position - 1]] if tied else position + 1
+        summary["utilities"] = utilities
+        summary["ranks"] = ranks
+    summary["relations"] = relations
+    return summary
+
+
+def relationAgreement(first, second, n):
+    """
+    :param first: Relation
+    :param second: Relation
+    :param n: number of alternatives
+    :return: the share of the pairs (a<i>, a<j>), i != j, where both relations agree (i.e., both contain the pair
+    or none of them does)
+    """
+    if n < 2:
+        return 1.0
+    different = first ^ second
+    differences = len(different) - sum((i, i) in different for i in range(n))
+    return 1.0 - differences / (n * (n - 1))
+
+
+def rankCorrelation(first, second):
+    """
+    :param first: list of ranks
+    :param second: list of ranks (of the same alternatives)
+    :return: Spearman's correlation of the ranks (Pearson's correlation of the rank lists)
+    """
+    m = len(first)
+    meanFirst = sum(first) / m
+    meanSecond = sum(second) / m
+    covariance = sum((x - meanFirst) * (y - meanSecond) for x, y in zip(first, second))
+    varFirst = sum((x - meanFirst) ** 2 for x in first)
+    varSecond = sum((y - meanSecond) ** 2 for y in second)
+    if varFirst == 0 or varSecond == 0:
+        return 1.0 if first == second else 0.0
+    return covariance / (varFirst * varSecond) ** 0.5
+
+
+@instrumented
+def analyzeRuns(workflowFolder, runs=None, workers=None, outputFolder=None):
+    """
+    Analyzes many runs of a workflow at once (see analyzeRun): the runs are read concurrently, and each summary
+    is extended by the agreement with the other runs (on the same number of alternatives).
+
+    :param workflowFolder: root folder of a workflow, e.g.,
+    'C:/Users/user/diviz_workspace/rorUtaNecessaryAndPossibleRelations'
+    :param runs: names of the runs; if None, all the runs with the relations (see RunCatalogue) are analyzed
+    :param workers: number of worker processes; if None, the number of processors is used
+    :param outputFolder: if given, the summary of each run is written to outputFolder/<run>.json
+    :return: {run: summary, ...}, where the summary is the output of analyzeRun without the field 'relations',
+    extended by 'agreement': {other run: {'necessary': ..., 'possible': ..., 'ranks': ...}, ...}
+    (see relationAgreement and rankCorrelation)
+    """
+    import json
+    from concurrent.futures import ProcessPoolExecutor
+
+    catalogue = runCatalogue(workflowFolder, maxAge=0)
+    if runs is None:
+        output = "{}/{}".format(relationsWidget, "necessary-relations.xml")
+        runs = [run.name for run in catalogue if run.has(output)]
+    folders = [catalogue.run(name).path() for name in runs]
+    workers = cpu_count() if workers is None else workers
+    if workers <= 1 or len(folders) <= 1:
+        summaries = [analyzeRun(folder) for folder in folders]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(folders))) as pool:
+            summaries = list(pool.map(analyzeRun, folders))
+    for summary in summaries:
+        summary["agreement"] = {}
+    for k, first in enumerate(summaries):
+        for second in summaries[k + 1:]:
+            n = first["n"]
+            if second["n"] != n:
+                continue
+            agreement = {}
+            for name in ["necessary", "possible"]:
+                relFirst, relSecond = first["relations"][name], second["relations"][name]
+                bothKnown = relFirst is not None and relSecond is not None
+                agreement[name] = relationAgreement(relFirst, relSecond, n) if bothKnown else None
+            bothRanked = first["ranks"] is not None and second["ranks"] is not None
+            agreement["ranks"] = rankCorrelation(first["ranks"], second["ranks"]) if bothRanked else None
+            first["agreement"][second["run"]] = agreement
+            second["agreement"][first["run"]] = agreement
+    result = {}
+    for summary in summaries:
+        del summary["relations"]
+        result[summary["run"]] = summary
+        if outputFolder is not None:
+            makedirs(outputFolder, exist_ok=True)
+            with open("{}/{}.json".format(toSlash(outputFolder), summary["run"]), "w") as f:
+                json.dump(summary, f, indent=4)
+    return result
+
+
+def main(arguments=None):
+    """
+    The command line interface. Without a command, the cars example is run (see runExample). Otherwise, e.g.,
+
+    python roruta.py analyze <workflowFolder> [run1 run2 ...] [--workers W] [--output <folder>]
+
+    analyzes the runs of a workflow (see analyzeRuns) and prints a table of the summaries, and
+
+    python roruta.py score <representative-value-function.xml> <performances.csv> [--output <file>] [--chunk R]
+
+    streams the utilities of the alternatives to the file or the standard output (see scoreCSV). The options
+    --log <level> (default: INFO) and --trace <file> (given before the command) set the level of the messages of
+    the module and enable the instrumentation, whose trace is exported to the file at the end (see Instrumentation).
+
+    :param arguments: list of the arguments; if None, sys.argv[1:] is used
+    :return: None
+    """
+    import logging
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog="roruta.py")
+    parser.add_argument("--log", default="INFO", help="level of the messages (DEBUG shows the time of each stage)")
+    parser.add_argument("--trace", default=None, help="file for the JSON trace of the stages")
+    commands = parser.add_subparsers(dest="command")
+    analyze = commands.add_parser("analyze", help="summarize the runs of a diviz workflow (headless)")
+    analyze.add_argument("workflowFolder")
+    analyze.add_argument("runs", nargs="*", help="names of the runs (default: all runs with relations)")
+    analyze.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    analyze.add_argument("--output", default=None, help="folder for the JSON summaries of the runs")
+    score = commands.add_parser("score", help="stream the utilities of the alternatives in a performance table")
+    score.add_argument("functionXML", help="representative value function, computed by diviz")
+    score.add_argument("csvFile", help="performance table in the form of createCSVPerformanceTable")
+    score.add_argument("--output", default=None, help="output CSV file (default: the standard output)")
+    score.add_argument("--chunk", type=int, default=100000, help="number of rows that are scored at once")
+    options = parser.parse_args(arguments)
+
+    logging.basicConfig(format="%(name)s %(levelname)s: %(message)s")
+    logger().setLevel(options.log.upper())
+    if options.trace is not None:
+        instrumentation.enable()
+    try:
+        if options.command is None:
+            runExample()
+        elif options.command == "score":
+            scoreCSV(getRepresentativeFunction(options.functionXML), options.csvFile, options.output, options.chunk)
+        else:
+            summaries = analyzeRuns(options.workflowFolder, options.runs or None, options.workers, options.output)
+            print("run,n,userDefined,necessary,possible,necessaryDensity,possibleDensity,best")
+            for name, summary in summaries.items():
+                best = "" if summary["ranks"] is None else "a{}".format(summary["ranks"].index(1))
+                print("{},{},{},{},{},{},{},{}".format(name, summary["n"], summary["userDefined"],
+                                                       summary["necessary"], summary["possible"],
+                                                       summary["necessaryDensity"], summary["possibleDensity"],
+                                                       best))
+    finally:
+        if options.trace is not None:
+            instrumentation.exportTrace(options.trace)
+
+
 #############################################################################################
 # Example                                                                                   #
 #############################################################################################
 
+# The definitions below are cheap, so importing roruta has no side effects. The example itself
+# (creation of the files and drawing) is run by runExample, e.g., by calling python roruta.py.
+
 # DEFINE NECESSARY FOLDERS and a FILE
 divizWFfolder = "./carsExample/divizOutputs/rorUtaNecessaryAndPossibleRelations"
 performanceTableCSV = "performances.csv"
@@ -754,42 +4440,56 @@ criteriaNames = ["price",
                  "releaseDate",
                  "crashTest"]
 numberTypes = [int if "#" in x or "Date" in x or "crashTest" in x else float for x in criteriaNames]  # types of criteria: int or float; needed for nicer/cleaner representation
+performanceTableDict = {}                                                               # filled by populatePerfTableDict
+
+
+def runExample(ind=2):
+    """
+    Runs the cars example: creates (if necessary) and reads the performance table, creates all XML settings files,
+    draws the relations and the most representative utility function, and evaluates the alternatives.
+
+    :param ind: index of the chosen variant of user defined preferences in the list
+    ['linear', 'random12', 'full']
+    :return: None
+    """
+
+    # CREATE A PERFORMANCE TABLE IF NECESSARY, AND READ IT
+    createCSVPerformanceTable()
+    alt, criteria, perf = readPerformanceCSV()
+
+    # CREATE XML SETTINGS FILES:
+    alternativesXML(alt)                                    # alternatives
+    criteriaXML(criteria)                                   # criteria
+    perfTableXML(alt, criteria, perf)                       # performance table
 
-# CREATE A PERFORMANCE TABLE IF NECESSARY, AND READ IT
-performanceTableDict = {}
-createCSVPerformanceTable()
-alt, criteria, perf = readPerformanceCSV()
+    variants = ["linear",                                   # names of folders whith some user defined preferences
+                "random12",                                 # in .pref files
+                "full"]
 
-# CREATE XML SETTINGS FILES:
-alternativesXML(alt)                                    # alternatives
-criteriaXML(criteria)                                   # criteria
-perfTableXML(alt, criteria, perf)                       # performance table
+    strong = []                                             # [["a0", "a8"],["a1","a2"],["a3", "a8"],["a6","a7"],["a1","a0"],["a4","a3"],["a2","a4"],["a5","a8"]]
+    weak = []                                               # [["a0", "a1"]]#[["a3", "a0"]]
+    indif = []                                              # [["a2","a7"],["a7", "a2"],["a1","a6"],["a6","a1"],["a5","a6"],["a6","a5"]][:0]#[["a6","a7"],["a7","a6"]]#[["a1" ,"a2"]]
 
-variants = ["linear",                                 # names of folders whith some user defined preferences
-            "random12",                               # in .pref files
-            "full"]
-ind = 2
+    strong = defineStrongRelations("{}/preferences/{}".format(inputFolder, "{}.pref".format(variants[ind])))
+    preferencesXML([strong, weak, indif])                   # preferences
 
-strong = []                                             # [["a0", "a8"],["a1","a2"],["a3", "a8"],["a6","a7"],["a1","a0"],["a4","a3"],["a2","a4"],["a5","a8"]]
-weak = []                                               # [["a0", "a1"]]#[["a3", "a0"]]
-indif = []                                              # [["a2","a7"],["a7", "a2"],["a1","a6"],["a6","a1"],["a5","a6"],["a6","a5"]][:0]#[["a6","a7"],["a7","a6"]]#[["a1" ,"a2"]]
+    directions = [1, 0, 0, 0, 0, 1, 0, 0]
+    criteriaDirectXML(directions)                           # directions of criteria
 
-strong = defineStrongRelations("{}/preferences/{}".format(inputFolder, "{}.pref".format(variants[ind])))
-preferencesXML([strong, weak, indif])                   # preferences
+    strongInt = []                                          # [[["a3", "a4"],["a7", "a8"]]]#[[["a0", "a1"],["a4", "a5"]]]#[["a0", "a1"], ["a0", "a2"]]
+    weakInt = []                                            # [["a0", "a1"]]#[["a3", "a0"]]
+    indifInt = []                                           # [[["a6","a7"],["a7","a6"]]]#[["a1" ,"a2"]]#[["a1", "a4"],["a8","a0"]]
+    intensitiesOfPrefXML([strongInt, weakInt, indifInt])    # intensities of preferences
 
-directions = [1, 0, 0, 0, 0, 1, 0, 0]
-criteriaDirectXML(directions)                           # directions of criteria
 
-strongInt = []                                          # [[["a3", "a4"],["a7", "a8"]]]#[[["a0", "a1"],["a4", "a5"]]]#[["a0", "a1"], ["a0", "a2"]]
-weakInt = []                                            # [["a0", "a1"]]#[["a3", "a0"]]
-indifInt = []                                           # [[["a6","a7"],["a7","a6"]]]#[["a1" ,"a2"]]#[["a1", "a4"],["a8","a0"]]
-intensitiesOfPrefXML([strongInt, weakInt, indifInt])    # intensities of preferences
+    # PLOT THE RELATIONS AND MOST REPRESENTATIVE UTILITY FUNCTION
+    drawRelations(alt, divizWFfolder, True, divizRun=variants[ind])                               # here, we have renamed the diviz run, so
+    drawRelations(alt, divizWFfolder, False, divizRun=variants[ind])                              # that it equals the name of the variant
+    dicty = drawUtilityFunction(divizWFfolder, criteria, file=variants[ind], dimGraphs=(4, 2))    # of user defined preferecnes.
 
+    # EVALUATE THE ALTERNATIVES
+    evalRepresentativeFunction(dicty, list(range(len(myAlternatives))), file="", sortByUtility=False)
 
-# PLOT THE RELATIONS AND MOST REPRESENTATIVE UTILITY FUNCTION
-drawRelations(alt, divizWFfolder, True, divizRun=variants[ind])                               # here, we have renamed the diviz run, so
-drawRelations(alt, divizWFfolder, False, divizRun=variants[ind])                              # that it equals the name of the variant
-dicty = drawUtilityFunction(divizWFfolder, criteria, file=variants[ind], dimGraphs=(4, 2))    # of user defined preferecnes.
 
-# EVALUATE THE ALTERNATIVES
-evalRepresentativeFunction(dicty, list(range(len(myAlternatives))), file="", sortByUtility=False)
+if __name__ == "__main__":
+    main()